@@ -1,3 +1,10 @@
+import json
+import random
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+from settings.data.covering_array import ValueClass
 from settings.data.data_generator_abstraction import DataAbstractionGenerator
 from settings.utils import Randomizer
 
@@ -7,6 +14,10 @@ class RegionsDataApi(DataAbstractionGenerator):
     Вспомогательный класс для генерации данных при создании избранного места.
     """
 
+    ALLOWED_COLORS = ("BLUE", "GREEN", "RED", "YELLOW")
+    ENTITY_NAME = "favorite_place"
+    TITLE_MAX_LENGTH = 999
+
     def __init__(
         self,
         title: str | None = None,
@@ -25,20 +36,18 @@ class RegionsDataApi(DataAbstractionGenerator):
         :param lon: Долгота (если None - случайное значение в диапазоне [-180; 180]).
         :param color: Цвет иконки (BLUE, GREEN, RED, YELLOW). Если None - выбирается случайно.
         """
-        allowed_colors = ["BLUE", "GREEN", "RED", "YELLOW"]
-
         if title is None:
             entity_id = Randomizer.uuid()
             self.title = self.generate_entity_name(
                 id_=entity_id,
-                name="favorite_place",
+                name=self.ENTITY_NAME,
             )
         else:
             self.title = title
 
         self.lat = lat if lat is not None else Randomizer.float_between(-90, 90, precision=6)
         self.lon = lon if lon is not None else Randomizer.float_between(-180, 180, precision=6)
-        self.color = color if color is not None else Randomizer.pick_random(allowed_colors)
+        self.color = color if color is not None else Randomizer.pick_random(self.ALLOWED_COLORS)
 
         self.data = {
             "title": self.title,
@@ -46,3 +55,112 @@ class RegionsDataApi(DataAbstractionGenerator):
             "lon": self.lon,
             "color": self.color,
         }
+
+    @classmethod
+    def value_classes(cls) -> dict[str, list[ValueClass]]:
+        """
+        Классы значений полей избранного места для комбинаторных тестов (`CoveringArray`).
+
+        Допустимый класс со значением None генерируется автоматически (см. `__init__`),
+        граничные значения вынесены в отдельные классы.
+
+        :return: Классы значений по полям `title`, `lat`, `lon`, `color`.
+        """
+        return {
+            "title": [
+                ValueClass("generated"),
+                ValueClass("max_length", "A" * cls.TITLE_MAX_LENGTH),
+                ValueClass("empty", "", valid=False),
+                ValueClass("too_long", "A" * (cls.TITLE_MAX_LENGTH + 1), valid=False),
+            ],
+            "lat": [
+                ValueClass("generated"),
+                ValueClass("min", -90),
+                ValueClass("above_max", 90.000001, valid=False),
+                ValueClass("below_min", -90.000001, valid=False),
+                ValueClass("not_number", "abc", valid=False),
+            ],
+            "lon": [
+                ValueClass("generated"),
+                ValueClass("max", 180),
+                ValueClass("above_max", 180.000001, valid=False),
+                ValueClass("not_number", "abc", valid=False),
+            ],
+            "color": [
+                ValueClass("generated"),
+                ValueClass("lowercase", "blue", valid=False),
+                ValueClass("unknown", "PURPLE", valid=False),
+            ],
+        }
+
+    @classmethod
+    def generate_columns(cls, count: int, rng: random.Random) -> dict:
+        """
+        Генерирует данные `count` избранных мест по столбцам.
+
+        Каждое поле генерируется одним проходом: координаты - в `array('d')`,
+        цвета - одним вызовом `rng.choices`, а префикс названия (по имени теста)
+        вычисляется один раз на весь пакет.
+
+        :param count: Количество мест.
+        :param rng: Генератор случайных чисел.
+        :return: Словарь столбцов `title`, `lat`, `lon`, `color`.
+        """
+        random_value = rng.random
+        get_bits = rng.getrandbits
+
+        prefix = cls.generate_entity_name(id_="", name=cls.ENTITY_NAME)
+        titles = []
+        for _ in range(count):
+            # Формат совпадает с `uuid4()[:10]`: 8 hex-символов, дефис, 1 hex-символ
+            entity_id = f"{get_bits(36):09x}"
+            titles.append(f"{prefix}{entity_id[:8]}-{entity_id[8]}")
+
+        return {
+            "title": titles,
+            "lat": array("d", [round(-90 + 180 * random_value(), 6) for _ in range(count)]),
+            "lon": array("d", [round(-180 + 360 * random_value(), 6) for _ in range(count)]),
+            "color": rng.choices(cls.ALLOWED_COLORS, k=count),
+        }
+
+    @classmethod
+    def iter_batch(cls, count: int, seed: int | None = None, chunk_size: int = 10_000) -> Iterator[dict]:
+        """
+        Потоково генерирует данные `count` избранных мест.
+
+        Данные генерируются пакетами по `chunk_size` записей, поэтому память не зависит от `count`.
+        При одинаковом `seed` результат воспроизводится.
+
+        :param count: Количество мест.
+        :param seed: Зерно генератора случайных чисел (None - производное от генератора текущего теста).
+        :param chunk_size: Размер пакета генерации.
+        :return: Итератор словарей в формате `RegionsDataApi().data`.
+        """
+        rng = random.Random(seed if seed is not None else Randomizer.rng().getrandbits(64))
+        remaining = count
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            columns = cls.generate_columns(size, rng)
+            for title, lat, lon, color in zip(columns["title"], columns["lat"], columns["lon"], columns["color"]):
+                yield {"title": title, "lat": lat, "lon": lon, "color": color}
+            remaining -= size
+
+    @classmethod
+    def write_batch(cls, path: Path | str, count: int, seed: int | None = None, chunk_size: int = 10_000) -> Path:
+        """
+        Записывает данные `count` избранных мест в файл JSON Lines (одно место на строку).
+
+        :param path: Путь к файлу.
+        :param count: Количество мест.
+        :param seed: Зерно генератора случайных чисел (None - производное от генератора текущего теста).
+        :param chunk_size: Размер пакета генерации.
+        :return: Путь к файлу.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        with path.open("w", encoding="utf-8") as file:
+            for record in cls.iter_batch(count, seed=seed, chunk_size=chunk_size):
+                file.write(encode(record))
+                file.write("\n")
+        return path
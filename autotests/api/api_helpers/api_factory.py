@@ -0,0 +1,80 @@
+import threading
+from typing import Callable, TypeVar
+
+from autotests.api.api_helpers.regions_helper_api import RegionsHelperApi
+from autotests.api.api_methods.auth_methods_api import AuthApi
+from autotests.api.api_methods.regions_methods_api import RegionsApi
+from settings.api_client.api_client import ApiClient
+from settings.api_client.async_api_client import AsyncApiClient
+from settings.configs.config_model import ConfigModel
+
+T = TypeVar("T")
+
+
+class ApiFactory:
+    """
+    Фабрика общих для процесса (сессии воркера xdist) объектов методов API и хелперов.
+
+    Клиенты создаются один раз на контроллер (`controller_path`), объекты методов API
+    и хелперы - один раз на класс; все они используют клиенты своего контроллера и общий
+    пул соединений процесса. Объекты не хранят состояние теста, поэтому их можно
+    передавать в любые тесты и потоки. Фабрика создаётся на конфигурацию (фикстура `api_factory`).
+    """
+
+    def __init__(self, config: ConfigModel):
+        """
+        :param config: Конфигурационный объект (`ConfigModel`).
+        """
+        self.config = config
+        self._objects: dict = {}
+        self._lock = threading.RLock()  # Объект может запрашивать другие объекты фабрики при создании
+
+    def _get(self, key, build: Callable[[], T]) -> T:
+        instance = self._objects.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._objects.get(key)
+                if instance is None:
+                    instance = self._objects[key] = build()
+        return instance
+
+    def clients(self, controller_path: str) -> tuple[ApiClient, AsyncApiClient]:
+        """
+        :param controller_path: Название контроллера (часть пути до сервиса).
+        :return: Общие синхронный и асинхронный клиенты контроллера.
+        """
+        return self._get(
+            ("clients", controller_path),
+            lambda: (
+                ApiClient(config=self.config, controller_path=controller_path),
+                AsyncApiClient(config=self.config, controller_path=controller_path),
+            ),
+        )
+
+    def regions_api(self) -> RegionsApi:
+        return self._get(
+            (RegionsApi, RegionsApi.CONTROLLER_PATH),
+            lambda: RegionsApi(self.config, *self.clients(RegionsApi.CONTROLLER_PATH)),
+        )
+
+    def auth_api(self) -> AuthApi:
+        return self._get(
+            (AuthApi, AuthApi.CONTROLLER_PATH),
+            lambda: AuthApi(self.config, *self.clients(AuthApi.CONTROLLER_PATH)),
+        )
+
+    def regions_helper(self) -> RegionsHelperApi:
+        return self._get(
+            (RegionsHelperApi, RegionsApi.CONTROLLER_PATH),
+            lambda: RegionsHelperApi(self.config, regions_api=self.regions_api()),
+        )
+
+    def close(self):
+        """
+        Останавливает пулы потоков асинхронных клиентов. Соединения остаются в общем пуле процесса.
+        """
+        with self._lock:
+            clients = [value for key, value in self._objects.items() if key[0] == "clients"]
+            self._objects.clear()
+        for _, async_api_client in clients:
+            async_api_client.close()
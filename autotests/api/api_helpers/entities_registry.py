@@ -0,0 +1,217 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from settings.concurrency.file_lock import FileLock
+
+if TYPE_CHECKING:
+    from autotests.api.api_methods.regions_methods_api import RegionsApi
+    from settings.auth.token_provider import TokenProvider
+    from settings.configs.config_model import ConfigModel
+
+
+# Корзина ограничителя запросов (`SharedRateLimiter`) для удаления сущностей после прогона
+CLEANUP_RATE_BUCKET = "entities cleanup"
+
+
+class EntitiesTypes:
+    """
+    Типы сущностей, которые удаляются после прогона.
+    """
+    favorite_region = "favorite_region"
+
+
+@dataclass
+class CleanupReport:
+    """
+    Итоги удаления сущностей после прогона.
+    """
+    total: int = 0
+    deleted: int = 0
+    already_absent: int = 0
+    failed: int = 0
+    expired: int = 0  # Токен записи истёк: удалить сущность нельзя
+    duration: float = 0.0
+
+    def format(self) -> str:
+        return (
+            f"Удаление тестовых сущностей: удалено {self.deleted} из {self.total} "
+            f"(уже отсутствовали {self.already_absent}, ошибок {self.failed}, "
+            f"с истёкшим токеном {self.expired}) за {self.duration:.2f} с"
+        )
+
+
+class EntitiesRegistry:
+    """
+    Реестр сущностей, созданных хелперами во время прогона, для удаления после прогона.
+
+    Записи добавляются в JSON Lines файл прогона (`configure`), общий для всех
+    воркеров pytest-xdist. После прогона контроллер читает файл, убирает
+    дубликаты и удаляет сущности конкурентно с ограничением частоты и повторами.
+    Если файл реестра не задан, записи не сохраняются.
+    """
+
+    storage_path: Path | None = None
+
+    def __init__(self, config: "ConfigModel"):
+        """
+        :param config: Конфигурационный объект (`ConfigModel`).
+        """
+        self.config = config
+
+    @classmethod
+    def configure(cls, storage_path: Path | None):
+        """
+        Задаёт файл реестра текущего прогона.
+
+        :param storage_path: Путь к файлу реестра (None - не сохранять сущности).
+        """
+        cls.storage_path = Path(storage_path) if storage_path is not None else None
+
+    @classmethod
+    def _lock(cls) -> FileLock:
+        return FileLock(cls.storage_path.with_name(f"{cls.storage_path.name}.lock"))
+
+    def add_entities_ids_dict(self, ent_type: str, ent_param, token: str = None):
+        """
+        Регистрирует созданную сущность для удаления после прогона.
+
+        :param ent_type: Тип сущности (`EntitiesTypes`).
+        :param ent_param: Идентификатор сущности.
+        :param token: Сессионный токен, с которым сущность была создана.
+        """
+        if self.storage_path is None or ent_param is None:
+            return
+
+        line = json.dumps({"type": ent_type, "id": ent_param, "token": token}) + "\n"
+        with self._lock():
+            with self.storage_path.open("a", encoding="utf-8") as storage:
+                storage.write(line)
+
+    @classmethod
+    def read_entities(cls) -> list[dict]:
+        """
+        Читает зарегистрированные сущности всех воркеров без дубликатов.
+
+        :return: Список записей `{"type", "id", "token"}`.
+        """
+        if cls.storage_path is None or not cls.storage_path.exists():
+            return []
+
+        entities = {}
+        with cls._lock():
+            with cls.storage_path.open(encoding="utf-8") as storage:
+                for line in storage:
+                    if line.strip():
+                        entity = json.loads(line)
+                        entities.setdefault((entity["type"], entity["id"]), entity)
+        return list(entities.values())
+
+    @staticmethod
+    def _delete_entity(regions_api: "RegionsApi", entity: dict) -> int:
+        """
+        Удаляет одну сущность токеном, с которым она создана.
+
+        :param regions_api: Методы API избранных мест.
+        :param entity: Запись реестра.
+        :return: HTTP статус-код ответа.
+        """
+        if entity["type"] == EntitiesTypes.favorite_region:
+            return regions_api.delete_favorite_region(region_id=entity["id"], token=entity["token"]).status_code
+        raise ValueError(f"Неизвестный тип сущности: {entity['type']}")
+
+    def cleanup(
+        self,
+        token_provider: "TokenProvider | None" = None,
+        concurrency: int = 8,
+        rate_per_second: float = 50,
+    ) -> CleanupReport:
+        """
+        Удаляет все зарегистрированные сущности. В реестре остаются только сущности,
+        которые удалить не удалось.
+
+        Сущность удаляется токеном, с которым она создана: другой токен получил бы 404,
+        и сущность ошибочно считалась бы уже удалённой. Поэтому записи с истёкшим токеном
+        не удаляются, а учитываются в `CleanupReport.expired` и остаются в реестре.
+
+        Запросы удаления повторяет `ApiClient` (`RetryPolicy`: ошибки соединения и 502/503/504,
+        в пределах общего срока запроса), поэтому собственных повторов здесь нет.
+
+        :param token_provider: Поставщик токенов прогона: по его кэшу определяются истёкшие токены записей.
+        :param concurrency: Количество одновременных запросов удаления.
+        :param rate_per_second: Максимальная частота запросов удаления (корзина `CLEANUP_RATE_BUCKET`
+            ограничителя запросов прогона, вместе с ограничениями `RATE_LIMIT_*`); 0 - без ограничения.
+        :return: Итоги удаления.
+        """
+        # Клиент API нужен только для удаления: реестр настраивается в каждом процессе при старте
+        import requests
+        from autotests.api.api_methods.regions_methods_api import RegionsApi
+        from settings.api_client.rate_limiter import Limit, get_rate_limiter
+
+        started = time.perf_counter()
+        entities = self.read_entities()
+        report = CleanupReport(total=len(entities))
+        if not entities:
+            self.clear()
+            return report
+
+        regions_api = RegionsApi(self.config)
+        limiter = get_rate_limiter()
+        buckets = [(CLEANUP_RATE_BUCKET, Limit(rps=rate_per_second, burst=1))] if rate_per_second > 0 else []
+        expired_tokens = token_provider.expired_tokens() if token_provider is not None else set()
+
+        def delete(entity: dict) -> str:
+            if entity["token"] in expired_tokens:
+                return "expired"
+            try:
+                with limiter.permit(buckets):
+                    status = self._delete_entity(regions_api, entity)
+            except requests.RequestException:
+                return "failed"
+
+            if status < 300:
+                return "deleted"
+            if status == 404:
+                return "already_absent"
+            return "failed"
+
+        kept = []
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="entities-cleanup") as executor:
+            for entity, result in zip(entities, executor.map(delete, entities)):
+                setattr(report, result, getattr(report, result) + 1)
+                if result in ("failed", "expired"):
+                    kept.append(entity)
+
+        self.keep_entities(kept)
+        report.duration = time.perf_counter() - started
+        return report
+
+    @classmethod
+    def keep_entities(cls, entities: list[dict]):
+        """
+        Оставляет в реестре только указанные записи (например, сущности, которые не удалось удалить).
+
+        :param entities: Записи реестра `{"type", "id", "token"}`.
+        """
+        if cls.storage_path is None:
+            return
+        if not entities:
+            cls.clear()
+            return
+
+        with cls._lock():
+            with cls.storage_path.open("w", encoding="utf-8") as storage:
+                storage.writelines(json.dumps(entity) + "\n" for entity in entities)
+
+    @classmethod
+    def clear(cls):
+        """
+        Удаляет файл реестра прогона.
+        """
+        if cls.storage_path is None:
+            return
+        cls.storage_path.unlink(missing_ok=True)
+        cls.storage_path.with_name(f"{cls.storage_path.name}.lock").unlink(missing_ok=True)
@@ -1,4 +1,9 @@
+import asyncio
+
+import requests
+
 from autotests.api.api_data.regions_data_api import RegionsDataApi
+from autotests.api.api_helpers.entities_registry import EntitiesRegistry, EntitiesTypes
 from autotests.api.api_methods.regions_methods_api import RegionsApi
 from settings.report import autotest
 from settings.utils import check_response_status
@@ -9,13 +14,13 @@ class RegionsHelperApi:
     Хелпер для работы с API избранных мест.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, regions_api: RegionsApi | None = None):
         """
         :param config: Конфигурационный объект (`ConfigModel`).
+        :param regions_api: Общие методы API избранных мест (`ApiFactory`); по умолчанию создаются новые.
         """
-        self.regions_api = RegionsApi(config)
-        # self.entities_registry = EntitiesRegistry(config=config) # Удаление после теста
-
+        self.regions_api = regions_api or RegionsApi(config)
+        self.entities_registry = EntitiesRegistry(config=config)  # Удаление после прогона
 
     def create_favorite_region(self, token: str, region_data: dict = None) -> dict:
         """
@@ -34,12 +39,79 @@ class RegionsHelperApi:
                 token=token
             )
 
+        self.register_favorite_region(response, token=token)
         check_response_status(response, 200)
 
-        # Удаление сущностей после теста
-        # self.entities_registry.add_entities_ids_dict(
-        #     ent_type=EntitiesTypes.favorite_region,
-        #     ent_param=regions.get('id')
-        # )
-
         return region_data
+
+    def register_favorite_region(self, response: requests.Response, token: str):
+        """
+        Регистрирует созданное избранное место для удаления после прогона.
+        Ответы с неуспешным статусом игнорируются; ответ, не прошедший проверку схемы,
+        регистрируется, если в теле есть `id`.
+
+        :param response: Ответ на запрос создания избранного места.
+        :param token: Сессионный токен, с которым место было создано.
+        """
+        if response.status_code != 200:
+            return
+
+        model = getattr(response, "model", None)  # Тело, проверенное по схеме в RegionsApi
+        if model is not None:
+            region_id = model.id
+        else:
+            try:
+                body = response.json()
+            except ValueError:
+                return
+            if not isinstance(body, dict):
+                return
+            region_id = body.get("id")
+
+        self.entities_registry.add_entities_ids_dict(
+            ent_type=EntitiesTypes.favorite_region,
+            ent_param=region_id,
+            token=token
+        )
+
+    def send_favorite_regions(self, token: str, regions_data: list[dict]) -> list[requests.Response]:
+        """
+        Конкурентно отправляет запросы создания избранных мест и возвращает ответы.
+
+        Запросы отправляются на одном event loop через `RegionsApi.post_favorite_region_async`,
+        конкурентность ограничена размером пула соединений (`HTTP_POOL_MAXSIZE`).
+
+        :param token: Сессионный токен.
+        :param regions_data: Данные избранных мест.
+        :return: Ответы сервера в порядке `regions_data`.
+        """
+        async def send_all():
+            return await asyncio.gather(*(
+                self.regions_api.post_favorite_region_async(data=region_data, token=token)
+                for region_data in regions_data
+            ))
+
+        with autotest.step(f"Отправляем запросы создания избранных мест: {len(regions_data)} шт."):
+            responses = asyncio.run(send_all())
+
+        for response in responses:
+            self.register_favorite_region(response, token=token)
+        return responses
+
+    def create_favorite_regions(self, token: str, count: int = None, regions_data: list[dict] = None) -> list[dict]:
+        """
+        Конкурентно создаёт несколько избранных мест и возвращает их данные.
+
+        :param token: Сессионный токен.
+        :param count: Количество мест (используется, если `regions_data` не переданы).
+        :param regions_data: Данные избранных мест. Если не переданы - генерируются.
+        :return: Список данных созданных избранных мест.
+        """
+        if regions_data is None:
+            regions_data = [RegionsDataApi().data for _ in range(count or 0)]
+
+        responses = self.send_favorite_regions(token=token, regions_data=regions_data)
+        for response in responses:
+            check_response_status(response, 200)
+
+        return regions_data
@@ -0,0 +1,83 @@
+"""
+Нагрузочный прогон создания избранных мест (POST /v1/favorites).
+
+Пример запуска:
+    python -m autotests.api.api_load.favorites_load --envFile=configuration/dev-example.com.env \
+        --rps=50 --rampUp=10 --steady=60 --rampDown=10 --users=5
+"""
+import argparse
+
+from autotests.api.api_data.regions_data_api import RegionsDataApi
+from autotests.api.api_methods.auth_methods_api import AuthApi
+from autotests.api.api_methods.regions_methods_api import RegionsApi
+from settings.configs.config_model import ConfigModel
+from settings.configs.env_config_loader import EnvConfigLoader
+from settings.load.load_generator import LoadGenerator, LoadProfile, LoadReport
+
+
+def mint_tokens(config: ConfigModel, users: int) -> list[str]:
+    """
+    Получает отдельный сессионный токен для каждого виртуального пользователя.
+
+    :param config: Конфигурация окружения.
+    :param users: Количество виртуальных пользователей.
+    :return: Список токенов.
+    """
+    auth_api = AuthApi(config)
+    return [auth_api.post_auth_token().cookies.get("token") for _ in range(users)]
+
+
+def run_favorites_load(config: ConfigModel, profile: LoadProfile, users: int, max_concurrency: int) -> LoadReport:
+    """
+    Запускает open-loop нагрузку на создание избранных мест.
+
+    :param config: Конфигурация окружения.
+    :param profile: Профиль нагрузки.
+    :param users: Количество виртуальных пользователей (у каждого свой токен).
+    :param max_concurrency: Максимум одновременных запросов (и размер пула соединений).
+    :return: Итоговый отчёт.
+    """
+    config = config.model_copy(update={"http_pool_maxsize": max_concurrency})
+    regions_api = RegionsApi(config)
+    tokens = mint_tokens(config, users)
+
+    def create_favorite(token: str):
+        return regions_api.post_favorite_region_async(data=RegionsDataApi().data, token=token)
+
+    try:
+        return LoadGenerator(request_factory=create_favorite, tokens=tokens, profile=profile).run()
+    finally:
+        regions_api.async_api_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон POST /v1/favorites")
+    parser.add_argument("--envFile", required=True, help="Путь к .env-файлу с настройками стенда.")
+    parser.add_argument("--rps", type=float, required=True, help="Целевая интенсивность, запросов в секунду.")
+    parser.add_argument("--rampUp", type=float, default=0.0, help="Длительность разгона, с.")
+    parser.add_argument("--steady", type=float, default=60.0, help="Длительность плато, с.")
+    parser.add_argument("--rampDown", type=float, default=0.0, help="Длительность снижения нагрузки, с.")
+    parser.add_argument("--users", type=int, default=1, help="Количество виртуальных пользователей.")
+    parser.add_argument("--maxConcurrency", type=int, default=100, help="Максимум одновременных запросов.")
+    args = parser.parse_args()
+
+    config = EnvConfigLoader().load(env_path=args.envFile)
+    profile = LoadProfile(
+        target_rps=args.rps,
+        ramp_up=args.rampUp,
+        steady=args.steady,
+        ramp_down=args.rampDown,
+    )
+
+    report = run_favorites_load(
+        config=config,
+        profile=profile,
+        users=args.users,
+        max_concurrency=args.maxConcurrency,
+    )
+    print(report.format())
+    print(f"Отчёт сохранён: {report.save()}")
+
+
+if __name__ == "__main__":
+    main()
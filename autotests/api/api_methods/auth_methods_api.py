@@ -2,6 +2,7 @@ import requests
 
 from settings.configs.config_model import ConfigModel
 from settings.api_client.api_client import ApiClient
+from settings.api_client.async_api_client import AsyncApiClient
 from settings.report import autotest
 
 
@@ -10,11 +11,23 @@ class AuthApi:
     Методы для работы с сессионным токеном сервиса 2GIS Regions.
     """
 
-    def __init__(self, config: ConfigModel):
+    CONTROLLER_PATH = ""
+
+    def __init__(
+        self,
+        config: ConfigModel,
+        api_client: ApiClient | None = None,
+        async_api_client: AsyncApiClient | None = None,
+    ):
         """
         Инициализирует API-клиент для работы с Tokens.
+
+        :param config: Конфигурационный объект (`ConfigModel`).
+        :param api_client: Общий клиент контроллера (`ApiFactory`); по умолчанию создаётся новый.
+        :param async_api_client: Общий асинхронный клиент контроллера; по умолчанию создаётся новый.
         """
-        self.api_client = ApiClient(config=config, controller_path="")
+        self.api_client = api_client or ApiClient(config=config, controller_path=self.CONTROLLER_PATH)
+        self.async_api_client = async_api_client or AsyncApiClient(config=config, controller_path=self.CONTROLLER_PATH)
 
     def post_auth_token(self) -> requests.Response:
         """
@@ -25,3 +38,14 @@ class AuthApi:
         with autotest.step("Получаем сессионный токен (POST /v1/auth/tokens)"):
             response = self.api_client.post("/v1/auth/tokens")
         return response
+
+    async def post_auth_token_async(self) -> requests.Response:
+        """
+        Асинхронно выполняет запрос получения сессионного токена (POST /v1/auth/tokens).
+
+        Шаг отчёта не создаётся: при конкурентных вызовах шаги перемешиваются,
+        поэтому шаг оформляется вызывающей стороной вокруг всей пачки запросов.
+
+        :return: Возвращает токен.
+        """
+        return await self.async_api_client.post("/v1/auth/tokens")
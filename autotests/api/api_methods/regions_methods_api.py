@@ -1,8 +1,16 @@
 import requests
 
+from autotests.api.api_models.regions_models_api import ErrorResponseModel, FavoriteRegionModel
 from settings.configs.config_model import ConfigModel
 from settings.api_client.api_client import ApiClient
+from settings.api_client.async_api_client import AsyncApiClient
 from settings.report import autotest
+from settings.validation.response_validator import response_schema
+
+
+# Схемы ответов по статус-кодам: тело проверяется сразу после получения ответа
+CREATE_FAVORITE_SCHEMAS = {200: FavoriteRegionModel, 400: ErrorResponseModel, 401: ErrorResponseModel}
+DELETE_FAVORITE_SCHEMAS = {400: ErrorResponseModel, 401: ErrorResponseModel, 404: ErrorResponseModel}
 
 
 class RegionsApi:
@@ -10,19 +18,32 @@ class RegionsApi:
     Методы для работы с местами (Regions).
     """
 
-    def __init__(self, config: ConfigModel):
+    CONTROLLER_PATH = ""
+
+    def __init__(
+        self,
+        config: ConfigModel,
+        api_client: ApiClient | None = None,
+        async_api_client: AsyncApiClient | None = None,
+    ):
         """
         Инициализирует API-клиент для работы с местами.
+
+        :param config: Конфигурационный объект (`ConfigModel`).
+        :param api_client: Общий клиент контроллера (`ApiFactory`); по умолчанию создаётся новый.
+        :param async_api_client: Общий асинхронный клиент контроллера; по умолчанию создаётся новый.
         """
-        self.api_client = ApiClient(config=config, controller_path="")
+        self.api_client = api_client or ApiClient(config=config, controller_path=self.CONTROLLER_PATH)
+        self.async_api_client = async_api_client or AsyncApiClient(config=config, controller_path=self.CONTROLLER_PATH)
 
+    @response_schema(CREATE_FAVORITE_SCHEMAS)
     def post_favorite_region(self, data: dict, token: str) -> requests.Response:
         """
         Создаёт избранное место (POST /v1/favorites).
 
         :param data: словарь с данными избранного места.
         :param token: Сессионный токен, полученный из AuthApi (cookie token).
-        :return: Ответ сервера (`requests.Response`) в формате JSON.
+        :return: Ответ сервера (`requests.Response`) в формате JSON, проверенное тело - в атрибуте `model`.
         """
         with autotest.step("Создаём избранное место (POST /v1/favorites)"):
             return self.api_client.post(
@@ -30,3 +51,36 @@ class RegionsApi:
                 data=data,
                 cookies={"token": token}
             )
+
+    @response_schema(DELETE_FAVORITE_SCHEMAS)
+    def delete_favorite_region(self, region_id: int, token: str) -> requests.Response:
+        """
+        Удаляет избранное место (DELETE /v1/favorites/{id}).
+
+        :param region_id: Идентификатор избранного места.
+        :param token: Сессионный токен, с которым место было создано (cookie token).
+        :return: Ответ сервера (`requests.Response`).
+        """
+        with autotest.step(f"Удаляем избранное место (DELETE /v1/favorites/{region_id})"):
+            return self.api_client.delete(
+                f"/v1/favorites/{region_id}",
+                cookies={"token": token}
+            )
+
+    @response_schema(CREATE_FAVORITE_SCHEMAS)
+    async def post_favorite_region_async(self, data: dict, token: str) -> requests.Response:
+        """
+        Асинхронно создаёт избранное место (POST /v1/favorites).
+
+        Шаг отчёта не создаётся: при конкурентных вызовах шаги перемешиваются,
+        поэтому шаг оформляется вызывающей стороной вокруг всей пачки запросов.
+
+        :param data: словарь с данными избранного места.
+        :param token: Сессионный токен, полученный из AuthApi (cookie token).
+        :return: Ответ сервера (`requests.Response`) в формате JSON, проверенное тело - в атрибуте `model`.
+        """
+        return await self.async_api_client.post(
+            "/v1/favorites",
+            data=data,
+            cookies={"token": token}
+        )
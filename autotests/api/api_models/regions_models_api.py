@@ -0,0 +1,30 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class FavoriteRegionModel(BaseModel):
+    """
+    Избранное место в ответе POST /v1/favorites.
+    """
+    id: int = Field(description="Идентификатор избранного места.")
+    title: str = Field(description="Название места.")
+    lat: float = Field(ge=-90, le=90, description="Широта.")
+    lon: float = Field(ge=-180, le=180, description="Долгота.")
+    color: Literal["BLUE", "GREEN", "RED", "YELLOW"] | None = Field(description="Цвет иконки.")
+    created_at: str = Field(description="Время создания места.")
+
+
+class ErrorModel(BaseModel):
+    """
+    Описание ошибки в ответе сервиса.
+    """
+    id: str = Field(description="Идентификатор ошибки.")
+    message: str = Field(description="Текст ошибки.")
+
+
+class ErrorResponseModel(BaseModel):
+    """
+    Ответ сервиса с ошибкой (4xx).
+    """
+    error: ErrorModel
@@ -1,10 +1,9 @@
 import pytest
 
 from autotests.api.api_data.regions_data_api import RegionsDataApi
-from autotests.api.api_helpers.regions_helper_api import RegionsHelperApi
-from autotests.api.api_methods.regions_methods_api import RegionsApi
+from settings.assertions.custom_assertions import assert_latency_percentiles, assert_response_time
 from settings.report import autotest
-from settings.utils import verify_data
+from settings.utils import check_response_status, verify_data
 
 
 @pytest.mark.api
@@ -12,9 +11,10 @@ from settings.utils import verify_data
 class TestRegionsCrudApi:
 
     @pytest.fixture(autouse=True)
-    def setup(self, config, session_token):
-        self.helper = RegionsHelperApi(config=config)
-        self.regions_api = RegionsApi(config=config)
+    def setup(self, config, session_token, api_factory):
+        self.helper = api_factory.regions_helper()
+        self.regions_api = api_factory.regions_api()
+        self.config = config
         self.token = session_token
 
     @autotest.num("1")
@@ -37,3 +37,43 @@ class TestRegionsCrudApi:
                 actual_data=response_data,
                 expected_data=favorite_region_data,
             )
+
+    @autotest.num("2")
+    @autotest.name("CRUD Create (RegionsApi). Время создания избранного места укладывается в SLA.")
+    @autotest.external_id("c3b2f0a6-1d5e-4a8f-9b7c-2e6d4f8a1b30")
+    def test_c3b2f0a6_create_favorite_region_within_sla(self):
+        # Arrange
+        favorite_region_data = RegionsDataApi().data
+
+        # Act
+        response = self.regions_api.post_favorite_region(data=favorite_region_data, token=self.token)
+        self.helper.register_favorite_region(response, token=self.token)
+
+        # Assert
+        with autotest.step(f"Проверяем, что место создано не дольше {self.config.sla_response_ms} мс"):
+            check_response_status(response, 200)
+            assert_response_time(response, max_ms=self.config.sla_response_ms)
+
+    @autotest.num("3")
+    @autotest.name("CRUD Create (RegionsApi). Перцентили времени создания пачки избранных мест укладываются в бюджет.")
+    @autotest.external_id("7f1e9d42-8c6b-4e3a-a5d0-93b8c17e2f64")
+    def test_7f1e9d42_create_favorite_regions_batch_within_sla(self):
+        # Arrange
+        regions_data = [RegionsDataApi().data for _ in range(20)]
+
+        # Act
+        responses = self.helper.send_favorite_regions(token=self.token, regions_data=regions_data)
+
+        # Assert
+        with autotest.step("Проверяем статус-коды ответов"):
+            for response in responses:
+                check_response_status(response, 200)
+
+        with autotest.step(
+            f"Проверяем бюджеты времени ответа: p95 <= {self.config.sla_p95_ms} мс, p99 <= {self.config.sla_p99_ms} мс"
+        ):
+            assert_latency_percentiles(
+                responses,
+                p95_ms=self.config.sla_p95_ms,
+                p99_ms=self.config.sla_p99_ms,
+            )
@@ -1,8 +1,6 @@
 import pytest
 
-from autotests.api.api_helpers.regions_helper_api import RegionsHelperApi
 from autotests.api.api_data.regions_data_api import RegionsDataApi
-from autotests.api.api_methods.regions_methods_api import RegionsApi
 from settings.report import autotest
 from settings.utils import check_response_status
 
@@ -13,9 +11,9 @@ from settings.utils import check_response_status
 class TestNegativeRegionsSmokeApi:
 
     @pytest.fixture(autouse=True)
-    def setup(self, config, session_token):
-        self.helper = RegionsHelperApi(config=config)
-        self.regions_api = RegionsApi(config=config)
+    def setup(self, config, session_token, api_factory):
+        self.helper = api_factory.regions_helper()
+        self.regions_api = api_factory.regions_api()
         self.token = session_token
 
     @autotest.num("101")
@@ -107,3 +105,27 @@ class TestNegativeRegionsSmokeApi:
         # Assert
         with autotest.step("Проверяем, что сервер возвращает статус-код 200 при корректных данных"):
             check_response_status(response, 200)
+
+    @autotest.num("107")
+    @autotest.external_id("cac4986c-dfed-4f3d-a9c3-909d715f48c0")
+    @autotest.name("Negative Smoke. Создание избранного места с комбинациями классов значений полей.")
+    @pytest.mark.covering(RegionsDataApi.value_classes(), strength=2, max_invalid=1)
+    def test_cac4986c_negative_create_region_with_field_combinations(self, case):
+        """
+        Наборы значений - pairwise-покрытие классов значений title, lat, lon и color
+        (`RegionsDataApi.value_classes`), не больше одного недопустимого значения в наборе.
+        """
+        expected_status = 200 if case.valid else 400
+
+        # Arrange
+        with autotest.step(f"Подготавливаем данные: {case.id}"):
+            data = RegionsDataApi(**case.values).data
+
+        # Act
+        with autotest.step("Отправляем запрос на создание избранного места"):
+            response = self.regions_api.post_favorite_region(data=data, token=self.token)
+            self.helper.register_favorite_region(response, token=self.token)
+
+        # Assert
+        with autotest.step(f"Проверяем, что сервер возвращает статус-код {expected_status}"):
+            check_response_status(response, expected_status)
@@ -0,0 +1,84 @@
+import json
+import uuid
+
+import pytest
+from allure_commons import model2
+from allure_commons.model2 import Attachment, Status
+
+from settings.report import autotest
+from settings.report.allure_buffered_logger import BufferedAllureFileLogger
+
+
+def report_test(logger: BufferedAllureFileLogger, name: str, status: str) -> dict[str, str]:
+    """
+    Передаёт логгеру результат теста с шагом и вложениями шага и теста.
+
+    :return: Имена файлов вложений: {"step": ..., "test": ...}.
+    """
+    sources = {kind: f"{uuid.uuid4()}-attachment.json" for kind in ("step", "test")}
+    for source in sources.values():
+        logger.report_attached_data(body=json.dumps({"source": source}), file_name=source)
+
+    step = model2.TestStepResult(name="Шаг", attachments=[Attachment(name="step", source=sources["step"])])
+    logger.report_result(model2.TestResult(
+        name=name,
+        uuid=uuid.uuid4().hex,
+        status=status,
+        steps=[step],
+        attachments=[Attachment(name="test", source=sources["test"])],
+    ))
+    return sources
+
+
+def read_results(report_dir) -> dict[str, dict]:
+    results = [json.loads(path.read_text(encoding="utf-8")) for path in report_dir.glob("*-result.json")]
+    return {result["name"]: result for result in results}
+
+
+@pytest.mark.framework
+class TestBufferedAllureFileLogger:
+
+    @autotest.name("BufferedAllureFileLogger. Шаги и их вложения сохраняются только для упавших тестов.")
+    def test_steps_only_on_failure(self, tmp_path):
+        # Arrange
+        logger = BufferedAllureFileLogger(tmp_path, steps_only_on_failure=True)
+
+        # Act
+        statuses = (Status.PASSED, Status.FAILED, Status.BROKEN)
+        sources = {status: report_test(logger, status, status) for status in statuses}
+        logger.close()
+
+        # Assert
+        results = read_results(tmp_path)
+        with autotest.step("Проверяем, что у успешного теста не записаны шаги и вложения шагов"):
+            assert "steps" not in results[Status.PASSED]
+            assert not (tmp_path / sources[Status.PASSED]["step"]).exists()
+            assert (tmp_path / sources[Status.PASSED]["test"]).exists()
+            assert logger.stats["discarded_steps"] == logger.stats["discarded_attachments"] == 1
+
+        with autotest.step("Проверяем, что у упавших тестов шаги и все вложения сохранены"):
+            for status in (Status.FAILED, Status.BROKEN):
+                assert [step["name"] for step in results[status]["steps"]] == ["Шаг"]
+                assert (tmp_path / sources[status]["step"]).exists()
+                assert (tmp_path / sources[status]["test"]).exists()
+
+    @autotest.name("BufferedAllureFileLogger. close дописывает очередь, после закрытия запись синхронная.")
+    def test_close_flushes_queue_and_writes_synchronously_after(self, tmp_path):
+        # Arrange
+        logger = BufferedAllureFileLogger(tmp_path, batch_size=8)
+        sources = [report_test(logger, f"test_{index}", Status.PASSED) for index in range(50)]
+
+        # Act
+        logger.close()
+        flushed = read_results(tmp_path)
+        late_sources = report_test(logger, "test_late", Status.PASSED)
+
+        # Assert
+        with autotest.step("Проверяем, что после close записаны все результаты и вложения из очереди"):
+            assert sorted(flushed) == sorted(f"test_{index}" for index in range(50))
+            assert all((tmp_path / source).exists() for test in sources for source in test.values())
+
+        with autotest.step("Проверяем, что результат после close записан сразу"):
+            assert "test_late" in read_results(tmp_path)
+            assert all((tmp_path / source).exists() for source in late_sources.values())
+            assert logger.stats["files"] == 51 * 3
@@ -0,0 +1,60 @@
+import contextlib
+import time
+
+import pytest
+import requests
+
+from settings.api_client.api_client import ApiClient
+from settings.configs.config_model import ConfigModel
+from settings.report import autotest
+from settings.stub_server.stub_server import (
+    ENDPOINT_DELETE_FAVORITE,
+    EndpointBehavior,
+    LatencyDistribution,
+    StubProfile,
+)
+
+
+@pytest.mark.framework
+class TestApiClientRetries:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, stub_server):
+        stub_server.set_profile(StubProfile(endpoints={
+            ENDPOINT_DELETE_FAVORITE: EndpointBehavior(
+                latency=LatencyDistribution(kind="fixed", ms=100), error_rate=1.0, error_status=503
+            ),
+        }))
+        self.base_url = stub_server.base_url
+        yield
+        stub_server.set_profile(StubProfile())
+
+    @autotest.name("ApiClient. Повторы запроса укладываются в общий срок REQUEST_DEADLINE_SECONDS.")
+    def test_retries_stop_at_deadline(self):
+        # Arrange
+        config = ConfigModel(
+            base_url=self.base_url,
+            retry_max_attempts=20,
+            retry_backoff_ms=1,
+            retry_backoff_max_ms=1,
+            request_deadline_seconds=0.5,
+        )
+        api_client = ApiClient(config=config, controller_path="")
+
+        # Act
+        started = time.perf_counter()
+        with contextlib.suppress(requests.Timeout):  # Таймаут чтения последнего повтора ограничен остатком срока
+            api_client.delete("/v1/favorites/1", cookies={"token": "token"})
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        with autotest.step("Проверяем, что повторы прекратились по истечении общего срока (20 попыток - не меньше 2 с)"):
+            assert elapsed < 1.0
+
+    @autotest.name("ApiClient. Таймаут соединения не больше таймаута чтения.")
+    def test_connect_and_read_timeouts(self):
+        config = ConfigModel(base_url=self.base_url, connect_timeout_seconds=3, request_timeout_seconds=20)
+        api_client = ApiClient(config=config, controller_path="")
+
+        assert api_client._timeout() == (3, 20)
+        assert api_client._timeout(1) == (1, 1)
@@ -0,0 +1,136 @@
+import time
+from datetime import timedelta
+
+import pytest
+import requests
+
+from settings.api_client.cassette import (
+    CassetteMissError,
+    CassettePlayer,
+    CassetteRecorder,
+    merge_cassettes,
+    request_key,
+)
+from settings.report import autotest
+
+BASE_URL = "http://127.0.0.1:8000"
+
+
+def prepare(method: str = "GET", path: str = "/v1/favorites", **kwargs) -> requests.PreparedRequest:
+    return requests.Request(method=method, url=f"{BASE_URL}{path}", **kwargs).prepare()
+
+
+def make_response(prepared: requests.PreparedRequest, body: bytes, status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK"
+    response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "application/json"})
+    response.elapsed = timedelta(milliseconds=5)
+    response.request = prepared
+    response._content = body
+    return response
+
+
+@pytest.mark.framework
+class TestCassette:
+
+    @autotest.name("Кассета. Ответы, записанные воркерами, воспроизводятся из объединённой кассеты.")
+    def test_record_merge_replay(self, tmp_path):
+        # Arrange
+        token_response = make_response(prepare("POST", "/v1/auth/token"), b"")
+        token_response.cookies.set("token", "token-1", path="/", expires=time.time() + 3600)
+        parts = {"gw0": token_response, "gw1": make_response(prepare(params={"id": 1}), b'{"id": 1}', status=201)}
+        for worker, response in parts.items():
+            recorder = CassetteRecorder(tmp_path / f"{worker}.cas")
+            recorder.record(response)
+            recorder.close()
+
+        # Act
+        part_paths = [tmp_path / f"{worker}.cas" for worker in parts]
+        records = merge_cassettes(part_paths, tmp_path / "run.cas", meta={"seed": 7})
+        player = CassettePlayer(tmp_path / "run.cas")
+        try:
+            token_replayed = player.replay(prepare("POST", "/v1/auth/token"))
+            favorite_replayed = player.replay(prepare(params={"id": 1}))
+        finally:
+            player.close()
+
+        # Assert
+        with autotest.step("Проверяем метаданные и воспроизведённые ответы"):
+            assert records == 2
+            assert (player.meta["seed"], player.meta["records"]) == (7, 2)
+            assert token_replayed.cookies["token"] == "token-1"
+            assert next(iter(token_replayed.cookies)).expires > time.time() + 3000
+            assert (favorite_replayed.status_code, favorite_replayed.json()) == (201, {"id": 1})
+            assert favorite_replayed.headers["content-type"] == "application/json"
+            assert favorite_replayed.elapsed == timedelta(milliseconds=5)
+
+    @autotest.name("Кассета. Ключ запроса не зависит от порядка полей, заголовков и значения title.")
+    def test_request_key_normalization(self):
+        # Arrange
+        json_key = request_key(prepare("POST", json={"title": "Место", "lat": 55.7, "lon": 37.6}))
+        form_key = request_key(prepare("POST", data={"title": "Место", "lat": "55.7"}))
+
+        # Act
+        same_keys = {
+            "title той же длины": request_key(prepare("POST", json={"lon": 37.6, "lat": 55.7, "title": "Дом12"})),
+            "заголовки и cookie": request_key(
+                prepare("POST", json={"title": "Место", "lat": 55.7, "lon": 37.6}, cookies={"token": "other"})
+            ),
+        }
+        same_form_key = request_key(prepare("POST", data={"lat": "55.7", "title": "Школа"}))
+        same_query_key = request_key(prepare(params=[("b", "2"), ("a", "1")]))
+        different_keys = [
+            request_key(prepare("POST", json={"title": "", "lat": 55.7, "lon": 37.6})),
+            request_key(prepare("POST", json={"title": "Место", "lat": 55.8, "lon": 37.6})),
+            request_key(prepare("POST", data={"title": "Место", "lat": "55.8"})),
+        ]
+
+        # Assert
+        with autotest.step("Проверяем, что нормализованные ключи совпадают"):
+            assert all(key == json_key for key in same_keys.values()), same_keys
+            assert same_form_key == form_key
+            assert same_query_key == request_key(prepare(params=[("a", "1"), ("b", "2")]))
+
+        with autotest.step("Проверяем, что длина title, значения полей и тип тела различают ключи"):
+            assert len({json_key, *different_keys[:2]}) == 3
+            assert different_keys[2] != form_key
+            assert form_key != json_key
+
+    @autotest.name("Кассета. Несколько ответов на один запрос выдаются по кругу.")
+    def test_replay_round_robin(self, tmp_path):
+        # Arrange
+        recorder = CassetteRecorder(tmp_path / "run.cas")
+        for index in range(2):
+            recorder.record(make_response(prepare(), f'["{index}"]'.encode()))
+        recorder.close()
+
+        # Act
+        player = CassettePlayer(tmp_path / "run.cas")
+        try:
+            bodies = [player.replay(prepare()).json() for _ in range(3)]
+        finally:
+            player.close()
+
+        # Assert
+        with autotest.step("Проверяем порядок воспроизведённых ответов"):
+            assert bodies == [["0"], ["1"], ["0"]]
+
+    @autotest.name("Кассета. Запрос, которого нет в кассете, завершается CassetteMissError.")
+    def test_replay_miss(self, tmp_path):
+        # Arrange
+        recorder = CassetteRecorder(tmp_path / "run.cas")
+        recorder.record(make_response(prepare(params={"id": 1}), b"{}"))
+        recorder.close()
+        player = CassettePlayer(tmp_path / "run.cas")
+
+        # Act
+        try:
+            with pytest.raises(CassetteMissError) as error:
+                player.replay(prepare(params={"id": 2}))
+        finally:
+            player.close()
+
+        # Assert
+        with autotest.step("Проверяем, что в ошибке указан ключ запроса"):
+            assert "GET /v1/favorites?id=2" in str(error.value)
@@ -0,0 +1,82 @@
+from itertools import combinations, product
+
+import pytest
+
+from settings.data.covering_array import CoveringArray, ValueClass
+from settings.report import autotest
+
+FIELDS = {
+    "title": [ValueClass("short", "A"), ValueClass("long", "A" * 999), ValueClass("empty", "", False),
+              ValueClass("too_long", "A" * 1000, False)],
+    "lat": [ValueClass("min", -90), ValueClass("max", 90), ValueClass("out", 91, False)],
+    "lon": [ValueClass("min", -180), ValueClass("max", 180), ValueClass("out", 181, False)],
+    "color": [ValueClass("none"), ValueClass("red", "RED")],
+}
+
+
+def required_tuples(fields: dict, strength: int, max_invalid: int | None = None) -> set[tuple]:
+    """
+    Все комбинации классов `strength` полей, которые должны встретиться в наборах (перебором).
+    """
+    always_invalid = [name for name, classes in fields.items() if not any(value.valid for value in classes)]
+    required = set()
+    for names in combinations(fields, strength):
+        for classes in product(*(fields[name] for name in names)):
+            invalid = sum(not value.valid for value in classes) + len(set(always_invalid) - set(names))
+            if max_invalid is None or invalid <= max_invalid:
+                required.add(tuple(zip(names, (value.name for value in classes))))
+    return required
+
+
+def covered_tuples(cases, strength: int) -> set[tuple]:
+    covered = set()
+    for case in cases:
+        covered.update(combinations([(name, value.name) for name, value in case.classes], strength))
+    return covered
+
+
+@pytest.mark.framework
+class TestCoveringArray:
+
+    @pytest.mark.parametrize("strength", [1, 2, 3])
+    @autotest.name("CoveringArray. Наборы покрывают все комбинации классов заданной силы.")
+    def test_covers_all_tuples(self, strength):
+        # Act
+        cases = list(CoveringArray(FIELDS, strength=strength))
+
+        # Assert
+        with autotest.step("Проверяем покрытие комбинаций и количество наборов"):
+            assert required_tuples(FIELDS, strength) <= covered_tuples(cases, strength)
+            assert len(cases) < CoveringArray(FIELDS).full_product
+
+    @autotest.name("CoveringArray. Наборы одинаковы при повторном построении.")
+    def test_deterministic(self):
+        assert [case.id for case in CoveringArray(FIELDS)] == [case.id for case in CoveringArray(FIELDS)]
+
+    @pytest.mark.parametrize("strength", [2, 3])
+    @autotest.name("CoveringArray. С max_invalid в наборе не больше допустимого количества недопустимых классов.")
+    def test_max_invalid(self, strength):
+        # Act
+        cases = list(CoveringArray(FIELDS, strength=strength, max_invalid=1))
+
+        # Assert
+        with autotest.step("Проверяем ограничение и покрытие комбинаций в его пределах"):
+            assert max(len(case.invalid_fields) for case in cases) == 1
+            assert required_tuples(FIELDS, strength, max_invalid=1) <= covered_tuples(cases, strength)
+
+    @autotest.name("CoveringArray. Поле только с недопустимыми классами учитывается в max_invalid.")
+    def test_max_invalid_with_always_invalid_field(self):
+        # Arrange
+        fields = {**FIELDS, "token": [ValueClass("expired", "x", False), ValueClass("unknown", "y", False)]}
+
+        # Act
+        cases = list(CoveringArray(fields, max_invalid=1))
+
+        # Assert
+        with autotest.step("Проверяем, что недопустим только класс поля token"):
+            assert {tuple(case.invalid_fields) for case in cases} == {("token",)}
+            assert required_tuples(fields, 2, max_invalid=1) <= covered_tuples(cases, 2)
+
+        with autotest.step("Проверяем ошибку, если таких полей больше max_invalid"):
+            with pytest.raises(ValueError, match="больше max_invalid=0"):
+                CoveringArray(fields, max_invalid=0)
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from settings.report import autotest
+from settings.scheduling.durations import hash_partition, lpt_partition, parse_shard
+
+
+def make_durations(count: int, seed: int = 1) -> dict[str, float]:
+    rng = random.Random(seed)
+    return {f"autotests/test_module.py::test_{index}": round(rng.uniform(0.05, 5), 2) for index in range(count)}
+
+
+@pytest.mark.framework
+class TestShardPartition:
+
+    @autotest.name("lpt_partition. Ожидаемое время групп отличается не больше самого долгого теста.")
+    def test_lpt_partition_balance(self):
+        # Arrange
+        durations = make_durations(200)
+
+        # Act
+        groups = lpt_partition(durations, durations, 4)
+
+        # Assert
+        with autotest.step("Проверяем состав групп и разброс ожидаемого времени"):
+            loads = [sum(durations[key] for key in group) for group in groups]
+            assert sorted(key for group in groups for key in group) == sorted(durations)
+            assert max(loads) - min(loads) <= max(durations.values())
+            assert all(group == sorted(group, key=durations.__getitem__, reverse=True) for group in groups)
+
+    @autotest.name("lpt_partition. Разбиение не зависит от порядка тестов, в том числе с равной длительностью.")
+    def test_lpt_partition_deterministic(self):
+        # Arrange
+        durations = {**make_durations(50), **{f"autotests/test_equal.py::test_{index}": 1.0 for index in range(10)}}
+        shuffled = list(durations)
+        random.Random(2).shuffle(shuffled)
+
+        # Act
+        groups = lpt_partition(durations, durations, 3)
+        shuffled_groups = lpt_partition(shuffled, durations, 3)
+
+        # Assert
+        with autotest.step("Проверяем, что разбиения совпадают"):
+            assert shuffled_groups == groups
+
+    @autotest.name("hash_partition. Шарды не пересекаются, покрывают все тесты и стабильны при добавлении тестов.")
+    def test_hash_partition_covers_all_tests(self):
+        # Arrange
+        keys = list(make_durations(500))
+
+        # Act
+        groups = hash_partition(keys, 4)
+        extended_groups = hash_partition(keys + [f"autotests/test_new.py::test_{index}" for index in range(50)], 4)
+
+        # Assert
+        with autotest.step("Проверяем, что каждый тест попал ровно в один шард"):
+            assert sorted(key for group in groups for key in group) == sorted(keys)
+            assert all(groups)
+
+        with autotest.step("Проверяем, что новые тесты не перемещают существующие"):
+            for group, extended_group in zip(groups, extended_groups):
+                assert [key for key in extended_group if key in set(keys)] == group
+
+    @autotest.name("parse_shard. Значение i/N разбирается в номер шарда и количество шардов.")
+    def test_parse_shard(self):
+        assert parse_shard("2/4") == (2, 4)
+        assert parse_shard("1/1") == (1, 1)
+
+    @pytest.mark.parametrize("value, message", [
+        ("0/4", "номер шарда должен быть от 1 до 4"),
+        ("5/4", "номер шарда должен быть от 1 до 4"),
+        ("1", "ожидается i/N"),
+        ("1/2/3", "ожидается i/N"),
+        ("a/b", "ожидается i/N"),
+    ])
+    @autotest.name("parse_shard. Некорректное значение --shard завершается ValueError.")
+    def test_parse_shard_errors(self, value, message):
+        with pytest.raises(ValueError, match=message):
+            parse_shard(value)
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from autotests.api.api_data.regions_data_api import RegionsDataApi
+from autotests.api.api_helpers.api_factory import ApiFactory
+from autotests.api.api_helpers.entities_registry import EntitiesRegistry
+from settings.auth.token_provider import TokenProvider
+from settings.concurrency.file_lock import read_json, write_json_atomic
+from settings.configs.config_model import ConfigModel
+from settings.report import autotest
+
+
+@pytest.mark.framework
+class TestEntitiesRegistry:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, stub_server, tmp_path):
+        self.config = ConfigModel(base_url=stub_server.base_url)
+        self.factory = ApiFactory(self.config)
+        self.tmp_path = tmp_path
+        storage_path = EntitiesRegistry.storage_path
+        EntitiesRegistry.configure(tmp_path / "entities.jsonl")
+        yield
+        EntitiesRegistry.configure(storage_path)
+        self.factory.close()
+
+    @autotest.name("EntitiesRegistry. Сущности, которые не удалось удалить, остаются в реестре.")
+    def test_cleanup_keeps_failed_entities(self):
+        # Arrange
+        token = self.factory.auth_api().post_auth_token().cookies["token"]
+        self.factory.regions_helper().create_favorite_region(token=token, region_data=RegionsDataApi().data)
+        registry = EntitiesRegistry(config=self.config)
+        registry.add_entities_ids_dict(ent_type="favorite_region", ent_param=999999, token="unknown-token")
+
+        # Act
+        report = registry.cleanup()
+
+        # Assert
+        with autotest.step("Проверяем итоги удаления и оставшиеся записи реестра"):
+            assert (report.total, report.deleted, report.failed) == (2, 1, 1)
+            assert EntitiesRegistry.read_entities() == [
+                {"type": "favorite_region", "id": 999999, "token": "unknown-token"}
+            ]
+
+    @autotest.name("EntitiesRegistry. Сущности с истёкшим токеном не удаляются и остаются в реестре.")
+    def test_cleanup_keeps_entities_with_expired_token(self):
+        # Arrange
+        token_provider = TokenProvider(
+            mint_token=self.factory.auth_api().post_auth_token, cache_path=self.tmp_path / "tokens.json"
+        )
+        token = token_provider.get_token()
+        token_provider.close()
+        self.factory.regions_helper().create_favorite_region(token=token, region_data=RegionsDataApi().data)
+        data = read_json(token_provider.cache_path)
+        data["shared"]["expires_at"] = time.time() - 1
+        write_json_atomic(token_provider.cache_path, data)
+        entities = EntitiesRegistry.read_entities()
+
+        # Act
+        report = EntitiesRegistry(config=self.config).cleanup(token_provider=token_provider)
+
+        # Assert
+        with autotest.step("Проверяем, что запись с истёкшим токеном не удалялась и осталась в реестре"):
+            assert (report.total, report.deleted, report.already_absent, report.expired) == (1, 0, 0, 1)
+            assert EntitiesRegistry.read_entities() == entities
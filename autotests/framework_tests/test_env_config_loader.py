@@ -0,0 +1,28 @@
+import pytest
+
+from settings.configs.env_config_loader import EnvConfigLoader
+from settings.report import autotest
+
+
+@pytest.mark.framework
+class TestEnvConfigLoader:
+
+    @pytest.fixture(autouse=True)
+    def restore_environ(self, monkeypatch):
+        # load_values экспортирует переменные в окружение: monkeypatch восстанавливает его после теста
+        for key in ("RETRY_BUDGET_RATIO", "RETRY_MAX_ATTEMPTS", "HEDGE_DELAY_MS", "SLA_P95_MS"):
+            monkeypatch.delenv(key, raising=False)
+
+    @autotest.name("EnvConfigLoader. Явный 0 в ENV-файле не заменяется значением по умолчанию.")
+    def test_explicit_zero_is_kept(self):
+        values = {"RETRY_BUDGET_RATIO": "0", "RETRY_MAX_ATTEMPTS": "0", "HEDGE_DELAY_MS": "0"}
+
+        config = EnvConfigLoader().load_values(values)
+
+        assert (config.retry_budget_ratio, config.retry_max_attempts, config.hedge_delay_ms) == (0, 0, 0)
+
+    @autotest.name("EnvConfigLoader. Отсутствующая или пустая переменная получает значение по умолчанию.")
+    def test_missing_or_empty_value_uses_default(self):
+        config = EnvConfigLoader().load_values({"SLA_P95_MS": ""})
+
+        assert (config.sla_p95_ms, config.retry_budget_ratio, config.hedge_delay_ms) == (1000, 0.1, None)
@@ -0,0 +1,136 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from settings.api_client.rate_limiter import Limit, RateLimits, SharedRateLimiter
+from settings.metrics.request_metrics import endpoint_key
+from settings.report import autotest
+
+HOST = "http://127.0.0.1:8000"
+
+
+def bucket_names(limits: RateLimits, method: str, path: str, host: str = HOST) -> list[str]:
+    return [name for name, _ in limits.buckets(f"{host}{path}", method, endpoint_key(method, path))]
+
+
+def acquire_permits(path: str, limit: Limit, seconds: float, results):
+    """
+    Процесс прогона: получает разрешения, пока не истечёт время, и возвращает моменты их получения.
+    """
+    limiter = SharedRateLimiter(path)
+    buckets = [("probe", limit)]
+    permits = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        with limiter.permit(buckets):
+            permits.append(time.monotonic())
+    limiter.close()
+    results.put(permits)
+
+
+@pytest.mark.framework
+class TestRateLimiter:
+
+    @autotest.name("RateLimits. Запрос попадает в корзину хоста и в корзины эндпоинта по пути и методу.")
+    def test_buckets_matching(self):
+        # Arrange
+        limits = RateLimits(
+            host=Limit(rps=50),
+            endpoints={
+                "/v1/favorites": Limit(rps=5),
+                "/v1/fav": Limit(max_in_flight=1),
+                "POST /v1/auth/tokens": Limit(rps=1),
+            },
+        )
+
+        # Act
+        names = {
+            "вложенный путь": bucket_names(limits, "DELETE", "/v1/favorites/12"),
+            "путь эндпоинта": bucket_names(limits, "GET", "/v1/favorites"),
+            "метод и путь": bucket_names(limits, "POST", "/v1/auth/tokens"),
+            "другой метод": bucket_names(limits, "GET", "/v1/auth/tokens"),
+            "другой хост": bucket_names(limits, "GET", "/v1/favorites", host="http://localhost:9000"),
+        }
+
+        # Assert
+        with autotest.step("Проверяем корзины запросов"):
+            assert names == {
+                "вложенный путь": [HOST, f"{HOST} /v1/favorites"],
+                "путь эндпоинта": [HOST, f"{HOST} /v1/favorites"],
+                "метод и путь": [HOST, f"{HOST} POST /v1/auth/tokens"],
+                "другой метод": [HOST],
+                "другой хост": ["http://localhost:9000", "http://localhost:9000 /v1/favorites"],
+            }
+
+        with autotest.step("Проверяем, что без ограничения хоста остаются только корзины эндпоинтов"):
+            assert bucket_names(RateLimits(endpoints=limits.endpoints), "GET", "/v1/fav/1") == [f"{HOST} /v1/fav"]
+            assert not RateLimits().enabled
+
+    @autotest.name("SharedRateLimiter. Разрешения выдаются не чаще rps после всплеска burst.")
+    def test_rps(self):
+        # Arrange
+        limiter = SharedRateLimiter()
+        buckets = [("rps", Limit(rps=20, burst=5))]
+
+        # Act
+        started = time.monotonic()
+        waits = [limiter.acquire(buckets) for _ in range(15)]
+        duration = time.monotonic() - started
+
+        # Assert
+        with autotest.step("Проверяем всплеск без ожидания и частоту после него"):
+            assert waits[:5] == [0.0] * 5
+            assert all(wait > 0 for wait in waits[5:])
+            assert 0.45 <= duration < 1.0
+            assert limiter.stats()["rps"]["waits"] == 10
+        limiter.close()
+
+    @autotest.name("SharedRateLimiter. Запрос сверх max_in_flight ждёт освобождения места.")
+    def test_max_in_flight(self):
+        # Arrange
+        limiter = SharedRateLimiter()
+        buckets = [("in flight", Limit(max_in_flight=2))]
+        limiter.acquire(buckets)
+        with pytest.raises(RuntimeError):
+            with limiter.permit(buckets):
+                raise RuntimeError("ошибка запроса")
+        limiter.acquire(buckets)
+        acquired = threading.Event()
+
+        # Act
+        waiter = threading.Thread(target=lambda: (limiter.acquire(buckets), acquired.set()), daemon=True)
+        waiter.start()
+        blocked = not acquired.wait(0.2)
+        limiter.release(buckets)
+        released = acquired.wait(2)
+
+        # Assert
+        with autotest.step("Проверяем ожидание третьего запроса до освобождения места"):
+            assert blocked
+            assert released
+            assert limiter.stats()["in flight"]["waits"] == 1
+        limiter.close()
+
+    @autotest.name("SharedRateLimiter. Ограничение rps общее для процессов, использующих файл состояния.")
+    def test_rps_shared_between_processes(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "rate_limits.bin")
+        limit = Limit(rps=20, burst=1)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=acquire_permits, args=(path, limit, 1.5, results)) for _ in range(3)
+        ]
+
+        # Act
+        for process in processes:
+            process.start()
+        permits = sorted(moment for _ in processes for moment in results.get(timeout=30))
+        for process in processes:
+            process.join()
+
+        # Assert
+        with autotest.step("Проверяем суммарную частоту разрешений всех процессов"):
+            allowed = limit.rps * (permits[-1] - permits[0]) + limit.capacity
+            assert 0.7 * allowed <= len(permits) <= allowed + 1
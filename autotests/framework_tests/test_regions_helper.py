@@ -0,0 +1,59 @@
+import itertools
+import json
+
+import pytest
+import requests
+
+from autotests.api.api_helpers.entities_registry import EntitiesRegistry
+from autotests.api.api_helpers.regions_helper_api import RegionsHelperApi
+from autotests.api.api_methods.regions_methods_api import CREATE_FAVORITE_SCHEMAS, RegionsApi
+from settings.configs.config_model import ConfigModel
+from settings.report import autotest
+from settings.validation.response_validator import response_schema
+
+
+class FakeRegionsApi(RegionsApi):
+    """
+    Методы API избранных мест, отвечающие без сервера: тело ответа - данные запроса с новым `id`.
+    """
+
+    def __init__(self, config: ConfigModel):
+        super().__init__(config)
+        self.ids = itertools.count(1)
+
+    @response_schema(CREATE_FAVORITE_SCHEMAS)
+    async def post_favorite_region_async(self, data: dict, token: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"id": next(self.ids), **data, "created_at": "2026-01-01T00:00:00Z"}).encode()
+        return response
+
+
+@pytest.mark.framework
+class TestRegionsHelper:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        config = ConfigModel(base_url="http://127.0.0.1:9")
+        self.helper = RegionsHelperApi(config, regions_api=FakeRegionsApi(config))
+        storage_path = EntitiesRegistry.storage_path
+        EntitiesRegistry.configure(tmp_path / "entities.jsonl")
+        yield
+        EntitiesRegistry.configure(storage_path)
+
+    @autotest.name("RegionsHelperApi. Места с телом ответа не по схеме регистрируются для удаления до ошибки проверки.")
+    def test_invalid_body_does_not_leak_created_regions(self):
+        # Arrange
+        regions_data = [
+            {"title": "valid", "lat": 1.0, "lon": 2.0, "color": "RED"},
+            {"title": "invalid", "lat": 1.0, "lon": 2.0, "color": "PINK"},
+            {"title": "valid", "lat": 3.0, "lon": 4.0, "color": None},
+        ]
+
+        # Act
+        with pytest.raises(AssertionError, match="не соответствует схеме"):
+            self.helper.create_favorite_regions(token="token", regions_data=regions_data)
+
+        # Assert
+        with autotest.step("Проверяем, что все созданные места зарегистрированы"):
+            assert sorted(entity["id"] for entity in EntitiesRegistry.read_entities()) == [1, 2, 3]
@@ -0,0 +1,32 @@
+import pytest
+
+from settings.api_client.streaming import iter_json_array
+from settings.report import autotest
+
+
+def chunked(body: bytes, size: int = 2):
+    return iter([body[index:index + size] for index in range(0, len(body), size)])
+
+
+@pytest.mark.framework
+class TestIterJsonArray:
+
+    @autotest.name("iter_json_array. Элементы массива читаются по чанкам.")
+    @pytest.mark.parametrize("body, items", [
+        (b"[]", []),
+        (b" [ ] \n", []),
+        (b'[1, -4.5e3, {"a": [2]}, "x"]\n', [1, -4500.0, {"a": [2]}, "x"]),
+    ])
+    def test_valid_array(self, body, items):
+        assert list(iter_json_array(chunked(body))) == items
+
+    @autotest.name("iter_json_array. Запятая перед закрывающей скобкой - ошибка.")
+    def test_trailing_comma(self):
+        with pytest.raises(ValueError, match="ожидался элемент"):
+            list(iter_json_array(chunked(b"[1,]")))
+
+    @autotest.name("iter_json_array. Данные после закрывающей скобки - ошибка.")
+    @pytest.mark.parametrize("body", [b"[1,2] garbage", b"[1]]"])
+    def test_trailing_data(self, body):
+        with pytest.raises(ValueError, match="лишние данные"):
+            list(iter_json_array(chunked(body)))
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from settings.report import autotest
+from settings.report.structured_log import merge_logs
+
+
+def write_part(path, times: list[float], worker: str):
+    path.write_text(
+        "".join(json.dumps({"ts": ts, "worker": worker, "message": str(ts)}) + "\n" for ts in times),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.framework
+class TestMergeLogs:
+
+    @autotest.name("merge_logs. Записи процесса, поставленные в очередь не по порядку времени, упорядочиваются.")
+    def test_merge_reorders_records_within_process(self, tmp_path):
+        # Arrange
+        parts = [
+            write_part(tmp_path / "gw0.jsonl", [1.0, 1.3, 1.2, 2.0, 1.9, 3.0], "gw0"),
+            write_part(tmp_path / "gw1.jsonl", [1.1, 1.25, 2.5, 2.4], "gw1"),
+        ]
+
+        # Act
+        records = merge_logs(parts, tmp_path / "pytest.jsonl")
+
+        # Assert
+        with autotest.step("Проверяем, что итоговый журнал упорядочен по времени"):
+            lines = (tmp_path / "pytest.jsonl").read_text(encoding="utf-8").splitlines()
+            times = [json.loads(line)["ts"] for line in lines]
+            assert records == 10
+            assert times == sorted(times)
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+import requests
+
+from settings.auth.token_provider import MIN_REFRESH_DELAY_SECONDS, TokenProvider
+from settings.report import autotest
+
+
+@pytest.mark.framework
+class TestTokenProvider:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.mints = []
+        self.cache_path = tmp_path / "tokens.json"
+
+    def mint_short_lived_token(self, ttl_seconds: float) -> requests.Response:
+        self.mints.append(time.time())
+        response = requests.Response()
+        response.status_code = 200
+        response.cookies.set("token", f"token-{len(self.mints)}", expires=int(time.time() + ttl_seconds))
+        return response
+
+    def wait_for_mints(self, count: int, timeout: float):
+        deadline = time.monotonic() + timeout
+        while len(self.mints) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    @autotest.name("TokenProvider. Токен с временем жизни меньше запаса обновления обновляется один раз до истечения.")
+    def test_short_lived_token_is_refreshed_once_before_expiry(self):
+        # Arrange
+        provider = TokenProvider(
+            mint_token=lambda: self.mint_short_lived_token(ttl_seconds=3),
+            cache_path=self.cache_path,
+            refresh_margin_seconds=60,
+        )
+
+        try:
+            # Act
+            first_token = provider.get_token()
+            second_token = provider.get_token()
+            expires_at = int(self.mints[0] + 3)
+            self.wait_for_mints(2, timeout=3)
+            time.sleep(0.3)
+            refreshed_token = provider.get_token()
+
+            # Assert
+            with autotest.step("Проверяем, что повторный запрос вернул тот же токен без нового получения"):
+                assert first_token == second_token
+
+            with autotest.step("Проверяем, что токен обновлён в фоне один раз и до истечения срока"):
+                assert len(self.mints) == 2
+                assert MIN_REFRESH_DELAY_SECONDS <= self.mints[1] - self.mints[0] + 0.05
+                assert self.mints[1] < expires_at
+                assert refreshed_token == "token-2"
+        finally:
+            provider.clear()
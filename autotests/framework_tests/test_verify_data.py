@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from settings.report import autotest
+from settings.utils import verify_data
+
+
+@pytest.mark.framework
+class TestVerifyData:
+
+    @autotest.name("verify_data. Словари в списке должны совпадать полностью.")
+    def test_list_items_compared_in_full(self):
+        with pytest.raises(AssertionError, match=r"Лишний элемент '\[0\]\.b'"):
+            verify_data(actual_data=[{"a": 1, "b": 2}], expected_data=[{"a": 1}])
+
+    @autotest.name("verify_data. Вложенные словари должны совпадать полностью.")
+    def test_nested_dict_compared_in_full(self):
+        with pytest.raises(AssertionError, match=r"Лишний элемент 'x\.a'"):
+            verify_data(actual_data={"x": {"a": 1}}, expected_data={"x": {}})
+
+    @autotest.name("verify_data. Исключённые поля не применяются к вложенным словарям.")
+    def test_unverified_fields_apply_to_top_level_only(self):
+        verify_data(
+            actual_data={"id": 1, "a": {"id": 2}},
+            expected_data={"a": {"id": 2}, "id": 3},
+            unverified_fields=["id"],
+        )
+
+        with pytest.raises(AssertionError, match=r"Несовпадение в поле 'a\.id'"):
+            verify_data(actual_data={"a": {"id": 2}}, expected_data={"a": {"id": 3}}, unverified_fields=["id"])
+
+    @autotest.name("verify_data. С expected_keys_only вложенные словари сравниваются по ключам ожидаемых данных.")
+    def test_expected_keys_only(self):
+        verify_data(actual_data=[{"a": 1, "b": 2}], expected_data=[{"a": 1}], expected_keys_only=True)
+        verify_data(actual_data={"x": {"a": 1}}, expected_data={"x": {}}, expected_keys_only=True)
+        verify_data(
+            actual_data=[{"id": 1, "a": 1}, {"id": 2, "a": 2}],
+            expected_data=[{"a": 2}, {"a": 1}],
+            unordered=True,
+            expected_keys_only=True,
+        )
+
+    @autotest.name("verify_data. Повторяющийся ключ в фактических данных - лишний элемент.")
+    def test_match_key_duplicate_actual_key(self):
+        with pytest.raises(AssertionError, match=r"Лишний элемент '\[id=1\]'"):
+            verify_data(
+                actual_data=[{"id": 1, "a": 1}, {"id": 1, "a": 2}], expected_data=[{"id": 1, "a": 1}], match_key="id"
+            )
+
+    @autotest.name("verify_data. Повторяющийся ключ в ожидаемых данных сопоставляется с отдельным элементом.")
+    def test_match_key_duplicate_expected_key(self):
+        verify_data(
+            actual_data=[{"id": 1, "a": 1}, {"id": 1, "a": 2}],
+            expected_data=[{"id": 1, "a": 1}, {"id": 1, "a": 2}],
+            match_key="id",
+        )
+
+        with pytest.raises(AssertionError, match=r"Не найден ожидаемый элемент '\[id=1\]'"):
+            verify_data(
+                actual_data=[{"id": 1, "a": 1}], expected_data=[{"id": 1, "a": 1}, {"id": 1, "a": 1}], match_key="id"
+            )
+
+    @autotest.name("verify_data. Списки без учёта порядка с допуском сравниваются без перебора всех пар.")
+    def test_unordered_with_tolerance_scales_linearly(self):
+        # Arrange
+        expected = [{"name": "Место", "lat": 55.0 + index * 1e-3, "lon": 37.0} for index in range(3000)]
+        actual = [dict(item, lat=item["lat"] + 1e-9) for item in reversed(expected)]
+
+        # Act
+        started = time.perf_counter()
+        verify_data(actual_data=actual, expected_data=expected, unordered=True, tolerance={"lat": 1e-6})
+        duration = time.perf_counter() - started
+
+        # Assert
+        with autotest.step("Проверяем время сравнения и обнаружение расхождения больше допуска"):
+            assert duration < 2
+            actual[0]["lat"] += 1e-5
+            with pytest.raises(AssertionError, match=r"Не найден ожидаемый элемент '\[2999\]'"):
+                verify_data(actual_data=actual, expected_data=expected, unordered=True, tolerance={"lat": 1e-6})
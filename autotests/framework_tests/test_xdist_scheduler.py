@@ -0,0 +1,101 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from settings.report import autotest
+from settings.scheduling.durations import DurationsStore
+from settings.scheduling.xdist_scheduler import DurationScheduling
+
+
+class FakeConfig:
+    """
+    Конфигурация pytest с двумя воркерами и `--maxschedchunk` по умолчанию.
+    """
+
+    @staticmethod
+    def getvalue(name: str):
+        return ["2*popen"]
+
+    @staticmethod
+    def getoption(name: str):
+        return None
+
+
+class FakeNode:
+    """
+    Воркер xdist: запоминает отправленные ему тесты.
+    """
+
+    def __init__(self, name: str):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent: list[int] = []
+
+    def send_runtest_some(self, indices: list[int]):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def start_scheduler(tmp_path, durations: dict[str, float]) -> tuple[DurationScheduling, list[FakeNode]]:
+    """
+    Создаёт планировщик с двумя воркерами и распределяет первые тесты.
+    """
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps(durations), encoding="utf-8")
+    scheduler = DurationScheduling(FakeConfig(), store=DurationsStore(path))
+    nodes = [FakeNode("gw0"), FakeNode("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, list(durations))
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def complete_next(scheduler: DurationScheduling, node: FakeNode):
+    scheduler.mark_test_complete(node, scheduler.node2pending[node][0])
+
+
+def sent_durations(scheduler: DurationScheduling, node: FakeNode) -> list[float]:
+    return [scheduler.estimates[index] for index in node.sent]
+
+
+@pytest.mark.framework
+class TestDurationScheduling:
+
+    # Очереди LPT: gw0 - 8, 5, 4, 1; gw1 - 7, 6, 3, 2 (по 18 с)
+    DURATIONS = {f"autotests/test_module.py::test_{index}": float(index) for index in range(1, 9)}
+
+    @autotest.name("DurationScheduling. Воркеры получают свои очереди LPT, самые долгие тесты первыми.")
+    def test_queues_drain_in_lpt_order(self, tmp_path):
+        # Arrange
+        scheduler, nodes = start_scheduler(tmp_path, self.DURATIONS)
+
+        # Act
+        while scheduler.has_pending:
+            for node in nodes:
+                if scheduler.node2pending[node]:
+                    complete_next(scheduler, node)
+
+        # Assert
+        with autotest.step("Проверяем тесты, отправленные воркерам"):
+            assert sent_durations(scheduler, nodes[0]) == [8, 5, 4, 1]
+            assert sent_durations(scheduler, nodes[1]) == [7, 6, 3, 2]
+            assert all(node.shutting_down for node in nodes)
+
+    @autotest.name("DurationScheduling. Свободный воркер забирает самые короткие тесты самой загруженной очереди.")
+    def test_idle_worker_steals_shortest_tests(self, tmp_path):
+        # Arrange
+        scheduler, nodes = start_scheduler(tmp_path, self.DURATIONS)
+
+        # Act: gw1 занят первым тестом, gw0 выполняет всё остальное
+        while scheduler.node2pending[nodes[0]]:
+            complete_next(scheduler, nodes[0])
+
+        # Assert
+        with autotest.step("Проверяем, что gw0 после своей очереди забрал тесты gw1 от коротких к длинным"):
+            assert sent_durations(scheduler, nodes[0]) == [8, 5, 4, 1, 2, 3]
+            assert sent_durations(scheduler, nodes[1]) == [7, 6]
+            assert not scheduler.pending
@@ -0,0 +1,90 @@
+"""
+Бенчмарк записи результатов Allure: синхронная (`AllureFileLogger`), буферизованная
+(`BufferedAllureFileLogger`) и буферизованная с сохранением шагов только для упавших тестов.
+
+Каждый тест состоит из нескольких шагов с JSON-вложением; ожидание ответа сервера
+имитируется паузой (`--requestMs`), во время которой фоновый поток успевает писать результаты.
+
+Пример запуска:
+    python -m benchmarks.bench_allure_writer --tests=2000 --steps=5 --failRate=0.05
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import Status, TestResult
+from allure_commons.utils import now
+from allure_pytest.listener import AllureListener
+
+from settings.report import autotest
+from settings.report.allure_buffered_logger import BufferedAllureFileLogger
+
+
+def run_tests(logger, tests: int, steps: int, fail_rate: float, request_ms: float) -> tuple[float, float]:
+    """
+    Имитирует прогон тестов с записью результатов через `logger`.
+
+    :return: Время прогона тестов и полное время с дозаписью результатов, с.
+    """
+    listener = AllureListener(config=None)
+    allure_commons.plugin_manager.register(listener)
+    allure_commons.plugin_manager.register(logger)
+    autotest.use_allure(True)
+    rng = random.Random(1)
+    timing = {"method": "POST", "endpoint": "/v1/favorites", "status": 200, "total_ms": 12.3, "ttfb_ms": 11.9}
+
+    started = time.perf_counter()
+    try:
+        for index in range(tests):
+            test_uuid = uuid.uuid4().hex
+            listener.allure_logger.schedule_test(test_uuid, TestResult(name=f"test_{index}", uuid=test_uuid, start=now()))
+            for step_index in range(steps):
+                with autotest.step(f"Шаг {step_index}"):
+                    time.sleep(request_ms / 1000)
+                    autotest.attach_json(name="timing POST /v1/favorites", data=timing)
+            test_result = listener.allure_logger.get_test(test_uuid)
+            test_result.status = Status.FAILED if rng.random() < fail_rate else Status.PASSED
+            test_result.stop = now()
+            listener.allure_logger.close_test(test_uuid)
+        tests_done = time.perf_counter() - started
+
+        if isinstance(logger, BufferedAllureFileLogger):
+            logger.close()
+        return tests_done, time.perf_counter() - started
+    finally:
+        autotest.use_allure(False)
+        allure_commons.plugin_manager.unregister(logger)
+        allure_commons.plugin_manager.unregister(listener)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк записи результатов Allure")
+    parser.add_argument("--tests", type=int, default=2000, help="Количество тестов.")
+    parser.add_argument("--steps", type=int, default=5, help="Шагов (и вложений) на тест.")
+    parser.add_argument("--failRate", type=float, default=0.05, help="Доля упавших тестов.")
+    parser.add_argument("--requestMs", type=float, default=1.0, help="Имитация ожидания ответа сервера в шаге, мс.")
+    args = parser.parse_args()
+
+    modes = {
+        "синхронно (AllureFileLogger)": lambda path: AllureFileLogger(path),
+        "фоновый поток": lambda path: BufferedAllureFileLogger(path),
+        "фоновый поток, шаги только упавших": lambda path: BufferedAllureFileLogger(path, steps_only_on_failure=True),
+    }
+
+    baseline = None
+    print(f"{'Режим':<38}{'тесты, с':>10}{'всего, с':>10}{'файлов':>9}{'экономия':>10}")
+    for name, factory in modes.items():
+        with tempfile.TemporaryDirectory() as results_dir:
+            tests_done, total = run_tests(factory(results_dir), args.tests, args.steps, args.failRate, args.requestMs)
+            files = len(os.listdir(results_dir))
+        baseline = baseline or tests_done
+        print(f"{name:<38}{tests_done:>10.2f}{total:>10.2f}{files:>9}{1 - tests_done / baseline:>+10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Бенчмарк накладных расходов слоёв фреймворка относительно локальной заглушки сервиса.
+
+Замеряется время на вызов: отправка запроса через `ApiClient` (и для сравнения - напрямую
+через сессию пула, а также воспроизведение ответа из кассеты без сети), шаги `autotest.step` без Allure и с Allure, генерация `RegionsDataApi`,
+`verify_data`, `check_response_status`, а также подготовка теста (autouse-фикстуры `setup`
+и `random_seed`): с созданием объектов API в каждом тесте и с общими объектами `ApiFactory`.
+
+Результаты нормируются на эталонную нагрузку чистого Python, поэтому базовые значения
+(benchmarks/baselines/framework_overhead.json) сравнимы между машинами. Если нормированное
+время вызова выросло больше порога `threshold` и при этом
+больше минимальной абсолютной разницы `min_delta_us`, скрипт завершается с кодом 1: для
+путей короче микросекунды относительный рост в десятки процентов - шум измерения.
+
+Пример запуска:
+    python -m benchmarks.bench_framework_overhead
+    python -m benchmarks.bench_framework_overhead --updateBaseline
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import TestResult
+from allure_pytest.listener import AllureListener
+
+from autotests.api.api_data.regions_data_api import RegionsDataApi
+from autotests.api.api_helpers.api_factory import ApiFactory
+from autotests.api.api_helpers.regions_helper_api import RegionsHelperApi
+from autotests.api.api_methods.auth_methods_api import AuthApi
+from autotests.api.api_methods.regions_methods_api import RegionsApi
+from benchmarks.bench_stub_server import serve
+from settings.api_client.cassette import CassettePlayer, CassetteRecorder, set_cassette
+from settings.api_client.session_pool import get_session_pool
+from settings.configs.config_model import ConfigModel
+from settings.metrics.request_metrics import get_request_metrics
+from settings.report import autotest
+from settings.utils import Randomizer, check_response_status, verify_data
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "framework_overhead.json"
+
+# Замеры, которые не относятся к коду фреймворка и не проверяются на регрессию
+REFERENCE_BENCHMARKS = ("raw_session_post",)
+
+
+def reference_workload():
+    """
+    Эталонная нагрузка чистого Python для нормировки замеров под скорость машины.
+    """
+    total = 0
+    for index in range(2000):
+        total += index * index % 7
+    return total
+
+
+@dataclass
+class Measurement:
+    """
+    Результат замера: время одного вызова и его отношение к эталонной нагрузке.
+    """
+    us: float
+    relative: float
+
+
+def _time_calls(func: Callable, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - started) / number * 1_000_000
+
+
+def measure(func: Callable, number: int, repeat: int = 7) -> Measurement:
+    """
+    Замеряет время одного вызова `func`.
+
+    Эталонная нагрузка замеряется перед каждым повтором, а нормированное значение -
+    медиана отношений соседних замеров, поэтому оно устойчиво к изменению загрузки машины.
+
+    :param func: Замеряемая функция без аргументов.
+    :param number: Количество вызовов в одном повторе.
+    :param repeat: Количество повторов.
+    :return: Минимальное по повторам время вызова (мкс, как в `timeit`) и нормированное значение.
+    """
+    func()
+    timings = []
+    ratios = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            reference_us = _time_calls(reference_workload, 20)
+            timings.append(_time_calls(func, number))
+            ratios.append(timings[-1] / reference_us)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return Measurement(us=min(timings), relative=statistics.median(ratios))
+
+
+@contextmanager
+def allure_test_context(results_dir: str):
+    """
+    Открывает результат теста Allure вне pytest: шаги, параметры и вложения
+    обрабатываются так же, как при прогоне с `--alluredir`.
+
+    :param results_dir: Директория для результатов Allure.
+    """
+    listener = AllureListener(config=None)
+    file_logger = AllureFileLogger(results_dir)
+    allure_commons.plugin_manager.register(listener)
+    allure_commons.plugin_manager.register(file_logger)
+
+    autotest.use_allure(True)
+
+    test_uuid = uuid.uuid4().hex
+    listener.allure_logger.schedule_test(test_uuid, TestResult(name="benchmark", uuid=test_uuid))
+    try:
+        yield
+    finally:
+        autotest.use_allure(False)
+        listener.allure_logger.close_test(test_uuid)
+        allure_commons.plugin_manager.unregister(file_logger)
+        allure_commons.plugin_manager.unregister(listener)
+
+
+def run_benchmarks(config: ConfigModel, number: int, repeat: int) -> dict[str, Measurement]:
+    """
+    Выполняет замеры.
+
+    :param config: Конфигурация, указывающая на заглушку.
+    :param number: Базовое количество вызовов в повторе (для HTTP-замеров - в 10 раз меньше).
+    :param repeat: Количество повторов.
+    :return: Результаты по замерам.
+    """
+    regions_api = RegionsApi(config)
+    token = AuthApi(config).post_auth_token().cookies.get("token")
+    region_data = RegionsDataApi().data
+    cookies = {"token": token}
+    http_number = max(number // 10, 1)
+
+    session = get_session_pool().session_for(regions_api.api_client.base_url)
+    url = f"{regions_api.api_client.base_url}/v1/favorites"
+    headers = {"Accept": "application/json"}
+
+    response = regions_api.api_client.post("/v1/favorites", data=region_data, cookies=cookies)
+    response_data = response.json()
+
+    def post_with_metrics():
+        metrics = get_request_metrics()
+        metrics.enabled = True
+        try:
+            regions_api.api_client.post("/v1/favorites", data=region_data, cookies=cookies)
+        finally:
+            metrics.enabled = False
+
+    def step():
+        with autotest.step("Шаг бенчмарка"):
+            pass
+
+    def test_setup():
+        # Прежняя autouse-фикстура setup тестовых классов: новые объекты и клиенты в каждом тесте
+        RegionsHelperApi(config=config)
+        RegionsApi(config=config)
+
+    api_factory = ApiFactory(config)
+
+    def test_setup_shared():
+        # Текущая autouse-фикстура setup: общие объекты из фабрики сессии
+        api_factory.regions_helper()
+        api_factory.regions_api()
+
+    def random_seed_fixture():
+        seed = Randomizer.derive_seed(42, "autotests/api_tests/test_module.py::TestClass::test_name")
+        autotest.parameter("random seed", seed, excluded=True)
+        Randomizer.reset(Randomizer.use_seed(seed))
+
+    results = {
+        "raw_session_post": measure(
+            lambda: session.post(url, data=region_data, cookies=cookies, headers=headers, timeout=20),
+            http_number, repeat,
+        ),
+        "api_client_post": measure(
+            lambda: regions_api.api_client.post("/v1/favorites", data=region_data, cookies=cookies),
+            http_number, repeat,
+        ),
+        "api_client_post_metrics": measure(post_with_metrics, http_number, repeat),
+        "autotest_step": measure(step, number, repeat),
+        "regions_data": measure(lambda: RegionsDataApi().data, number, repeat),
+        "verify_data": measure(lambda: verify_data(actual_data=response_data, expected_data=region_data), number, repeat),
+        "check_response_status": measure(lambda: check_response_status(response, 200), number, repeat),
+        "test_setup": measure(test_setup, number, repeat),
+        "test_setup_shared": measure(test_setup_shared, number, repeat),
+    }
+    api_factory.close()
+
+    # Воспроизведение из кассеты: накладные расходы ApiClient без сети и заглушки
+    with tempfile.TemporaryDirectory() as cassette_dir:
+        cassette_path = Path(cassette_dir) / "framework_overhead.cas"
+        recorder = CassetteRecorder(cassette_path)
+        set_cassette(recorder)
+        regions_api.api_client.post("/v1/favorites", data=region_data, cookies=cookies)
+        set_cassette(None)
+        recorder.close()
+
+        player = CassettePlayer(cassette_path)
+        set_cassette(player)
+        try:
+            results["api_client_post_replay"] = measure(
+                lambda: regions_api.api_client.post("/v1/favorites", data=region_data, cookies=cookies),
+                number, repeat,
+            )
+        finally:
+            set_cassette(None)
+            player.close()
+
+    # Каждый замер с Allure - в отдельном результате теста, чтобы шаги предыдущих замеров не копились
+    allure_benchmarks = {
+        "autotest_step_allure": (step, number),
+        "post_favorite_region_allure": (
+            lambda: regions_api.post_favorite_region(data=region_data, token=token), http_number
+        ),
+        "random_seed_fixture_allure": (random_seed_fixture, number),
+    }
+    with tempfile.TemporaryDirectory() as results_dir:
+        for name, (func, calls) in allure_benchmarks.items():
+            with allure_test_context(results_dir):
+                results[name] = measure(func, calls, repeat)
+
+    regions_api.async_api_client.close()
+    return results
+
+
+def compare(
+    results: dict[str, Measurement],
+    baseline: dict | None,
+    threshold: float,
+    min_delta_us: float,
+) -> list[str]:
+    """
+    Выводит таблицу замеров и сравнивает нормированные значения с базовыми.
+
+    Рост нормированного времени переводится в микросекунды по текущей скорости эталонной
+    нагрузки; регрессией считается рост больше `threshold` и больше `min_delta_us`.
+
+    :param threshold: Допустимый относительный рост (0.3 = 30%).
+    :param min_delta_us: Минимальный абсолютный рост времени вызова, мкс.
+    :return: Список названий замеров с регрессией.
+    """
+    regressions = []
+    print(f"{'Замер':<32}{'мкс/вызов':>12}{'норм.':>10}{'база':>10}{'изменение':>12}{'мкс':>8}")
+    for name, result in results.items():
+        line = f"{name:<32}{result.us:>12.1f}{result.relative:>10.3f}"
+
+        base = (baseline or {}).get("benchmarks", {}).get(name)
+        if base is not None:
+            change = result.relative / base["relative"] - 1
+            delta_us = (result.relative - base["relative"]) * result.us / result.relative
+            line += f"{base['relative']:>10.3f}{change:>+12.0%}{delta_us:>+8.1f}"
+            if name not in REFERENCE_BENCHMARKS and change > threshold and delta_us > min_delta_us:
+                regressions.append(name)
+                line += "  РЕГРЕССИЯ"
+        print(line)
+
+    overhead = results["api_client_post"].us - results["raw_session_post"].us
+    print(f"\nНакладные расходы ApiClient на запрос: {overhead:.1f} мкс")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк накладных расходов фреймворка")
+    parser.add_argument("--port", type=int, default=18766, help="Порт локальной заглушки.")
+    parser.add_argument("--number", type=int, default=2000, help="Количество вызовов в повторе.")
+    parser.add_argument("--repeat", type=int, default=7, help="Количество повторов.")
+    parser.add_argument("--threshold", type=float, default=None, help="Допустимый рост нормированного времени (0.3 = 30%%).")
+    parser.add_argument(
+        "--minDeltaUs", type=float, default=None, help="Минимальный абсолютный рост времени вызова для регрессии, мкс."
+    )
+    parser.add_argument("--updateBaseline", action="store_true", help="Сохранить результаты как базовые.")
+    args = parser.parse_args()
+
+    server = multiprocessing.Process(target=serve, args=(args.port,), daemon=True)
+    server.start()
+    time.sleep(1)
+    try:
+        results = run_benchmarks(ConfigModel(base_url=f"http://127.0.0.1:{args.port}"), args.number, args.repeat)
+    finally:
+        server.terminate()
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else None
+    threshold = args.threshold if args.threshold is not None else (baseline or {}).get("threshold", 0.3)
+    min_delta_us = args.minDeltaUs if args.minDeltaUs is not None else (baseline or {}).get("min_delta_us", 1.0)
+    regressions = compare(results, None if args.updateBaseline else baseline, threshold, min_delta_us)
+
+    if args.updateBaseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({
+            "threshold": threshold,
+            "min_delta_us": min_delta_us,
+            "benchmarks": {
+                name: {"us": round(result.us, 2), "relative": round(result.relative, 4)}
+                for name, result in results.items()
+            },
+        }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Базовые значения сохранены: {BASELINE_PATH}")
+        return
+
+    if regressions:
+        print(f"Регрессия больше порога и больше {min_delta_us:.1f} мкс: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
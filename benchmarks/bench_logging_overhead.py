@@ -0,0 +1,128 @@
+"""
+Бенчмарк накладных расходов журналирования в параллельном прогоне.
+
+Несколько процессов (как воркеры xdist) имитируют тесты, каждый из которых пишет
+`--records` записей о запросах (сообщение и замеры `RequestTiming` в `extra`):
+- file: прежняя схема pytest.ini - общий файл `log_file` (сброс после каждой записи)
+  и вывод `log_cli` в терминал (здесь - в /dev/null), форматирование в потоке теста;
+- file_json: те же записи JSON Lines, что и в queue, но синхронно в общий файл;
+- queue: `StructuredLog` - очередь, фоновая запись JSON Lines в буферизованный файл
+  процесса и слияние журналов по времени в конце прогона.
+
+Ожидание ответа сервера имитируется паузой перед каждой записью (`--requestMs`): в это время
+фоновый поток успевает записать очередь. Выводится время журналирования на тест в потоке теста
+и полное время прогона с дозаписью и слиянием журналов.
+
+Пример запуска:
+    python -m benchmarks.bench_logging_overhead --workers=2 --tests=2000 --records=5 --requestMs=1
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from settings.metrics.request_metrics import RequestTiming
+from settings.report.structured_log import JsonLinesFormatter, StructuredLog, TestContextFilter, merge_logs
+
+LOG_FORMAT = "%(asctime)s - %(message)s"
+
+
+def setup_file_logging(path: Path) -> list[logging.Handler]:
+    file_handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+    cli_handler = logging.StreamHandler(open(os.devnull, "w"))
+    for handler in (file_handler, cli_handler):
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.getLogger().addHandler(handler)
+    return [file_handler, cli_handler]
+
+
+def setup_file_json_logging(path: Path, context: TestContextFilter) -> list[logging.Handler]:
+    file_handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+    file_handler.setFormatter(JsonLinesFormatter())
+    file_handler.addFilter(context)
+    logging.getLogger().addHandler(file_handler)
+    return [file_handler]
+
+
+def run_worker(mode: str, directory: str, worker: str, tests: int, records: int, request_ms: float, results):
+    logger = logging.getLogger("settings.api_client.api_client")
+    logging.getLogger().setLevel(logging.INFO)
+    if mode == "queue":
+        structured_log = StructuredLog(Path(directory) / f"log.{worker}.jsonl", worker=worker)
+        structured_log.start()
+        context = structured_log.context
+    else:
+        context = TestContextFilter(worker)
+        if mode == "file_json":
+            handlers = setup_file_json_logging(Path(directory) / "pytest.jsonl", context)
+        else:
+            handlers = setup_file_logging(Path(directory) / "pytest.log")
+
+    timing = RequestTiming(
+        method="POST", endpoint="/v1/favorites", url="http://127.0.0.1/v1/favorites",
+        status=200, total_ms=12.3, ttfb_ms=11.9, test_name="test_create_favorite_region",
+    )
+    logging_seconds = 0.0
+    started = time.perf_counter()
+    for index in range(tests):
+        context.test_id = f"test_regions.py::test_{index}"
+        for _ in range(records):
+            time.sleep(request_ms / 1000)
+            before = time.perf_counter()
+            logger.info(
+                "%s %s -> %s за %.1f мс", timing.method, timing.endpoint, timing.status, timing.total_ms,
+                extra={"timing": timing},
+            )
+            logging_seconds += time.perf_counter() - before
+
+    if mode == "queue":
+        structured_log.stop()
+    else:
+        for handler in handlers:
+            handler.close()
+    results.put((logging_seconds, time.perf_counter() - started))
+
+
+def run_mode(mode: str, workers: int, tests: int, records: int, request_ms: float) -> tuple[float, float]:
+    """
+    :return: Время журналирования на тест в потоке теста (мкс, среднее по воркерам) и полное время, с.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        results = multiprocessing.Queue()
+        started = time.perf_counter()
+        processes = [
+            multiprocessing.Process(
+                target=run_worker, args=(mode, directory, f"gw{index}", tests, records, request_ms, results),
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        logging_seconds = [results.get()[0] for _ in processes]
+        for process in processes:
+            process.join()
+        if mode == "queue":
+            merge_logs(sorted(Path(directory).glob("log.*.jsonl")), Path(directory) / "pytest.jsonl")
+        total = time.perf_counter() - started
+    return sum(logging_seconds) / workers / tests * 1e6, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк накладных расходов журналирования")
+    parser.add_argument("--workers", type=int, default=2, help="Количество процессов-воркеров.")
+    parser.add_argument("--tests", type=int, default=2000, help="Количество тестов на воркер.")
+    parser.add_argument("--records", type=int, default=5, help="Количество записей журнала на тест.")
+    parser.add_argument("--requestMs", type=float, default=1, help="Имитация ожидания ответа перед записью, мс.")
+    args = parser.parse_args()
+
+    print(f"{'Режим':<11}{'мкс на тест':>14}{'всего, с':>12}")
+    for mode in ("file", "file_json", "queue"):
+        per_test_us, total = run_mode(mode, args.workers, args.tests, args.records, args.requestMs)
+        print(f"{mode:<11}{per_test_us:>14.1f}{total:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
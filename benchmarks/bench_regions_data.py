@@ -0,0 +1,51 @@
+"""
+Бенчмарк генерации данных избранных мест: поштучно (`RegionsDataApi().data`) и пакетно (`RegionsDataApi.iter_batch`).
+
+Пример запуска:
+    python -m benchmarks.bench_regions_data --count=200000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from autotests.api.api_data.regions_data_api import RegionsDataApi
+
+
+def bench_per_object(count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        RegionsDataApi().data
+    return count / (time.perf_counter() - started)
+
+
+def bench_batch(count: int) -> float:
+    started = time.perf_counter()
+    for _ in RegionsDataApi.iter_batch(count, seed=42):
+        pass
+    return count / (time.perf_counter() - started)
+
+
+def bench_batch_to_file(count: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        started = time.perf_counter()
+        RegionsDataApi.write_batch(os.path.join(tmp_dir, "regions.jsonl"), count, seed=42)
+        return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации данных избранных мест")
+    parser.add_argument("--count", type=int, default=200_000, help="Количество записей.")
+    args = parser.parse_args()
+
+    per_object = bench_per_object(args.count)
+    batch = bench_batch(args.count)
+    batch_to_file = bench_batch_to_file(args.count)
+
+    print(f"Поштучно (RegionsDataApi().data):  {per_object:>12,.0f} записей/с")
+    print(f"Пакетно (iter_batch):             {batch:>12,.0f} записей/с (x{batch / per_object:.1f})")
+    print(f"Пакетно в файл (write_batch):     {batch_to_file:>12,.0f} записей/с")
+
+
+if __name__ == "__main__":
+    main()
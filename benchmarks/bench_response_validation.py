@@ -0,0 +1,80 @@
+"""
+Бенчмарк проверки тела ответа по схеме (`settings.validation.response_validator`).
+
+Сравниваются способы проверки одного ответа POST /v1/favorites и большого списка избранных мест:
+- валидатор создаётся на каждый ответ, тело разбирается `json.loads` (без кэша);
+- кэшированный валидатор, тело разбирается `json.loads` и проверяется словарь;
+- кэшированный валидатор, байты тела проверяются напрямую (`validate_json`).
+
+Пример запуска:
+    python -m benchmarks.bench_response_validation --items=10000
+"""
+import argparse
+import json
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from autotests.api.api_models.regions_models_api import FavoriteRegionModel
+from settings.validation.response_validator import get_validator, validate_json
+
+
+def favorites_body(count: int) -> bytes:
+    """
+    Тело ответа со списком избранных мест в формате заглушки.
+    """
+    colors = ("BLUE", "GREEN", "RED", "YELLOW", None)
+    return json.dumps([
+        {
+            "id": index,
+            "title": f"Избранное место {index}",
+            "lat": 55.028254 + index / 1e6,
+            "lon": 82.918501 - index / 1e6,
+            "color": colors[index % len(colors)],
+            "created_at": "2026-01-01T00:00:00Z",
+        }
+        for index in range(count)
+    ], ensure_ascii=False).encode()
+
+
+def per_second(func: Callable, seconds: float) -> float:
+    """
+    Количество вызовов `func` в секунду за время не меньше `seconds`.
+    """
+    func()
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        func()
+        calls += 1
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк проверки тела ответа по схеме")
+    parser.add_argument("--items", type=int, default=10000, help="Количество мест в большом ответе.")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Длительность каждого замера, с.")
+    args = parser.parse_args()
+
+    cases = {
+        "один объект": (FavoriteRegionModel, json.dumps(json.loads(favorites_body(1))[0]).encode()),
+        f"список из {args.items}": (list[FavoriteRegionModel], favorites_body(args.items)),
+    }
+
+    print(f"{'Ответ':<20}{'Способ':<36}{'проверок/с':>12}{'МБ/с':>10}{'ускорение':>11}")
+    for case, (schema, body) in cases.items():
+        modes = {
+            "без кэша, json.loads": lambda: TypeAdapter(schema).validate_python(json.loads(body)),
+            "кэш, json.loads": lambda: get_validator(schema).validate_python(json.loads(body)),
+            "кэш, байты напрямую": lambda: validate_json(body, schema),
+        }
+        baseline = None
+        for mode, func in modes.items():
+            rate = per_second(func, args.seconds)
+            baseline = baseline or rate
+            print(f"{case:<20}{mode:<36}{rate:>12,.1f}{rate * len(body) / 1e6:>10.1f}{rate / baseline:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
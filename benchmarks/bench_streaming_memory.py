@@ -0,0 +1,132 @@
+"""
+Бенчмарк памяти при чтении больших ответов-списков через `ApiClient`.
+
+Локальный HTTP-сервер отдаёт JSON-массив избранных мест (chunked), клиент считает
+и проверяет по схеме элементы двумя способами:
+- обычный ответ: тело буферизуется (`content`), декодируется и разбирается `json()` целиком;
+- потоковый ответ (`stream=True`): элементы разбираются по мере чтения (`iter_items`).
+
+Каждый замер выполняется в отдельном процессе; выводится прирост пикового RSS процесса
+(VmHWM) и пик памяти Python-объектов (tracemalloc).
+
+Пример запуска:
+    python -m benchmarks.bench_streaming_memory --items=10000,100000,300000
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from autotests.api.api_models.regions_models_api import FavoriteRegionModel
+from settings.api_client.api_client import ApiClient
+from settings.configs.config_model import ConfigModel
+from settings.validation.response_validator import get_validator
+
+ITEMS_PER_CHUNK = 500
+
+
+class FavoritesHandler(BaseHTTPRequestHandler):
+    """
+    Отдаёт GET /v1/favorites?count=N - JSON-массив из N мест, передаваемый чанками.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        count = int(parse_qs(urlparse(self.path).query).get("count", ["0"])[0])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        colors = ("BLUE", "GREEN", "RED", "YELLOW")
+        for start in range(0, count, ITEMS_PER_CHUNK):
+            items = ",".join(
+                json.dumps({
+                    "id": index,
+                    "title": f"Избранное место {index}",
+                    "lat": 55.028254,
+                    "lon": 82.918501,
+                    "color": colors[index % len(colors)],
+                    "created_at": "2026-01-01T00:00:00Z",
+                }, ensure_ascii=False)
+                for index in range(start, min(start + ITEMS_PER_CHUNK, count))
+            )
+            self._write_chunk(("[" if start == 0 else ",") + items)
+        self._write_chunk("]" if count else "[]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int):
+    ThreadingHTTPServer(("127.0.0.1", port), FavoritesHandler).serve_forever()
+
+
+def _memory_kb(field: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def read_buffered(api_client: ApiClient, count: int) -> int:
+    validator = get_validator(FavoriteRegionModel)
+    response = api_client.get("/v1/favorites", params={"count": count})
+    return sum(1 for item in response.json() if validator.validate_python(item))
+
+
+def read_streamed(api_client: ApiClient, count: int) -> int:
+    response = api_client.get("/v1/favorites", params={"count": count}, stream=True)
+    return sum(1 for _ in response.iter_items(schema=FavoriteRegionModel))
+
+
+def run_mode(mode: str, port: int, count: int, results):
+    api_client = ApiClient(config=ConfigModel(base_url=f"http://127.0.0.1:{port}"), controller_path="")
+    reader = read_streamed if mode == "stream" else read_buffered
+
+    rss_before = _memory_kb("VmRSS")
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = reader(api_client, count)
+    elapsed = time.perf_counter() - started
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.put((items, elapsed, _memory_kb("VmHWM") - rss_before, python_peak / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк памяти при чтении больших ответов")
+    parser.add_argument("--port", type=int, default=18767, help="Порт локального сервера.")
+    parser.add_argument("--items", default="10000,100000,300000", help="Размеры ответов через запятую.")
+    args = parser.parse_args()
+
+    server = multiprocessing.Process(target=serve, args=(args.port,), daemon=True)
+    server.start()
+    time.sleep(1)
+
+    print(f"{'Мест':>8}  {'Режим':<10}{'время, с':>10}{'прирост RSS, МБ':>18}{'пик Python, МБ':>17}")
+    try:
+        for count in (int(value) for value in args.items.split(",")):
+            for mode in ("buffered", "stream"):
+                results = multiprocessing.Queue()
+                process = multiprocessing.Process(target=run_mode, args=(mode, args.port, count, results))
+                process.start()
+                items, elapsed, rss_kb, python_kb = results.get()
+                process.join()
+                assert items == count, f"Прочитано {items} мест вместо {count}"
+                print(f"{count:>8}  {mode:<10}{elapsed:>10.2f}{rss_kb / 1024:>18.1f}{python_kb / 1024:>17.1f}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
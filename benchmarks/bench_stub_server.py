@@ -0,0 +1,93 @@
+"""
+Бенчмарк пропускной способности заглушки Regions (`settings.stub_server`).
+
+Сервер запускается в отдельном процессе (одно ядро), нагрузку дают несколько
+процессов-клиентов с keep-alive соединениями, отправляющих POST /v1/favorites.
+
+Пример запуска:
+    python -m benchmarks.bench_stub_server --seconds=5 --clients=3 --connections=32
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+from urllib.parse import urlencode
+
+from settings.stub_server.stub_server import StubServer
+
+
+def serve(port: int):
+    StubServer(port=port).serve_forever()
+
+
+async def _connection_loop(host: str, port: int, token: str, deadline: float) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    body = urlencode({"title": "bench", "lat": 55.028254, "lon": 82.918501, "color": "GREEN"}).encode()
+    request = (
+        f"POST /v1/favorites HTTP/1.1\r\nHost: {host}\r\nCookie: token={token}\r\n"
+        f"Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+    done = 0
+    while time.monotonic() < deadline:
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+        await reader.readexactly(length)
+        done += 1
+    writer.close()
+    return done
+
+
+async def _issue_token(host: str, port: int) -> str:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"POST /v1/auth/tokens HTTP/1.1\r\nHost: {host}\r\nContent-Length: 0\r\n\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    writer.close()
+    return head.split(b"token=", 1)[1].split(b";", 1)[0].decode()
+
+
+def client(port: int, connections: int, seconds: float, results):
+    async def run():
+        token = await _issue_token("127.0.0.1", port)
+        deadline = time.monotonic() + seconds
+        counts = await asyncio.gather(
+            *(_connection_loop("127.0.0.1", port, token, deadline) for _ in range(connections))
+        )
+        results.put(sum(counts))
+
+    asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пропускной способности заглушки Regions")
+    parser.add_argument("--port", type=int, default=18765, help="Порт заглушки.")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Длительность замера, с.")
+    parser.add_argument("--clients", type=int, default=3, help="Количество процессов-клиентов.")
+    parser.add_argument("--connections", type=int, default=32, help="Соединений на процесс-клиент.")
+    args = parser.parse_args()
+
+    server = multiprocessing.Process(target=serve, args=(args.port,), daemon=True)
+    server.start()
+    time.sleep(1)
+
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=client, args=(args.port, args.connections, args.seconds, results))
+        for _ in range(args.clients)
+    ]
+    for process in clients:
+        process.start()
+    total = sum(results.get() for _ in clients)
+    for process in clients:
+        process.join()
+    server.terminate()
+
+    print(
+        f"POST /v1/favorites: {total:,} ответов за {args.seconds:.0f} с - {total / args.seconds:,.0f} запросов/с "
+        f"({args.clients} x {args.connections} соединений)"
+    )
+
+
+if __name__ == "__main__":
+    main()
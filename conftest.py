@@ -1,15 +1,58 @@
+import logging
 import os
+import random
 import shutil
 import subprocess
+import uuid
+from dataclasses import asdict
 from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 import pytest
-from pyAesCrypt import decryptFile
 
-from autotests.api.api_methods.auth_methods_api import AuthApi
-from settings.configs.config_model import ConfigModel
-from settings.configs.env_config_loader import EnvConfigLoader
+from autotests.api.api_helpers.entities_registry import EntitiesRegistry
+from settings.api_client.rate_limiter import SharedRateLimiter, configure_rate_limiter
 from settings.constants.constants_settings import Paths
+from settings.data.covering_array import CoverageReport, CoveringArray
+from settings.metrics.request_metrics import get_request_metrics
+from settings.metrics.startup_profile import StartupProfiler, StartupReport
+from settings.report import autotest
+from settings.report.structured_log import StructuredLog, merge_logs
+from settings.scheduling.durations import (
+    DurationsRecorder,
+    DurationsStore,
+    hash_partition,
+    lpt_partition,
+    parse_shard,
+)
+from settings.utils import Randomizer
+
+if TYPE_CHECKING:
+    # Клиент API, Allure, расшифровка и заглушка импортируются там, где они нужны:
+    # контроллеру xdist и прогонам без соответствующих опций они не требуются
+    from autotests.api.api_helpers.api_factory import ApiFactory
+    from settings.api_client.cassette import CassettePlayer, CassetteRecorder
+    from settings.auth.token_provider import TokenProvider
+    from settings.configs.config_model import ConfigModel
+    from settings.report.allure_buffered_logger import BufferedAllureFileLogger
+    from settings.stub_server.stub_server import StubServer
+
+HTTP_POOL_STATS_KEY = pytest.StashKey[list]()
+RUN_ID_KEY = pytest.StashKey[str]()
+ENV_VALUES_KEY = pytest.StashKey[dict]()
+RANDOM_SEED_KEY = pytest.StashKey[int]()
+STUB_SERVER_KEY = pytest.StashKey["StubServer"]()
+ALLURE_LOGGER_KEY = pytest.StashKey["BufferedAllureFileLogger"]()
+ALLURE_WRITER_STATS_KEY = pytest.StashKey[list]()
+CASSETTE_KEY = pytest.StashKey["CassetteRecorder | CassettePlayer"]()
+DURATIONS_KEY = pytest.StashKey[DurationsStore]()
+DURATIONS_RECORDER_KEY = pytest.StashKey[DurationsRecorder]()
+STRUCTURED_LOG_KEY = pytest.StashKey[StructuredLog]()
+REQUEST_METRICS_SUMMARY_KEY = pytest.StashKey[dict]()
+COVERING_REPORTS_KEY = pytest.StashKey[dict]()
+STARTUP_PROFILER_KEY = pytest.StashKey[StartupProfiler]()
+STARTUP_REPORTS_KEY = pytest.StashKey[list]()
 
 
 def pytest_addoption(parser):
@@ -18,6 +61,18 @@ def pytest_addoption(parser):
 
     --envFile: путь к .env-файлу, используемому для генерации конфигурации окружения.
     --htmlReport: флаг для генерации HTML-отчёта после выполнения тестов.
+    --requestMetrics: флаг для сбора замеров HTTP-запросов.
+    --randomSeed: зерно генерации тестовых данных для воспроизведения прогона.
+    --keepEntities: флаг, отключающий удаление созданных тестами сущностей после прогона.
+    --stubServer: флаг запуска прогона на локальной заглушке сервиса вместо стенда.
+    --stubProfile: путь к JSON-профилю заглушки (задержки, ошибки, конкурентность).
+    --allureBuffered: флаг записи результатов Allure фоновым потоком.
+    --allureStepsOnFailure: флаг сохранения шагов Allure только для упавших тестов.
+    --recordCassette: путь к кассете, в которую записываются HTTP-обмены прогона.
+    --replayCassette: путь к кассете, из которой воспроизводятся ответы без обращения к сети.
+    --shard: запуск части тестов i/N с равным ожидаемым временем (для разбиения по машинам CI).
+    --profileStartup: флаг вывода профиля запуска процессов (импорт и сборка тестовых модулей).
+    --startupBudgetMs: бюджет CPU-времени запуска процесса для --profileStartup, мс.
     """
     parser.addoption(
         "--envFile",
@@ -39,14 +94,138 @@ def pytest_addoption(parser):
         help="Сгенерировать Allure-отчёт в директорию logs/reports/allure-report"
     )
 
+    parser.addoption(
+        "--requestMetrics",
+        action="store_true",
+        default=False,
+        help="Собирать замеры HTTP-запросов (шаги Allure и сводка logs/reports/request_metrics.json)"
+    )
 
-@pytest.fixture(scope="session")
-def config(pytestconfig) -> ConfigModel:
+    parser.addoption(
+        "--randomSeed",
+        action="store",
+        type=int,
+        default=None,
+        help="Зерно генерации тестовых данных (по умолчанию случайное, выводится в отчёте)."
+    )
+
+    parser.addoption(
+        "--keepEntities",
+        action="store_true",
+        default=False,
+        help="Не удалять созданные тестами сущности после прогона."
+    )
+
+    parser.addoption(
+        "--stubServer",
+        action="store_true",
+        default=False,
+        help="Запустить локальную заглушку сервиса Regions и направить на неё тесты (BASE_URL из --envFile игнорируется)."
+    )
+
+    parser.addoption(
+        "--stubProfile",
+        action="store",
+        default=None,
+        help="Путь к JSON-профилю заглушки: задержки, внедрение ошибок и ограничение конкурентности по эндпоинтам."
+    )
+
+    parser.addoption(
+        "--allureBuffered",
+        action="store_true",
+        default=False,
+        help="Записывать результаты Allure в фоновом потоке пакетами вместо синхронной записи."
+    )
+
+    parser.addoption(
+        "--allureStepsOnFailure",
+        action="store_true",
+        default=False,
+        help="Сохранять шаги Allure и их вложения только для упавших тестов (включает --allureBuffered)."
+    )
+
+    parser.addoption(
+        "--recordCassette",
+        action="store",
+        default=None,
+        help="Записать HTTP-обмены прогона в кассету (файл) для последующего воспроизведения."
+    )
+
+    parser.addoption(
+        "--replayCassette",
+        action="store",
+        default=None,
+        help="Воспроизводить ответы из кассеты без обращения к сети (зерно данных берётся из кассеты)."
+    )
+
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        help="Запустить шард i/N (например, 1/4): тесты делятся на N частей по --shardDurations или по хэшу node id."
+    )
+
+    parser.addoption(
+        "--shardDurations",
+        action="store",
+        default=None,
+        help="Файл длительностей тестов для --shard, общий для всех машин (в репозитории); прогоном не изменяется."
+    )
+
+    parser.addoption(
+        "--profileStartup",
+        action="store_true",
+        default=False,
+        help="Вывести профиль запуска контроллера и воркеров: время до конфигурации, импорт и сборку тестовых модулей."
+    )
+
+    parser.addoption(
+        "--startupBudgetMs",
+        action="store",
+        type=float,
+        default=None,
+        help="Бюджет CPU-времени запуска процесса до конца сборки, мс: превышение отмечается в профиле запуска."
+    )
+
+
+def read_env_values(pytestconfig) -> dict:
     """
-    Сессионная фикстура, загружающая и возвращающая объект конфигурации из .env-файла или .aes-файла.
+    Читает переменные окружения стенда из .env-файла или .aes-файла (один раз за процесс).
+
+    Воркеры xdist получают уже прочитанные контроллером переменные через `workerinput`,
+    поэтому .aes-файл расшифровывается один раз за прогон.
     """
-    env_path = pytestconfig.getoption("envFile")
+    values = pytestconfig.stash.get(ENV_VALUES_KEY, None)
+    if values is not None:
+        return values
+
+    workerinput = getattr(pytestconfig, "workerinput", None)
+    if workerinput and workerinput.get("env_values") is not None:
+        values = workerinput["env_values"]
+    else:
+        env_path = pytestconfig.getoption("envFile")
+        stub_server = pytestconfig.stash.get(STUB_SERVER_KEY, None)
 
+        # .aes-файл расшифровывается в память, без записи открытого .env на диск
+        cassette = pytestconfig.stash.get(CASSETTE_KEY, None)
+        values = {}
+        if pytestconfig.getoption("--replayCassette") and not env_path:
+            values["BASE_URL"] = cassette.meta.get("base_url")
+        elif env_path or stub_server is None:
+            from settings.configs.env_config_loader import EnvConfigLoader
+
+            values = EnvConfigLoader().read_values(resolve_env_path(env_path))
+        if stub_server is not None:
+            values["BASE_URL"] = stub_server.base_url
+
+    pytestconfig.stash[ENV_VALUES_KEY] = values
+    return values
+
+
+def resolve_env_path(env_path: str) -> str:
+    """
+    Приводит путь к .env-файлу к абсолютному относительно корня проекта и проверяет, что файл существует.
+    """
     # Приводим к абсолютному пути относительно корня проекта
     if not os.path.isabs(env_path):
         project_root = os.path.abspath(os.path.dirname(__file__))
@@ -54,37 +233,540 @@ def config(pytestconfig) -> ConfigModel:
 
     if not os.path.exists(env_path):
         raise FileNotFoundError(f".env file not found: {env_path}")
+    return env_path
+
+
+@pytest.fixture(scope="session")
+def config(pytestconfig) -> "ConfigModel":
+    """
+    Сессионная фикстура, загружающая и возвращающая объект конфигурации из .env-файла или .aes-файла.
+    """
+    from settings.configs.env_config_loader import EnvConfigLoader
 
-    # Если это зашифрованный файл
-    if env_path.endswith(".aes"):
+    return EnvConfigLoader().load_values(read_env_values(pytestconfig))
 
-        decrypted_path = env_path.removesuffix(".aes")
-        password = os.getenv("TEST_CONFIG_PASSWORD")
-        if not password:
-            raise EnvironmentError("Не задан TEST_CONFIG_PASSWORD для расшифровки .aes-файла")
+def token_cache_path(config) -> Path:
+    """
+    Возвращает путь к кэшу токенов текущего прогона (общий для всех воркеров xdist).
+    """
+    return Paths.CACHE / f"tokens_{config.stash[RUN_ID_KEY]}.json"
 
-        try:
-            decryptFile(env_path, decrypted_path, password, bufferSize=64 * 1024)
-        except Exception as e:
-            raise RuntimeError(f"Ошибка при расшифровке файла {env_path}: {e}") from e
 
-        env_path = decrypted_path
+@pytest.fixture(scope="session")
+def api_factory(config: "ConfigModel") -> "ApiFactory":
+    """
+    Сессионная фикстура фабрики общих объектов методов API и хелперов (одна на процесс):
+    тесты получают готовые объекты вместо создания клиентов в каждом тесте.
+    """
+    from autotests.api.api_helpers.api_factory import ApiFactory
+
+    factory = ApiFactory(config)
+    yield factory
+    factory.close()
 
-    config = EnvConfigLoader().load(env_path=env_path)
-    return config
 
 @pytest.fixture(scope="session")
-def session_token(config: ConfigModel) -> str:
+def token_provider(pytestconfig, config: "ConfigModel", api_factory: "ApiFactory") -> "TokenProvider":
+    """
+    Сессионная фикстура поставщика токенов: токен получается один раз за прогон
+    и используется всеми воркерами xdist, обновление - в фоне до истечения срока.
+    """
+    from settings.auth.token_provider import TokenProvider
+
+    provider = TokenProvider(
+        mint_token=api_factory.auth_api().post_auth_token,
+        cache_path=token_cache_path(pytestconfig),
+        ttl_seconds=config.token_ttl_seconds,
+        refresh_margin_seconds=config.token_refresh_margin_seconds,
+    )
+    yield provider
+    provider.close()
+
+
+@pytest.fixture(autouse=True)
+def random_seed(request) -> int:
+    """
+    Автофикстура: инициализирует генератор `Randomizer` теста зерном,
+    производным от зерна прогона и node id теста.
+    """
+    seed = Randomizer.derive_seed(request.config.stash[RANDOM_SEED_KEY], request.node.nodeid)
+    autotest.parameter("random seed", seed, excluded=True)
+
+    token = Randomizer.use_seed(seed)
+    yield seed
+    Randomizer.reset(token)
+
+
+@pytest.fixture
+def session_token(token_provider: "TokenProvider") -> str:
     """
     Фикстура, получения токена.
     """
-    auth_api = AuthApi(config)
-    response = auth_api.post_auth_token()
-    return response.cookies.get("token")
+    return token_provider.get_token()
+
+
+@pytest.fixture
+def user_tokens(token_provider: "TokenProvider") -> Callable[[int], list[str]]:
+    """
+    Фикстура-фабрика различных токенов для тестов, которым нужна изоляция пользователей.
+    Пример: `first_token, second_token = user_tokens(2)`.
+    """
+    return token_provider.get_tokens
+
+
+@pytest.fixture(scope="module")
+def stub_server() -> "StubServer":
+    """
+    Фикстура отдельной заглушки сервиса Regions для одного тестового модуля (в текущем процессе).
+    Для тестов, которым нужен управляемый стенд: профиль меняется через `stub_server.set_profile(...)`.
+    """
+    from settings.stub_server.stub_server import StubServer
+
+    server = StubServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    Хук pytest-xdist: передаёт воркеру идентификатор прогона и прочитанные переменные стенда.
+    """
+    node.workerinput["run_id"] = node.config.stash[RUN_ID_KEY]
+    node.workerinput["random_seed"] = node.config.stash[RANDOM_SEED_KEY]
+    if any(node.config.getoption(name) for name in ("envFile", "stubServer", "replayCassette")):
+        node.workerinput["env_values"] = read_env_values(node.config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Хук pytest-xdist: собирает счётчики пула соединений, замеры запросов, счётчики записи Allure,
+    итоги покрывающих наборов и профиль запуска завершившегося воркера.
+    """
+    workeroutput = getattr(node, "workeroutput", {})
+
+    worker_stats = workeroutput.get("http_pool_stats")
+    if worker_stats:
+        node.config.stash.setdefault(HTTP_POOL_STATS_KEY, []).append(worker_stats)
+
+    worker_metrics = workeroutput.get("request_metrics")
+    if worker_metrics:
+        get_request_metrics().merge_state(worker_metrics)
+
+    worker_allure_stats = workeroutput.get("allure_writer_stats")
+    if worker_allure_stats:
+        node.config.stash.setdefault(ALLURE_WRITER_STATS_KEY, []).append(worker_allure_stats)
+
+    worker_startup = workeroutput.get("startup_profile")
+    if worker_startup:
+        node.config.stash.setdefault(STARTUP_REPORTS_KEY, []).append(StartupReport.from_dict(worker_startup))
+
+    # Все воркеры собирают одинаковые наборы, достаточно отчёта любого из них
+    for report in workeroutput.get("covering_reports", []):
+        node.config.stash.setdefault(COVERING_REPORTS_KEY, {}).setdefault(report["name"], CoverageReport(**report))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """
+    Хук pytest-xdist: для --dist load распределяет тесты по воркерам с учётом длительностей прошлых прогонов.
+    """
+    if config.getoption("dist") == "load":
+        from settings.scheduling.xdist_scheduler import DurationScheduling
+
+        return DurationScheduling(config, log, store=config.stash[DURATIONS_KEY])
+    return None
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    При --shard i/N оставляет тесты шарда i, порядок тестов внутри шарда сохраняется.
+
+    С --shardDurations тесты делятся на N частей с равным ожидаемым временем по этому файлу
+    (он только читается), иначе - по хэшу node id. Локальный logs/durations.json меняется
+    от прогона к прогону и на разных машинах различается, поэтому для шардов не используется.
+    """
+    shard = config.getoption("--shard")
+    if not shard:
+        return
+    try:
+        index, total = parse_shard(shard)
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+
+    durations_path = config.getoption("--shardDurations")
+    nodeids = [item.nodeid for item in items]
+    if durations_path:
+        store = DurationsStore(Path(durations_path))
+        estimates = {nodeid: store.estimate(nodeid) for nodeid in nodeids}
+        selected = set(lpt_partition(estimates, estimates, total)[index - 1])
+    else:
+        selected = set(hash_partition(nodeids, total)[index - 1])
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Параметризует аргумент `case` тестов с маркером `covering` покрывающим набором классов значений полей
+    (аргументы маркера - аргументы `CoveringArray`). Наборы строятся при сборке тестов.
+    """
+    marker = metafunc.definition.get_closest_marker("covering")
+    if marker is None:
+        return
+
+    covering_array = CoveringArray(*marker.args, **marker.kwargs)
+    cases = list(covering_array)
+    metafunc.parametrize("case", cases, ids=[case.id for case in cases])
+    report = covering_array.report(metafunc.definition.nodeid)
+    metafunc.config.stash.setdefault(COVERING_REPORTS_KEY, {})[report.name] = report
+
+
+def report_covering_arrays(session):
+    """
+    Выводит, сколько наборов значений построено для тестов с маркером `covering` вместо полного перебора.
+    В воркере xdist итоги передаются контроллеру через `workeroutput`.
+    """
+    reports = session.config.stash.get(COVERING_REPORTS_KEY, {})
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["covering_reports"] = [asdict(report) for report in reports.values()]
+        return
+
+    for report in reports.values():
+        print(report.format())
+
+
+def report_startup_profile(session):
+    """
+    Выводит профиль запуска контроллера и воркеров (при --profileStartup).
+    В воркере xdist профиль передаётся контроллеру через `workeroutput`.
+    """
+    profiler = session.config.stash.get(STARTUP_PROFILER_KEY, None)
+    if profiler is None:
+        return
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["startup_profile"] = profiler.to_dict()
+        return
+
+    budget_ms = session.config.getoption("--startupBudgetMs")
+    reports = [profiler.report, *sorted(session.config.stash.get(STARTUP_REPORTS_KEY, []), key=lambda r: r.worker)]
+    for report in reports:
+        for line in report.format(budget_ms):
+            print(line)
+
+
+def save_durations(session):
+    """
+    Сохраняет длительности тестов прогона в logs/durations.json (в контроллере или без xdist).
+    """
+    recorder = session.config.stash.get(DURATIONS_RECORDER_KEY, None)
+    if recorder is not None and recorder.measured:
+        recorder.save()
+
+
+def report_http_pool_stats(session):
+    """
+    Закрывает пул HTTP-сессий процесса и выводит счётчики открытых и переиспользованных соединений.
+    В воркере xdist счётчики передаются контроллеру через `workeroutput`.
+    """
+    from settings.api_client.session_pool import get_session_pool, merge_pool_stats
+
+    pool_stats = get_session_pool().close()
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["http_pool_stats"] = pool_stats
+        return
+
+    pool_stats = merge_pool_stats(pool_stats, *session.config.stash.get(HTTP_POOL_STATS_KEY, []))
+    for host, stats in pool_stats.items():
+        print(
+            f"HTTP pool {host}: запросов {stats['requests']}, "
+            f"открыто соединений {stats['connections_opened']}, "
+            f"переиспользовано {stats['connections_reused']}"
+        )
+
+
+def report_request_metrics(session):
+    """
+    Сохраняет сводку замеров HTTP-запросов по всем воркерам в logs/reports/request_metrics.json
+    и добавляет сводку производительности API в результаты Allure (html-отчёт pytest получает её
+    в `pytest_html_results_summary`). В воркере xdist агрегаты передаются контроллеру через `workeroutput`.
+    """
+    metrics = get_request_metrics()
+    if not metrics.enabled:
+        return
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["request_metrics"] = metrics.to_state()
+        return
+
+    summary = metrics.summary()
+    print(f"Сводка замеров HTTP-запросов: {metrics.save_summary(Paths.REQUEST_METRICS, summary)}")
+    if not summary["endpoints"]:
+        return
+    session.config.stash[REQUEST_METRICS_SUMMARY_KEY] = summary
+    if getattr(session.config.option, "allure_report_dir", None):
+        from settings.metrics.dashboard import report_dashboard_to_allure
+
+        report_dashboard_to_allure(summary)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """
+    Хук pytest-html: добавляет в отчёт сводку производительности API по эндпоинтам (при --requestMetrics).
+    """
+    metrics_summary = session.config.stash.get(REQUEST_METRICS_SUMMARY_KEY, None)
+    if metrics_summary is not None:
+        from settings.metrics.dashboard import render_dashboard
+
+        postfix.append(render_dashboard(metrics_summary))
+
+
+def cleanup_entities(session):
+    """
+    Удаляет сущности, зарегистрированные хелперами всех воркеров (только в контроллере или без xdist).
+    """
+    if hasattr(session.config, "workerinput") or EntitiesRegistry.storage_path is None:
+        return
+    if not EntitiesRegistry.read_entities():
+        EntitiesRegistry.clear()
+        return
+
+    from autotests.api.api_helpers.api_factory import ApiFactory
+    from settings.auth.token_provider import TokenProvider
+    from settings.configs.env_config_loader import EnvConfigLoader
+
+    config = EnvConfigLoader().load_values(read_env_values(session.config))
+    factory = ApiFactory(config)
+    token_provider = TokenProvider(
+        mint_token=factory.auth_api().post_auth_token,
+        cache_path=token_cache_path(session.config),
+        ttl_seconds=config.token_ttl_seconds,
+        refresh_margin_seconds=config.token_refresh_margin_seconds,
+    )
+    autotest.use_allure(False)  # Удаление выполняется после тестов: шаги методов API не попадают в отчёт
+    try:
+        report = EntitiesRegistry(config=config).cleanup(token_provider=token_provider)
+    finally:
+        token_provider.close()
+        factory.close()
+    print(report.format())
+
+
+def flush_allure_results(session):
+    """
+    Дописывает буферизованные результаты Allure до генерации отчёта.
+    """
+    allure_logger = session.config.stash.get(ALLURE_LOGGER_KEY, None)
+    if allure_logger is None:
+        return
+
+    allure_logger.close()
+
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["allure_writer_stats"] = allure_logger.stats
+        return
+
+    for worker_stats in session.config.stash.get(ALLURE_WRITER_STATS_KEY, []):
+        for key, value in worker_stats.items():
+            allure_logger.stats[key] += value
+    if allure_logger.steps_only_on_failure:
+        print(
+            f"Allure: записано файлов {allure_logger.stats['files']}, "
+            f"отброшено шагов успешных тестов {allure_logger.stats['discarded_steps']} "
+            f"и вложений {allure_logger.stats['discarded_attachments']}"
+        )
+
+
+def resolve_project_path(path: str) -> Path:
+    """
+    Приводит путь к абсолютному относительно корня проекта.
+    """
+    return Path(__file__).resolve().parent / path
+
+
+def cassette_part_path(path: Path, name: str) -> Path:
+    """
+    Путь к части кассеты, которую пишет один процесс (контроллер или воркер xdist).
+    """
+    return path.with_name(f"{path.name}.{name}.part")
+
+
+def open_cassette(config):
+    """
+    Включает запись (--recordCassette) или воспроизведение (--replayCassette) HTTP-обменов.
+    Каждый процесс пишет свою часть кассеты, контроллер объединяет их в конце прогона.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    replay_path = config.getoption("--replayCassette")
+    record_path = config.getoption("--recordCassette")
+    if not (replay_path or record_path):
+        return
+
+    from settings.api_client.cassette import CassettePlayer, CassetteRecorder, set_cassette
+
+    if replay_path:
+        cassette = CassettePlayer(resolve_project_path(replay_path))
+    else:
+        record_path = resolve_project_path(record_path)
+        if workerinput is None:
+            for stale_part in record_path.parent.glob(f"{record_path.name}.*.part"):
+                stale_part.unlink()
+        cassette = CassetteRecorder(cassette_part_path(record_path, workerinput["workerid"] if workerinput else "main"))
+
+    config.stash[CASSETTE_KEY] = cassette
+    set_cassette(cassette)
+
+
+def close_cassette(session):
+    """
+    Закрывает кассету процесса; после записи контроллер объединяет части всех процессов.
+    """
+    cassette = session.config.stash.get(CASSETTE_KEY, None)
+    if cassette is None:
+        return
+
+    from settings.api_client.cassette import merge_cassettes, set_cassette
+
+    set_cassette(None)
+    cassette.close()
+    if session.config.getoption("--replayCassette") or hasattr(session.config, "workerinput"):
+        return
+
+    record_path = resolve_project_path(session.config.getoption("--recordCassette"))
+    parts = sorted(record_path.parent.glob(f"{record_path.name}.*.part"))
+    meta = {
+        "random_seed": session.config.stash[RANDOM_SEED_KEY],
+        "base_url": read_env_values(session.config).get("BASE_URL"),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    records = merge_cassettes(parts, record_path, meta=meta)
+    for part in parts:
+        part.unlink()
+    print(f"Кассета записана: {record_path} (ответов: {records})")
+
+
+def structured_log_part_path(config, worker: str) -> Path:
+    """
+    Путь к журналу одного процесса прогона (контроллера или воркера xdist).
+    """
+    return Paths.CACHE / f"log_{config.stash[RUN_ID_KEY]}.{worker}.jsonl"
+
+
+def open_structured_log(config):
+    """
+    Включает журнал процесса: записи уровня `log_level` (по умолчанию INFO) пишутся
+    через очередь в JSON Lines-файл процесса.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    level_name = (config.getoption("log_level") or config.getini("log_level") or "INFO").upper()
+    level = logging.getLevelName(level_name)
+    worker = workerinput["workerid"] if workerinput else "main"
+    structured_log = StructuredLog(
+        structured_log_part_path(config, worker),
+        worker=worker,
+        level=level if isinstance(level, int) else logging.INFO,
+    )
+    structured_log.start()
+    config.stash[STRUCTURED_LOG_KEY] = structured_log
+    config.pluginmanager.register(structured_log, "structured_log")
+
+
+def close_structured_log(session):
+    """
+    Дописывает журнал процесса; контроллер объединяет журналы всех процессов
+    в logs/pytest.jsonl в порядке времени записей.
+    """
+    structured_log = session.config.stash.get(STRUCTURED_LOG_KEY, None)
+    if structured_log is None:
+        return
+
+    structured_log.stop()
+    if hasattr(session.config, "workerinput"):
+        return
+
+    parts = sorted(Paths.CACHE.glob(structured_log_part_path(session.config, "*").name))
+    records = merge_logs(parts, Paths.RUN_LOG)
+    for part in parts:
+        part.unlink()
+    print(f"Журнал прогона: {Paths.RUN_LOG} (записей: {records})")
+
+
+def rate_limiter_path(config) -> Path:
+    """
+    Путь к файлу состояния ограничителя запросов, общему для контроллера и воркеров xdist.
+    """
+    return Paths.CACHE / f"rate_limits_{config.stash[RUN_ID_KEY]}.bin"
+
+
+def report_rate_limits(session):
+    """
+    Закрывает ограничитель запросов процесса; контроллер выводит время ожидания разрешений
+    по корзинам (по всем воркерам) и удаляет файл состояния.
+    """
+    configure_rate_limiter(None)
+    if hasattr(session.config, "workerinput"):
+        return
+
+    state_path = rate_limiter_path(session.config)
+    if not state_path.exists():
+        return
+    rate_limiter = SharedRateLimiter(state_path)
+    stats = rate_limiter.stats()
+    rate_limiter.close()
+    state_path.unlink()
+    state_path.with_name(f"{state_path.name}.lock").unlink(missing_ok=True)
+
+    for name, bucket in stats.items():
+        print(
+            f"Ограничение запросов {name}: ожидали разрешения {bucket['waits']} запросов, "
+            f"всего {bucket['wait_ms'] / 1000:.2f} с, максимум {bucket['max_wait_ms']:.1f} мс"
+        )
+
+
+def pytest_sessionstart(session):
+    """
+    При --allureBuffered/--allureStepsOnFailure заменяет синхронную запись результатов Allure на фоновую.
+    """
+    config = session.config
+    steps_only_on_failure = config.getoption("--allureStepsOnFailure")
+    if config.getoption("--allureBuffered") or steps_only_on_failure:
+        from settings.report.allure_buffered_logger import install_buffered_logger
+
+        allure_logger = install_buffered_logger(config, steps_only_on_failure=steps_only_on_failure)
+        if allure_logger is not None:
+            config.stash[ALLURE_LOGGER_KEY] = allure_logger
 
 
 @pytest.hookimpl()
 def pytest_sessionfinish(session, exitstatus):
+    cleanup_entities(session)
+    close_cassette(session)
+    save_durations(session)
+    report_startup_profile(session)
+    report_covering_arrays(session)
+    report_rate_limits(session)
+    close_structured_log(session)
+    report_http_pool_stats(session)
+    report_request_metrics(session)
+    flush_allure_results(session)
+
+    if not hasattr(session.config, "workerinput"):
+        token_cache = token_cache_path(session.config)
+        token_cache.unlink(missing_ok=True)
+        token_cache.with_name(f"{token_cache.name}.lock").unlink(missing_ok=True)
+
     if session.config.getoption("--allureReport"):
         results_dir = Paths.ALLURE_RESULTS
         report_dir = Paths.ALLURE_REPORT
@@ -116,7 +798,61 @@ def pytest_configure(config):
     Хук инициализации Pytest.
     - при --htmlReport настраивает pytest-html
     - при ALLURE_UI_REPORT_ENABLED=true гарантирует папку для allure-results
+    - при --requestMetrics включает сбор замеров HTTP-запросов
+    - задаёт идентификатор прогона, общий для контроллера и воркеров xdist
+    - включает журнал прогона в JSON Lines (отдельный файл на процесс, объединяется в конце прогона)
+    - задаёт общий для воркеров xdist файл состояния ограничителя запросов (RATE_LIMIT_*)
+    - при --recordCassette/--replayCassette включает запись или воспроизведение HTTP-обменов
+    - загружает длительности тестов прошлых прогонов (распределение по воркерам и --shard)
+    - при --stubServer запускает заглушку сервиса (в контроллере xdist или без xdist)
+    - при --profileStartup замеряет запуск процесса и сборку тестовых модулей
+    - включает запись шагов и вложений `autotest` в Allure, только если задана директория результатов Allure
     """
+    workerinput = getattr(config, "workerinput", None)
+    if config.getoption("--profileStartup"):
+        profiler = StartupProfiler(workerinput["workerid"] if workerinput else "main")
+        config.stash[STARTUP_PROFILER_KEY] = profiler
+        config.pluginmanager.register(profiler, "startup_profiler")
+    config.stash[RUN_ID_KEY] = workerinput["run_id"] if workerinput else uuid.uuid4().hex
+
+    open_structured_log(config)
+    configure_rate_limiter(rate_limiter_path(config))
+    open_cassette(config)
+
+    random_seed = config.getoption("--randomSeed")
+    cassette = config.stash.get(CASSETTE_KEY, None)
+    if random_seed is None and config.getoption("--replayCassette"):
+        # Те же тестовые данные, что и при записи кассеты
+        random_seed = cassette.meta.get("random_seed")
+    if random_seed is None:
+        random_seed = workerinput["random_seed"] if workerinput else random.SystemRandom().randrange(2 ** 32)
+    config.stash[RANDOM_SEED_KEY] = random_seed
+
+    config.stash[DURATIONS_KEY] = DurationsStore(Paths.DURATIONS)
+    if workerinput is None:
+        # В xdist отчёты воркеров приходят контроллеру, поэтому длительности собираются только в нём
+        recorder = DurationsRecorder(config.stash[DURATIONS_KEY])
+        config.stash[DURATIONS_RECORDER_KEY] = recorder
+        config.pluginmanager.register(recorder, "durations_recorder")
+
+    if not config.getoption("--keepEntities"):
+        EntitiesRegistry.configure(Paths.CACHE / f"entities_{config.stash[RUN_ID_KEY]}.jsonl")
+
+    try:
+        from pytest_metadata.plugin import metadata_key
+        config.stash[metadata_key]["Random seed"] = str(random_seed)
+    except (ImportError, KeyError):
+        pass
+
+    get_request_metrics().enabled = config.getoption("--requestMetrics")
+
+    if config.getoption("--stubServer") and workerinput is None:
+        from settings.stub_server.stub_server import StubProfile, StubServer
+
+        profile_path = config.getoption("--stubProfile")
+        profile = StubProfile.load(profile_path) if profile_path else None
+        config.stash[STUB_SERVER_KEY] = StubServer(profile=profile).start()
+
     if config.getoption("--htmlReport"):
         os.makedirs("logs/reports/html", exist_ok=True)
         mark_expr = config.option.markexpr or "all"
@@ -126,4 +862,39 @@ def pytest_configure(config):
 
     if config.getoption("--allureReport"):
         os.makedirs(Paths.ALLURE_RESULTS, exist_ok=True)
-        config.option.allure_report_dir = str(Paths.ALLURE_RESULTS)
\ No newline at end of file
+        config.option.allure_report_dir = str(Paths.ALLURE_RESULTS)
+
+    # Без Allure методы `autotest` ничего не делают и не импортируют allure
+    autotest.use_allure(bool(getattr(config.option, "allure_report_dir", None)))
+
+
+def pytest_unconfigure(config):
+    """
+    Останавливает заглушку сервиса, запущенную по --stubServer.
+    """
+    stub_server = config.stash.get(STUB_SERVER_KEY, None)
+    if stub_server is not None:
+        stub_server.stop()
+
+
+def pytest_report_header(config):
+    """
+    Выводит зерно генерации тестовых данных (и адрес заглушки, если она запущена) в заголовке прогона.
+    """
+    seed = config.stash[RANDOM_SEED_KEY]
+    lines = [f"random seed: {seed} (повтор прогона: --randomSeed={seed})"]
+    stub_server = config.stash.get(STUB_SERVER_KEY, None)
+    if stub_server is not None:
+        lines.append(f"stub server: {stub_server.base_url}")
+    if config.getoption("--replayCassette"):
+        lines.append(f"replay cassette: {config.getoption('--replayCassette')}")
+    return lines
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """
+    Напоминает зерно генерации тестовых данных, если есть упавшие тесты.
+    """
+    if terminalreporter.stats.get("failed") or terminalreporter.stats.get("error"):
+        seed = config.stash[RANDOM_SEED_KEY]
+        terminalreporter.write_line(f"Для воспроизведения тестовых данных: --randomSeed={seed}")
@@ -1,9 +1,21 @@
 import json
+import logging
+import time
+from concurrent.futures import as_completed, wait
 
 import requests
 
+from settings.api_client.cassette import get_cassette
+from settings.api_client.rate_limiter import RateLimits, get_rate_limiter
+from settings.api_client.resilience import RetryPolicy, get_hedge_delays, get_hedge_executor, get_retry_budget
+from settings.api_client.session_pool import get_session_pool, pop_connect_time, reset_connect_time
+from settings.api_client.streaming import StreamingResponse
 from settings.configs.config_model import ConfigModel
-from settings.utils import get_controller_url
+from settings.metrics.request_metrics import RequestTiming, endpoint_key, get_request_metrics
+from settings.report import autotest
+from settings.utils import get_controller_url, get_current_test_id, get_current_test_name
+
+logger = logging.getLogger(__name__)
 
 
 class ApiClient:
@@ -11,6 +23,15 @@ class ApiClient:
     Универсальный REST API клиент.
 
     Предназначен для отправки HTTP-запросов к целевому сервису.
+    Запросы отправляются через общий пул keep-alive сессий процесса (`SessionPool`).
+    К каждому ответу добавляется атрибут `timing` (`RequestTiming`) с замерами запроса.
+    Неудачные попытки повторяются по `RetryPolicy` в пределах бюджета повторов процесса,
+    GET-запросы могут хеджироваться (`HEDGE_GET_REQUESTS`); сведения об этом - в `timing.extra`.
+    Каждая попытка ждёт разрешения ограничителя частоты и конкурентности (`RATE_LIMIT_*`),
+    общего для всех воркеров прогона; время ожидания - в `timing.extra["rate_limit_wait_ms"]`.
+    Если включена кассета (`set_cassette`), ответы записываются в неё или воспроизводятся из неё без сети.
+    В потоковом режиме (`stream=True`) возвращается `StreamingResponse`, тело которого не буферизуется
+    (кроме записи кассеты: записываемый ответ читается целиком).
     """
 
     def __init__(self, config: ConfigModel, controller_path: str):
@@ -24,6 +45,8 @@ class ApiClient:
 
         self.controller_path = controller_path
         self.base_url = get_controller_url(name=controller_path, config=config)
+        self._retry_policy: RetryPolicy | None = None  # Создаётся при первом запросе
+        self._rate_limits: RateLimits | None = None  # Создаются при первом запросе
 
     def _send_request(
         self,
@@ -34,8 +57,10 @@ class ApiClient:
         json_data: json = None,
         data: dict = None,
         cookies: dict = None,
-        files: dict = None
-    ) -> requests.Response:
+        files: dict = None,
+        stream: bool = False,
+        timeout: float = None
+    ) -> requests.Response | StreamingResponse:
         """
         Внутренний метод отправки HTTP-запроса и записи покрытия, если включено.
 
@@ -47,7 +72,10 @@ class ApiClient:
         :param data: Form-данные в теле запроса.
         :param cookies: Cookie-параметры запроса.
         :param files: Файлы, передаваемые в запросе (multipart/form-data).
-        :return: Ответ от сервера в виде `requests.Response`.
+        :param stream: Не читать тело ответа сразу, а вернуть `StreamingResponse`.
+        :param timeout: Таймаут чтения ответа, с (по умолчанию - `REQUEST_TIMEOUT_SECONDS`); таймаут соединения -
+            `CONNECT_TIMEOUT_SECONDS`.
+        :return: Ответ от сервера в виде `requests.Response` (или `StreamingResponse`).
         """
 
         if headers is None:
@@ -55,38 +83,300 @@ class ApiClient:
                 'Accept': 'application/json'
             }
 
-        with requests.sessions.Session() as session:
-            response = session.request(
-                method=method,
-                url=f"{self.base_url}{endpoint_path}",
-                headers=headers,
-                params=params,
-                json=json_data,
-                data=data,
-                files=files,
-                cookies=cookies,
-                timeout=20
+        session = get_session_pool().session_for(
+            self.base_url,
+            pool_maxsize=self.__config.http_pool_maxsize
+        )
+        request_kwargs = dict(
+            method=method,
+            url=f"{self.base_url}{endpoint_path}",
+            headers=headers,
+            params=params,
+            json=json_data,
+            data=data,
+            files=files,
+            cookies=cookies,
+            timeout=self._timeout(timeout),
+            stream=stream
+        )
+        started_at = time.time()
+        started = time.perf_counter()
+        cassette = get_cassette()
+        if cassette is None:
+            response, connect_ms, resilience = self._execute(session, request_kwargs, endpoint_path)
+        else:
+            response, connect_ms, resilience = cassette.handle(
+                request_kwargs, lambda: self._execute(session, request_kwargs, endpoint_path)
             )
 
+        if stream:
+            # Замеры фиксируются после чтения тела, время запроса включает чтение
+            def record(streaming: StreamingResponse):
+                total_ms = (streaming.started - started) * 1000 + streaming.read_ms
+                streaming.timing = self._build_timing(
+                    method, endpoint_path, response, total_ms, started_at, connect_ms,
+                    response_bytes=streaming.bytes_read, extra=resilience
+                )
+                self._record_timing(streaming.timing)
+
+            return StreamingResponse(response, on_close=record)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        response.timing = self._build_timing(
+            method, endpoint_path, response, total_ms, started_at, connect_ms, extra=resilience
+        )
+        self._record_timing(response.timing)
         return response
 
-    def get(self, path: str, **kwargs) -> requests.Response:
+    def _timeout(self, read_timeout: float = None) -> tuple[float, float]:
+        """
+        :param read_timeout: Таймаут чтения ответа, с (None - `REQUEST_TIMEOUT_SECONDS`).
+        :return: Таймауты `(соединение, чтение)` для `requests`.
+        """
+        if read_timeout is None:
+            read_timeout = self.__config.request_timeout_seconds
+        return min(self.__config.connect_timeout_seconds, read_timeout), read_timeout
+
+    @staticmethod
+    def _attempt(
+        session: requests.Session,
+        request_kwargs: dict,
+        rate_buckets: list = None
+    ) -> tuple[requests.Response, float | None, float]:
+        """
+        Одна попытка запроса. Время установки соединения забирается в том же потоке.
+
+        :param rate_buckets: Корзины ограничителя запросов (`RateLimits.buckets`), None - без ограничения.
+        :return: Ответ, время установки нового соединения (None - соединение из пула)
+            и время ожидания разрешения ограничителя, мс.
+        """
+        if rate_buckets:
+            with get_rate_limiter().permit(rate_buckets) as waited_ms:
+                reset_connect_time()
+                response = session.request(**request_kwargs)
+                return response, pop_connect_time(), waited_ms
+        reset_connect_time()
+        response = session.request(**request_kwargs)
+        return response, pop_connect_time(), 0.0
+
+    def _execute(
+        self,
+        session: requests.Session,
+        request_kwargs: dict,
+        endpoint_path: str
+    ) -> tuple[requests.Response, float | None, dict]:
+        """
+        Выполняет запрос с повторами (`RetryPolicy`) в пределах бюджета повторов процесса
+        и, для GET-запросов при `HEDGE_GET_REQUESTS`, с хеджирующим запросом.
+
+        Все попытки укладываются в общий срок `REQUEST_DEADLINE_SECONDS`: таймаут чтения
+        повтора ограничивается оставшимся временем, а повтор, на который времени не осталось,
+        не выполняется.
+
+        :param session: Сессия пула.
+        :param request_kwargs: Параметры `Session.request`.
+        :param endpoint_path: Относительный путь эндпоинта.
+        :return: Ответ, время установки соединения и сведения о повторах, хеджировании и ожидании
+            ограничителя запросов (пустой словарь, если запрос выполнен с первой попытки без ожидания).
+        :raises requests.RequestException: Если попытки или бюджет повторов исчерпаны.
+        """
+        method = request_kwargs["method"]
+        if self._retry_policy is None:
+            self._retry_policy = RetryPolicy.from_config(self.__config)
+        budget = get_retry_budget()
+        budget.deposit(self.__config.retry_budget_ratio)
+
+        if self._rate_limits is None:
+            self._rate_limits = RateLimits.from_config(self.__config)
+
+        hedge = self.__config.hedge_get_requests and method == "GET" and not request_kwargs["stream"]
+        key = endpoint_key(method, endpoint_path) if hedge or self._rate_limits.enabled else None
+        rate_buckets = None
+        if self._rate_limits.enabled:
+            rate_buckets = self._rate_limits.buckets(request_kwargs["url"], method, key)
+
+        resilience = {}
+        retries = []
+        rate_limit_wait_ms = 0.0
+        attempt = 1
+        attempt_kwargs = request_kwargs
+        deadline = time.perf_counter() + self.__config.request_deadline_seconds
+        while True:
+            attempt_started = time.perf_counter()
+            try:
+                if hedge:
+                    response, connect_ms, waited_ms = self._hedged_attempt(
+                        session, attempt_kwargs, key, resilience, rate_buckets
+                    )
+                else:
+                    response, connect_ms, waited_ms = self._attempt(session, attempt_kwargs, rate_buckets)
+                rate_limit_wait_ms += waited_ms
+            except requests.RequestException as e:
+                backoff = self._retry_policy.backoff_seconds(attempt)
+                if (
+                    attempt >= self._retry_policy.max_attempts
+                    or not self._retry_policy.retryable_error(method, e)
+                    or time.perf_counter() + backoff >= deadline
+                    or not budget.withdraw()
+                ):
+                    raise
+                reason = type(e).__name__
+            else:
+                if hedge and response.status_code < 500:
+                    get_hedge_delays().record(key, (time.perf_counter() - attempt_started) * 1000)
+                backoff = self._retry_policy.backoff_seconds(attempt)
+                if (
+                    attempt >= self._retry_policy.max_attempts
+                    or not self._retry_policy.retryable_status(method, response.status_code)
+                    or time.perf_counter() + backoff >= deadline
+                    or not budget.withdraw()
+                ):
+                    if retries:
+                        resilience.update(attempts=attempt, retries=retries)
+                    if rate_limit_wait_ms:
+                        resilience["rate_limit_wait_ms"] = round(rate_limit_wait_ms, 3)
+                    return response, connect_ms, resilience
+                reason = f"status {response.status_code}"
+                response.close()
+
+            retries.append({"attempt": attempt, "reason": reason, "backoff_ms": round(backoff * 1000, 1)})
+            time.sleep(backoff)
+            attempt += 1
+            connect_timeout, read_timeout = request_kwargs["timeout"]
+            read_timeout = max(min(read_timeout, deadline - time.perf_counter()), 0.001)
+            attempt_kwargs = {**request_kwargs, "timeout": (min(connect_timeout, read_timeout), read_timeout)}
+
+    def _hedged_attempt(
+        self,
+        session: requests.Session,
+        request_kwargs: dict,
+        key: str,
+        resilience: dict,
+        rate_buckets: list = None
+    ) -> tuple[requests.Response, float | None, float]:
+        """
+        Отправляет запрос и, если ответ не получен за задержку хеджирования (`HEDGE_DELAY_MS`
+        или p95 эндпоинта), - второй такой же запрос. Возвращается первый успешный ответ,
+        второй закрывается после получения.
+
+        :param key: Ключ эндпоинта (`endpoint_key`) для задержки по p95.
+        :param resilience: Сведения о хеджировании (`hedged`, `hedge_won`) дополняются на месте.
+        :param rate_buckets: Корзины ограничителя запросов; хеджирующий запрос тоже ждёт разрешения.
+        """
+        delay_ms = self.__config.hedge_delay_ms
+        if delay_ms is None:
+            delay_ms = get_hedge_delays().delay_ms(key)
+        if delay_ms is None:
+            return self._attempt(session, request_kwargs, rate_buckets)
+
+        executor = get_hedge_executor()
+        primary = executor.submit(self._attempt, session, request_kwargs, rate_buckets)
+        done, _ = wait([primary], timeout=delay_ms / 1000)
+        if done or not get_retry_budget().withdraw():
+            return primary.result()
+
+        secondary = executor.submit(self._attempt, session, request_kwargs, rate_buckets)
+        futures = [primary, secondary]
+        winner = None
+        for future in as_completed(futures):
+            if future.exception() is None:
+                winner = future
+                break
+        if winner is None:
+            return primary.result()
+
+        loser = secondary if winner is primary else primary
+        loser.add_done_callback(lambda future: future.exception() is None and future.result()[0].close())
+        resilience.update(hedged=True, hedge_won=winner is secondary, hedge_delay_ms=round(delay_ms, 1))
+        return winner.result()
+
+    @staticmethod
+    def _build_timing(
+        method: str,
+        endpoint_path: str,
+        response: requests.Response,
+        total_ms: float,
+        started_at: float,
+        connect_ms: float | None = None,
+        response_bytes: int = None,
+        extra: dict = None
+    ) -> RequestTiming:
+        """
+        Формирует замеры запроса.
+
+        :param method: HTTP-метод.
+        :param endpoint_path: Относительный путь эндпоинта.
+        :param response: Ответ сервера.
+        :param total_ms: Полное время запроса, включая чтение тела ответа.
+        :param started_at: Время начала запроса (unix time).
+        :param connect_ms: Время установки нового соединения (None - соединение из пула).
+        :param response_bytes: Размер прочитанного тела (для потокового ответа). По умолчанию - размер `content`.
+        :param extra: Сведения о повторах и хеджировании запроса.
+        :return: Замеры запроса.
+        """
+        body = response.request.body if response.request is not None else None
+        if isinstance(body, str):
+            body = body.encode()
+        return RequestTiming(
+            method=method,
+            endpoint=endpoint_path,
+            url=response.url,
+            status=response.status_code,
+            total_ms=total_ms,
+            ttfb_ms=response.elapsed.total_seconds() * 1000,
+            connect_ms=connect_ms,
+            request_bytes=len(body) if isinstance(body, bytes) else 0,
+            response_bytes=len(response.content) if response_bytes is None else response_bytes,
+            test_name=get_current_test_name(),
+            test_id=get_current_test_id(),
+            started_at=started_at,
+            extra=extra or {},
+        )
+
+    @staticmethod
+    def _record_timing(timing: RequestTiming):
+        """
+        Пишет замеры в журнал прогона, передаёт их в сборщик процесса и прикрепляет к текущему
+        шагу Allure, если сбор метрик включён (`--requestMetrics`). Повторы, хеджирование и ожидание
+        ограничителя запросов прикрепляются к шагу и без сбора метрик. Вне теста (например, при удалении
+        сущностей после прогона) вложение не создаётся.
+
+        :param timing: Замеры запроса.
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s %s -> %s за %.1f мс", timing.method, timing.endpoint, timing.status, timing.total_ms,
+                extra={"timing": timing},
+            )
+
+        metrics = get_request_metrics()
+        if not metrics.enabled:
+            if timing.extra and timing.test_name is not None:
+                autotest.attach_json(name=f"resilience {timing.method} {timing.endpoint}", data=timing.extra)
+            return
+
+        metrics.record(timing)
+        if timing.test_name is None:
+            return
+        autotest.attach_json(name=f"timing {timing.method} {timing.endpoint}", data=timing.to_dict())
+
+    def get(self, path: str, **kwargs) -> requests.Response | StreamingResponse:
         """
         Выполняет GET-запрос к указанному пути.
 
         :param path: Относительный путь до эндпоинта.
-        :param kwargs: Дополнительные параметры запроса (params, headers и т.д.).
-        :return: Ответ от сервера.
+        :param kwargs: Дополнительные параметры запроса (params, headers, stream и т.д.).
+        :return: Ответ от сервера (`StreamingResponse` при `stream=True`).
         """
         return self._send_request(method="GET", endpoint_path=path, **kwargs)
 
-    def post(self, path: str, **kwargs) -> requests.Response:
+    def post(self, path: str, **kwargs) -> requests.Response | StreamingResponse:
         """
         Выполняет POST-запрос к указанному пути.
 
         :param path: Относительный путь до эндпоинта.
-        :param kwargs: Дополнительные параметры запроса (headers, json_data и т.д.).
-        :return: Ответ от сервера.
+        :param kwargs: Дополнительные параметры запроса (headers, json_data, stream и т.д.).
+        :return: Ответ от сервера (`StreamingResponse` при `stream=True`).
         """
         return self._send_request(method="POST", endpoint_path=path, **kwargs)
 
@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import json
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from settings.api_client.api_client import ApiClient
+from settings.api_client.session_pool import get_session_pool
+from settings.configs.config_model import ConfigModel
+
+
+class AsyncApiClient:
+    """
+    Асинхронный REST API клиент с тем же набором методов, что и `ApiClient`.
+
+    Запросы выполняются через `ApiClient._send_request` (та же семантика заголовков,
+    cookies, тела запроса и таймаута) в пуле потоков, а количество одновременно
+    выполняемых запросов ограничивается семафором. Это позволяет запускать сотни
+    корутин на одном event loop, не превышая размер пула соединений хоста.
+    Клиент можно использовать из нескольких потоков и event loop одновременно: у каждого
+    event loop свой семафор, пул потоков создаётся один раз.
+    """
+
+    def __init__(self, config: ConfigModel, controller_path: str, max_concurrency: int | None = None):
+        """
+        Инициализация клиента для заданного сервиса.
+
+        :param config: Конфигурационная модель, содержащая параметры окружения.
+        :param controller_path: Название контроллера (часть пути до сервиса).
+        :param max_concurrency: Максимум одновременных запросов (по умолчанию - размер пула соединений хоста).
+        """
+        self._client = ApiClient(config=config, controller_path=controller_path)
+
+        self.controller_path = controller_path
+        self.base_url = self._client.base_url
+        self.max_concurrency = max_concurrency or config.http_pool_maxsize
+
+        self._executor: ThreadPoolExecutor | None = None
+        # Семафоры по event loop (создаются при первом запросе): закрытые event loop удаляются из словаря
+        self._semaphores: weakref.WeakKeyDictionary | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Возвращает пул потоков клиента, создавая его при первом запросе.
+        """
+        with self._lock:
+            if self._executor is None:
+                get_session_pool().ensure_pool_size(self.base_url, self.max_concurrency)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="async-api-client"
+                )
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Возвращает семафор, ограничивающий конкурентность в текущем event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._semaphores is None:
+                self._semaphores = weakref.WeakKeyDictionary()
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint_path: str,
+        params: dict = None,
+        headers: dict = None,
+        json_data: json = None,
+        data: dict = None,
+        cookies: dict = None,
+        files: dict = None
+    ) -> requests.Response:
+        """
+        Асинхронно отправляет HTTP-запрос с учётом ограничения конкурентности.
+
+        :param method: HTTP-метод (GET, POST, PUT, DELETE, PATCH).
+        :param endpoint_path: Относительный путь эндпоинта (добавляется к base_url).
+        :param params: Query-параметры запроса.
+        :param headers: Заголовки запроса.
+        :param json_data: JSON-данные в теле запроса.
+        :param data: Form-данные в теле запроса.
+        :param cookies: Cookie-параметры запроса.
+        :param files: Файлы, передаваемые в запросе (multipart/form-data).
+        :return: Ответ от сервера в виде `requests.Response`.
+        """
+        request = functools.partial(
+            self._client._send_request,
+            method=method,
+            endpoint_path=endpoint_path,
+            params=params,
+            headers=headers,
+            json_data=json_data,
+            data=data,
+            cookies=cookies,
+            files=files
+        )
+
+        async with self._get_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), request)
+
+    async def get(self, path: str, **kwargs) -> requests.Response:
+        """
+        Выполняет GET-запрос к указанному пути.
+
+        :param path: Относительный путь до эндпоинта.
+        :param kwargs: Дополнительные параметры запроса (params, headers и т.д.).
+        :return: Ответ от сервера.
+        """
+        return await self._send_request(method="GET", endpoint_path=path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> requests.Response:
+        """
+        Выполняет POST-запрос к указанному пути.
+
+        :param path: Относительный путь до эндпоинта.
+        :param kwargs: Дополнительные параметры запроса (headers, json_data и т.д.).
+        :return: Ответ от сервера.
+        """
+        return await self._send_request(method="POST", endpoint_path=path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> requests.Response:
+        """
+        Выполняет PUT-запрос к указанному пути.
+
+        :param path: Относительный путь до эндпоинта.
+        :param kwargs: Дополнительные параметры запроса.
+        :return: Ответ от сервера.
+        """
+        return await self._send_request(method="PUT", endpoint_path=path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> requests.Response:
+        """
+        Выполняет DELETE-запрос к указанному пути.
+
+        :param path: Относительный путь до эндпоинта.
+        :param kwargs: Дополнительные параметры запроса.
+        :return: Ответ от сервера.
+        """
+        return await self._send_request(method="DELETE", endpoint_path=path, **kwargs)
+
+    async def patch(self, path: str, **kwargs) -> requests.Response:
+        """
+        Выполняет PATCH-запрос к указанному пути.
+
+        :param path: Относительный путь до эндпоинта.
+        :param kwargs: Дополнительные параметры запроса.
+        :return: Ответ от сервера.
+        """
+        return await self._send_request(method="PATCH", endpoint_path=path, **kwargs)
+
+    def close(self):
+        """
+        Останавливает пул потоков клиента. Соединения остаются в общем пуле процесса.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,327 @@
+"""
+Запись и воспроизведение HTTP-обменов `ApiClient` (кассеты).
+
+Формат файла кассеты:
+    MAGIC
+    записи: [длина meta (4 байта)][длина тела (4 байта)][meta JSON][тело ответа]
+    индекс JSON: {"meta": {...}, "entries": {хэш ключа: [[смещение, длина meta, длина тела], ...]}, "keys": {...}}
+    [смещение индекса (8 байт)] MAGIC
+
+При воспроизведении файл отображается в память (mmap), ответ находится по индексу
+за O(1) без разбора остальных записей.
+"""
+import hashlib
+import json
+import mmap
+import struct
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qsl, urlsplit, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+MAGIC = b"APICAS1\n"
+_RECORD_HEADER = struct.Struct(">II")
+_TRAILER = struct.Struct(">Q")
+
+# Поля тела запроса, значения которых генерируются случайно: в ключе учитывается только их "форма"
+DEFAULT_IGNORED_FIELDS = ("title",)
+
+
+class CassetteMissError(LookupError):
+    """
+    В кассете нет ответа на запрос.
+    """
+
+
+def _field_shape(value) -> str:
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def request_key(prepared: requests.PreparedRequest, ignored_fields=DEFAULT_IGNORED_FIELDS) -> str:
+    """
+    Нормализованный ключ запроса: метод, путь, отсортированные query-параметры и поля тела.
+
+    Заголовки и cookie (в том числе сессионный токен) в ключ не входят, значения
+    `ignored_fields` заменяются на тип и длину (пустой и слишком длинный `title` различаются).
+
+    :param prepared: Подготовленный запрос.
+    :param ignored_fields: Поля тела, значения которых не учитываются.
+    :return: Ключ запроса.
+    """
+    url = urlsplit(prepared.url)
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+
+    body = prepared.body
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    fields = None
+    if body:
+        content_type = prepared.headers.get("Content-Type", "")
+        if "json" in content_type:
+            try:
+                fields = json.loads(body)
+            except ValueError:
+                pass
+        elif "x-www-form-urlencoded" in content_type:
+            fields = dict(parse_qsl(body, keep_blank_values=True))
+    if isinstance(fields, dict):
+        body = json.dumps(
+            {key: _field_shape(value) if key in ignored_fields else value for key, value in fields.items()},
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+    elif fields is not None:
+        body = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+
+    return f"{prepared.method} {url.path}?{query} {body or ''}"
+
+
+def _key_hash(key: str) -> str:
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def _prepare(request_kwargs: dict) -> requests.PreparedRequest:
+    return requests.Request(
+        method=request_kwargs["method"],
+        url=request_kwargs["url"],
+        headers=request_kwargs.get("headers"),
+        files=request_kwargs.get("files"),
+        data=request_kwargs.get("data"),
+        json=request_kwargs.get("json"),
+        params=request_kwargs.get("params"),
+    ).prepare()
+
+
+class CassetteRecorder:
+    """
+    Записывает пары запрос/ответ в файл кассеты. Потокобезопасен.
+    """
+
+    def __init__(self, path: Path | str, meta: dict = None, ignored_fields=DEFAULT_IGNORED_FIELDS):
+        """
+        :param path: Путь к файлу кассеты.
+        :param meta: Метаданные кассеты (например, зерно прогона и BASE_URL).
+        :param ignored_fields: Поля тела запроса, значения которых не входят в ключ.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.meta = dict(meta or {})
+        self.ignored_fields = tuple(ignored_fields)
+        self.entries: dict[str, list] = {}
+        self.keys: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+
+    def handle(self, request_kwargs: dict, send: Callable) -> tuple:
+        """
+        Отправляет запрос через `send` и записывает ответ.
+
+        :param request_kwargs: Параметры `Session.request`.
+        :param send: Функция отправки запроса, возвращает (ответ, время соединения, сведения о повторах).
+        :return: Результат `send`.
+        """
+        result = send()
+        self.record(result[0])
+        return result
+
+    def record(self, response: requests.Response):
+        """
+        Записывает ответ (тело читается целиком).
+
+        Ответ, полученный с `stream=True`, тоже читается целиком: длина тела пишется в заголовок
+        записи до самого тела. Поэтому при записи кассеты потоковые ответы буферизуются в памяти,
+        а `StreamingResponse` читает тело уже из памяти (время чтения тела в замерах близко к нулю).
+
+        :param response: Ответ сервера с исходным запросом (`response.request`).
+        """
+        now = time.time()
+        meta = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "elapsed_ms": response.elapsed.total_seconds() * 1000,
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "path": cookie.path,
+                    "ttl": cookie.expires - now if cookie.expires else None,
+                }
+                for cookie in response.cookies
+            ],
+        }
+        key = request_key(response.request, self.ignored_fields)
+        self.add(key, json.dumps(meta, ensure_ascii=False).encode(), response.content)
+
+    def add(self, key: str, meta: bytes, body: bytes):
+        """
+        Добавляет запись (в том числе перенесённую из другой кассеты).
+        """
+        key_hash = _key_hash(key)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(_RECORD_HEADER.pack(len(meta), len(body)))
+            self._file.write(meta)
+            self._file.write(body)
+            self.entries.setdefault(key_hash, []).append([offset, len(meta), len(body)])
+            self.keys[key_hash] = key
+
+    def close(self):
+        """
+        Дописывает индекс и закрывает файл.
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            meta = {**self.meta, "ignored_fields": list(self.ignored_fields), "records": self.records}
+            self._file.write(json.dumps(
+                {"meta": meta, "entries": self.entries, "keys": self.keys}, ensure_ascii=False
+            ).encode())
+            self._file.write(_TRAILER.pack(index_offset) + MAGIC)
+            self._file.close()
+
+    @property
+    def records(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+
+class CassettePlayer:
+    """
+    Воспроизводит ответы из кассеты без обращения к сети.
+
+    Если на один ключ записано несколько ответов (например, несколько токенов),
+    они выдаются по очереди, по кругу.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        :param path: Путь к файлу кассеты.
+        :raises ValueError: Если файл не является кассетой или не был закрыт после записи.
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        trailer_size = _TRAILER.size + len(MAGIC)
+        if self._map[:len(MAGIC)] != MAGIC or self._map[-len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"Файл {self.path} не является кассетой или запись не была завершена.")
+        (index_offset,) = _TRAILER.unpack_from(self._map, len(self._map) - trailer_size)
+        index = json.loads(self._map[index_offset:len(self._map) - trailer_size])
+
+        self.meta: dict = index["meta"]
+        self.entries: dict[str, list] = index["entries"]
+        self.keys: dict[str, str] = index["keys"]
+        self.ignored_fields = tuple(self.meta.get("ignored_fields", DEFAULT_IGNORED_FIELDS))
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, request_kwargs: dict, send: Callable) -> tuple:
+        """
+        Возвращает записанный ответ на запрос; `send` не вызывается.
+
+        :return: (ответ, None, {}) - в формате результата отправки запроса.
+        :raises CassetteMissError: Если ответа на запрос нет в кассете.
+        """
+        return self.replay(_prepare(request_kwargs)), None, {}
+
+    def read(self, key_hash: str, position: int) -> tuple[bytes, bytes]:
+        """
+        Читает запись: meta JSON и тело ответа.
+        """
+        offset, meta_length, body_length = self.entries[key_hash][position]
+        start = offset + _RECORD_HEADER.size
+        return self._map[start:start + meta_length], self._map[start + meta_length:start + meta_length + body_length]
+
+    def replay(self, prepared: requests.PreparedRequest) -> requests.Response:
+        """
+        :param prepared: Подготовленный запрос.
+        :return: Записанный ответ.
+        :raises CassetteMissError: Если ответа на запрос нет в кассете.
+        """
+        key = request_key(prepared, self.ignored_fields)
+        key_hash = _key_hash(key)
+        entries = self.entries.get(key_hash)
+        if not entries:
+            raise CassetteMissError(f"В кассете {self.path} нет ответа на запрос: {key}")
+        with self._lock:
+            position = self._positions.get(key_hash, 0)
+            self._positions[key_hash] = position + 1
+        meta, body = self.read(key_hash, position % len(entries))
+        meta = json.loads(meta)
+
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.reason = meta["reason"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(milliseconds=meta["elapsed_ms"])
+        response.url = prepared.url
+        response.request = prepared
+        response._content = body
+        response._content_consumed = True
+
+        now = time.time()
+        for cookie in meta["cookies"]:
+            response.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                path=cookie["path"],
+                expires=now + cookie["ttl"] if cookie["ttl"] is not None else None,
+            )
+        return response
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def merge_cassettes(parts: list[Path], path: Path | str, meta: dict = None) -> int:
+    """
+    Объединяет кассеты (например, записанные воркерами xdist) в одну.
+
+    :param parts: Пути к кассетам.
+    :param path: Путь к итоговой кассете.
+    :param meta: Метаданные итоговой кассеты.
+    :return: Количество записей.
+    """
+    players = [CassettePlayer(part) for part in parts]
+    ignored_fields = players[0].ignored_fields if players else DEFAULT_IGNORED_FIELDS
+    recorder = CassetteRecorder(path, meta=meta, ignored_fields=ignored_fields)
+    try:
+        for player in players:
+            for key_hash, entries in player.entries.items():
+                for position in range(len(entries)):
+                    recorder.add(player.keys[key_hash], *player.read(key_hash, position))
+    finally:
+        recorder.close()
+        for player in players:
+            player.close()
+    return recorder.records
+
+
+_cassette: CassetteRecorder | CassettePlayer | None = None
+
+
+def get_cassette() -> CassetteRecorder | CassettePlayer | None:
+    """
+    Возвращает активную кассету процесса (None - запросы идут в сеть без записи).
+    """
+    return _cassette
+
+
+def set_cassette(cassette: CassetteRecorder | CassettePlayer | None):
+    """
+    Включает запись или воспроизведение для всех `ApiClient` процесса.
+    """
+    global _cassette
+    _cassette = cassette
@@ -0,0 +1,278 @@
+"""Ограничение частоты и конкурентности запросов `ApiClient`, общее для всех воркеров xdist."""
+import hashlib
+import mmap
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from settings.concurrency.file_lock import FileLock
+
+# Ячейка корзины: хэш ключа, токены, время пополнения, запросов в полёте,
+# количество ожиданий, суммарное и максимальное ожидание (мкс), название корзины
+_SLOT = struct.Struct("<QddqqqqH62s")
+SLOTS = 64
+
+# Интервал проверки, когда корзина упирается в ограничение конкурентности, с
+IN_FLIGHT_POLL_SECONDS = 0.002
+
+
+@dataclass(frozen=True)
+class Limit:
+    """
+    Ограничение корзины: запросов в секунду (0 - без ограничения), допустимый всплеск
+    и максимальное количество одновременных запросов (0 - без ограничения).
+    """
+    rps: float = 0
+    burst: float | None = None
+    max_in_flight: int = 0
+
+    @property
+    def capacity(self) -> float:
+        return self.burst or max(self.rps, 1)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rps > 0 or self.max_in_flight > 0
+
+
+@dataclass
+class RateLimits:
+    """
+    Ограничения запросов: общее на хост и отдельные для эндпоинтов.
+
+    Ключ ограничения эндпоинта - путь (`/v1/favorites`, действует и на вложенные пути)
+    или метод с путём (`POST /v1/auth/tokens`). Запрос к такому эндпоинту должен получить
+    разрешение и в корзине эндпоинта, и в общей корзине хоста.
+    """
+    host: Limit = field(default_factory=Limit)
+    endpoints: dict[str, Limit] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config) -> "RateLimits":
+        return cls(
+            host=Limit(
+                rps=config.rate_limit_rps,
+                burst=config.rate_limit_burst,
+                max_in_flight=config.rate_limit_max_in_flight,
+            ),
+            endpoints={key: Limit(**limit) for key, limit in config.rate_limit_endpoints.items()},
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.host.enabled or any(limit.enabled for limit in self.endpoints.values())
+
+    def buckets(self, url: str, method: str, endpoint_key: str) -> list[tuple[str, Limit]]:
+        """
+        Возвращает корзины, в которых запрос должен получить разрешение.
+
+        :param url: URL запроса (корзины разделяются по хостам).
+        :param method: HTTP-метод.
+        :param endpoint_key: Нормализованный ключ эндпоинта (`endpoint_key`).
+        :return: Пары (название корзины, ограничение).
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        path = endpoint_key.split(" ", 1)[1]
+        buckets = [(host, self.host)] if self.host.enabled else []
+        for key, limit in self.endpoints.items():
+            rule_method, _, rule_path = key.rpartition(" ")
+            if rule_method and rule_method != method:
+                continue
+            if path == rule_path or path.startswith(rule_path.rstrip("/") + "/"):
+                buckets.append((f"{host} {key}", limit))
+        return buckets
+
+
+class SharedRateLimiter:
+    """
+    Корзины токенов (token bucket) и счётчики запросов в полёте в общей памяти.
+
+    Состояние корзин хранится в файле, отображённом в память всеми воркерами прогона,
+    изменения защищены межпроцессной блокировкой (`FileLock`), поэтому ограничения
+    действуют на прогон целиком, а не на каждый воркер. Без пути к файлу состояние
+    хранится в памяти процесса.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        """
+        :param path: Путь к файлу состояния прогона (None - только в пределах процесса).
+        """
+        size = _SLOT.size * SLOTS
+        self.path = Path(path) if path is not None else None
+        self._thread_lock = threading.Lock()
+        self._file_lock = None
+        if self.path is None:
+            self._map = mmap.mmap(-1, size)
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file_lock = FileLock(self.path.with_name(f"{self.path.name}.lock"))
+        with self._file_lock:
+            with open(self.path, "a+b") as state_file:
+                if state_file.seek(0, 2) < size:
+                    state_file.truncate(size)
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            if self._file_lock is None:
+                yield
+                return
+            with self._file_lock:
+                yield
+
+    def _slot(self, name: str) -> int:
+        """
+        Находит ячейку корзины (открытая адресация); новая корзина занимает первую свободную ячейку.
+        Вызывается под блокировкой.
+        """
+        key_hash = int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little") or 1
+        start = key_hash % SLOTS
+        for probe in range(SLOTS):
+            index = (start + probe) % SLOTS
+            stored_hash = struct.unpack_from("<Q", self._map, index * _SLOT.size)[0]
+            if stored_hash == key_hash:
+                return index
+            if stored_hash == 0:
+                label = name.encode()[:62]
+                _SLOT.pack_into(self._map, index * _SLOT.size, key_hash, -1.0, 0.0, 0, 0, 0, 0, len(label), label)
+                return index
+        raise RuntimeError(f"Превышено количество корзин ограничения запросов ({SLOTS}).")
+
+    def _try_acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        """
+        Забирает разрешения во всех корзинах сразу или не забирает ни одного.
+
+        :return: 0, если разрешения получены, иначе - сколько ждать до следующей попытки, с.
+        """
+        now = time.monotonic()
+        slots = []
+        wait = 0.0
+        for name, limit in buckets:
+            offset = self._slot(name) * _SLOT.size
+            tokens, updated, in_flight = struct.unpack_from("<ddq", self._map, offset + 8)
+            if limit.rps > 0:
+                tokens = limit.capacity if tokens < 0 else min(limit.capacity, tokens + (now - updated) * limit.rps)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / limit.rps)
+            if limit.max_in_flight and in_flight >= limit.max_in_flight:
+                wait = max(wait, IN_FLIGHT_POLL_SECONDS)
+            slots.append((offset, limit, tokens, in_flight))
+
+        for offset, limit, tokens, in_flight in slots:
+            if not wait:
+                tokens -= 1 if limit.rps > 0 else 0
+                in_flight += 1
+            struct.pack_into("<ddq", self._map, offset + 8, tokens, now, in_flight)
+        return wait
+
+    def acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        """
+        Ждёт разрешения на запрос во всех корзинах.
+
+        :param buckets: Корзины запроса (`RateLimits.buckets`).
+        :return: Время ожидания разрешения, мс (0 - разрешение получено сразу).
+        """
+        started = None
+        while True:
+            with self._locked():
+                wait = self._try_acquire(buckets)
+                if not wait:
+                    if started is None:
+                        return 0.0
+                    waited_us = int((time.perf_counter() - started) * 1_000_000)
+                    self._record_wait(buckets, waited_us)
+                    return waited_us / 1000
+            if started is None:
+                started = time.perf_counter()
+            time.sleep(wait)
+
+    def _record_wait(self, buckets: list[tuple[str, Limit]], waited_us: int):
+        for name, _ in buckets:
+            offset = self._slot(name) * _SLOT.size + 32
+            waits, wait_us, max_wait_us = struct.unpack_from("<qqq", self._map, offset)
+            struct.pack_into("<qqq", self._map, offset, waits + 1, wait_us + waited_us, max(max_wait_us, waited_us))
+
+    def release(self, buckets: list[tuple[str, Limit]]):
+        """
+        Возвращает место в ограничении конкурентности после получения ответа.
+        """
+        with self._locked():
+            for name, _ in buckets:
+                offset = self._slot(name) * _SLOT.size + 24
+                (in_flight,) = struct.unpack_from("<q", self._map, offset)
+                struct.pack_into("<q", self._map, offset, max(in_flight - 1, 0))
+
+    @contextmanager
+    def permit(self, buckets: list[tuple[str, Limit]]):
+        """
+        Контекст запроса: ожидание разрешения на входе, освобождение места на выходе.
+
+        :return: Время ожидания разрешения, мс.
+        """
+        waited_ms = self.acquire(buckets)
+        try:
+            yield waited_ms
+        finally:
+            self.release(buckets)
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Счётчики ожидания разрешений по корзинам (по всем процессам, использующим файл состояния).
+        """
+        result = {}
+        with self._locked():
+            for index in range(SLOTS):
+                key_hash, _, _, _, waits, wait_us, max_wait_us, label_length, label = _SLOT.unpack_from(
+                    self._map, index * _SLOT.size
+                )
+                if key_hash:
+                    result[label[:label_length].decode(errors="replace")] = {
+                        "waits": waits,
+                        "wait_ms": wait_us / 1000,
+                        "max_wait_ms": max_wait_us / 1000,
+                    }
+        return result
+
+    def close(self):
+        self._map.close()
+        if self.path is not None:
+            self._file.close()
+
+
+_rate_limiter: SharedRateLimiter | None = None
+_rate_limiter_path: Path | None = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> SharedRateLimiter:
+    """
+    Возвращает ограничитель запросов процесса (создаётся при первом обращении).
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = SharedRateLimiter(_rate_limiter_path)
+        return _rate_limiter
+
+
+def configure_rate_limiter(path: Path | str | None):
+    """
+    Задаёт файл состояния ограничителя запросов процесса (например, общий для воркеров xdist
+    файл прогона) и закрывает ранее созданный ограничитель.
+
+    :param path: Путь к файлу состояния (None - состояние в памяти процесса).
+    """
+    global _rate_limiter, _rate_limiter_path
+    with _rate_limiter_lock:
+        if _rate_limiter is not None:
+            _rate_limiter.close()
+        _rate_limiter = None
+        _rate_limiter_path = Path(path) if path is not None else None
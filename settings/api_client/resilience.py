@@ -0,0 +1,167 @@
+"""Политика повторов, бюджет повторов и задержка хеджирования запросов `ApiClient`."""
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from settings.metrics.latency import LatencyHistogram
+
+# Методы, повтор которых не меняет состояние сервиса сверх первого запроса
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Статусы временной недоступности, после которых идемпотентный запрос повторяется
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+def _request_not_sent(error: requests.RequestException) -> bool:
+    """
+    Проверяет, что запрос не дошёл до сервера (соединение не установлено), поэтому
+    его можно повторить даже для неидемпотентного метода.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Политика повторов запроса.
+
+    Идемпотентные методы повторяются при ошибках соединения, таймаутах и статусах
+    `RETRY_STATUSES`, неидемпотентные - только если соединение не было установлено.
+    Пауза перед повтором - экспоненциальная с полным джиттером: random(0, min(max, base * 2^n)).
+    """
+    max_attempts: int = 3
+    backoff_ms: float = 100
+    backoff_max_ms: float = 2000
+
+    @classmethod
+    def from_config(cls, config) -> "RetryPolicy":
+        return cls(
+            max_attempts=max(config.retry_max_attempts, 1),
+            backoff_ms=config.retry_backoff_ms,
+            backoff_max_ms=config.retry_backoff_max_ms,
+        )
+
+    def retryable_status(self, method: str, status: int) -> bool:
+        return method in IDEMPOTENT_METHODS and status in RETRY_STATUSES
+
+    def retryable_error(self, method: str, error: requests.RequestException) -> bool:
+        if method in IDEMPOTENT_METHODS:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+        return _request_not_sent(error)
+
+    def backoff_seconds(self, retry: int) -> float:
+        """
+        :param retry: Номер повтора, начиная с 1.
+        :return: Пауза перед повтором, с.
+        """
+        cap = min(self.backoff_max_ms, self.backoff_ms * 2 ** (retry - 1))
+        return random.uniform(0, cap) / 1000
+
+
+class RetryBudget:
+    """
+    Бюджет повторов процесса: каждый исходный запрос пополняет бюджет на `ratio` токена,
+    каждый повтор или хеджирующий запрос тратит один токен. Поэтому при массовых ошибках
+    повторы добавляют к нагрузке не больше `ratio` от числа запросов (плюс начальный запас).
+    """
+
+    def __init__(self, ratio: float = 0.1, reserve: float = 10):
+        """
+        :param ratio: Доля повторов от количества исходных запросов.
+        :param reserve: Начальный запас токенов (повторы в начале прогона).
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+        self.capacity = reserve * 10
+        self.spent = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def deposit(self, ratio: float = None):
+        """
+        Пополняет бюджет за исходный запрос.
+
+        :param ratio: Доля повторов (по умолчанию - заданная при создании бюджета).
+        """
+        with self._lock:
+            self.tokens = min(self.tokens + (self.ratio if ratio is None else ratio), self.capacity)
+
+    def withdraw(self) -> bool:
+        """
+        :return: True, если повтор разрешён.
+        """
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.spent += 1
+                return True
+            self.rejected += 1
+            return False
+
+
+class HedgeDelays:
+    """
+    Задержка хеджирующего запроса по эндпоинтам: p95 времени ответа, накопленного в процессе.
+    """
+
+    min_samples = 20
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def record(self, endpoint_key: str, total_ms: float):
+        with self._lock:
+            histogram = self._histograms.get(endpoint_key)
+            if histogram is None:
+                histogram = self._histograms[endpoint_key] = LatencyHistogram()
+            histogram.record(total_ms)
+
+    def delay_ms(self, endpoint_key: str) -> float | None:
+        """
+        :return: p95 эндпоинта или None, если замеров меньше `min_samples`.
+        """
+        with self._lock:
+            histogram = self._histograms.get(endpoint_key)
+            if histogram is None or histogram.total < self.min_samples:
+                return None
+            return histogram.percentile(95)
+
+
+_retry_budget = RetryBudget()
+_hedge_delays = HedgeDelays()
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_retry_budget() -> RetryBudget:
+    """
+    Возвращает бюджет повторов текущего процесса.
+    """
+    return _retry_budget
+
+
+def get_hedge_delays() -> HedgeDelays:
+    """
+    Возвращает накопленные задержки хеджирования текущего процесса.
+    """
+    return _hedge_delays
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул потоков процесса для хеджируемых запросов (создаётся при первом обращении).
+    """
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+        return _hedge_executor
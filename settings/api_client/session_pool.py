@@ -0,0 +1,304 @@
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_connect_state = threading.local()
+
+
+class _TimedConnectionMixin:
+    """
+    Замеряет время установки соединения (TCP и, для HTTPS, TLS-рукопожатие).
+
+    Запрос через `requests` выполняется в вызывающем потоке, поэтому замер
+    сохраняется в thread-local и забирается `pop_connect_time` после запроса.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_state.connect_ms = getattr(_connect_state, "connect_ms", 0.0) + (
+                time.perf_counter() - started
+            ) * 1000
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """
+    Адаптер, пулы которого создают соединения с замером времени подключения.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def reset_connect_time():
+    """
+    Сбрасывает замер времени подключения текущего потока перед запросом.
+    """
+    _connect_state.connect_ms = 0.0
+
+
+def pop_connect_time() -> float | None:
+    """
+    Возвращает время установки соединения (мс) в последнем запросе текущего потока.
+
+    :return: Время подключения или None, если использовано уже открытое соединение.
+    """
+    connect_ms = getattr(_connect_state, "connect_ms", 0.0)
+    _connect_state.connect_ms = 0.0
+    return connect_ms or None
+
+
+class _RejectAllCookiesPolicy(DefaultCookiePolicy):
+    """
+    Политика cookie, запрещающая сессии запоминать cookie из ответов.
+
+    Сессии пула общие для всех тестов процесса, поэтому cookie (например, `token`)
+    передаются только явно через параметр `cookies` запроса.
+    """
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+
+class SessionPool:
+    """
+    Пул HTTP-сессий с keep-alive, общий для всех ApiClient текущего процесса.
+
+    Для каждого хоста (scheme://host:port) создаётся одна `requests.Session`
+    со своим пулом соединений urllib3, поэтому TCP/TLS-соединения переиспользуются
+    между запросами. В каждом процессе (в том числе в каждом воркере pytest-xdist)
+    используется свой экземпляр пула - см. `get_session_pool`.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, pool_block: bool = False):
+        """
+        :param pool_maxsize: Максимальное количество соединений в пуле для одного хоста.
+        :param pool_block: Ждать освобождения соединения, если пул хоста исчерпан
+            (иначе создаётся временное соединение сверх лимита).
+        """
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+        self._lock = threading.Lock()
+        self._sessions: dict[str, requests.Session] = {}
+        self._pool_sizes: dict[str, int] = {}
+        self._closed_stats: dict[str, dict] = {}
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """
+        Формирует ключ пула по URL: scheme://netloc.
+
+        :param url: URL запроса или базовый URL сервиса.
+        :return: Ключ хоста.
+        """
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _mount_adapter(self, session: requests.Session, pool_maxsize: int):
+        """
+        Подключает к сессии адаптер с пулом соединений заданного размера.
+
+        :param session: Сессия пула.
+        :param pool_maxsize: Размер пула соединений хоста.
+        """
+        adapter = _TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=self.pool_block)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def _create_session(self, pool_maxsize: int) -> requests.Session:
+        """
+        Создаёт сессию с пулом соединений заданного размера.
+
+        :param pool_maxsize: Размер пула соединений хоста.
+        :return: Настроенная `requests.Session`.
+        """
+        session = requests.Session()
+        session.cookies.set_policy(_RejectAllCookiesPolicy())
+        session.headers["Connection"] = "keep-alive"
+        self._mount_adapter(session, pool_maxsize)
+        return session
+
+    def session_for(self, url: str, pool_maxsize: int | None = None) -> requests.Session:
+        """
+        Возвращает сессию для хоста из URL, создавая её при первом обращении.
+
+        :param url: URL запроса или базовый URL сервиса.
+        :param pool_maxsize: Размер пула для хоста (учитывается только при создании сессии).
+        :return: Сессия с keep-alive соединениями.
+        """
+        key = self._host_key(url)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                size = pool_maxsize or self.pool_maxsize
+                session = self._create_session(size)
+                self._sessions[key] = session
+                self._pool_sizes[key] = size
+        return session
+
+    def ensure_pool_size(self, url: str, pool_maxsize: int) -> requests.Session:
+        """
+        Гарантирует, что пул соединений хоста вмещает не меньше `pool_maxsize` соединений.
+
+        Используется при конкурентной отправке запросов, чтобы соединения сверх
+        размера пула не закрывались после каждого запроса.
+
+        :param url: URL запроса или базовый URL сервиса.
+        :param pool_maxsize: Требуемый размер пула.
+        :return: Сессия хоста.
+        """
+        session = self.session_for(url, pool_maxsize=pool_maxsize)
+        key = self._host_key(url)
+        if self._pool_sizes.get(key, 0) >= pool_maxsize:
+            return session
+
+        with self._lock:
+            if self._pool_sizes.get(key, 0) < pool_maxsize:
+                previous = self._session_stats(session)
+                stored = self._closed_stats.get(key)
+                if stored:
+                    previous = {name: stored[name] + value for name, value in previous.items()}
+                self._closed_stats[key] = previous
+
+                old_adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+                self._mount_adapter(session, pool_maxsize)
+                for adapter in old_adapters.values():
+                    adapter.close()
+                self._pool_sizes[key] = pool_maxsize
+        return session
+
+    @staticmethod
+    def _session_stats(session: requests.Session) -> dict:
+        """
+        Собирает счётчики соединений по всем пулам urllib3 сессии.
+
+        :param session: Сессия пула.
+        :return: Словарь с количеством открытых соединений, запросов и переиспользований.
+        """
+        opened = 0
+        requests_count = 0
+        seen_adapters = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen_adapters:
+                continue
+            seen_adapters.add(id(adapter))
+
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                requests_count += pool.num_requests
+
+        return {
+            "connections_opened": opened,
+            "requests": requests_count,
+            "connections_reused": max(requests_count - opened, 0),
+        }
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Возвращает счётчики соединений по каждому хосту (включая уже закрытые сессии).
+
+        :return: Словарь `{host: {connections_opened, requests, connections_reused}}`.
+        """
+        with self._lock:
+            result = {host: dict(values) for host, values in self._closed_stats.items()}
+            for host, session in self._sessions.items():
+                current = self._session_stats(session)
+                previous = result.get(host)
+                if previous:
+                    current = {name: previous[name] + value for name, value in current.items()}
+                result[host] = current
+        return result
+
+    def close(self) -> dict[str, dict]:
+        """
+        Закрывает все сессии и соединения пула.
+
+        :return: Итоговые счётчики соединений по хостам.
+        """
+        stats = self.stats()
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._pool_sizes.clear()
+            self._closed_stats = stats
+        return stats
+
+
+_pool: SessionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """
+    Возвращает пул сессий текущего процесса.
+
+    После fork (например, при запуске воркеров) создаётся новый пул, чтобы
+    процессы не делили сокеты родителя.
+
+    :return: Экземпляр `SessionPool` текущего процесса.
+    """
+    global _pool, _pool_pid
+
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = SessionPool()
+                _pool_pid = pid
+    return _pool
+
+
+def merge_pool_stats(*stats_items: dict[str, dict]) -> dict[str, dict]:
+    """
+    Суммирует счётчики соединений нескольких пулов (например, разных воркеров xdist).
+
+    :param stats_items: Счётчики в формате `SessionPool.stats()`.
+    :return: Объединённые счётчики по хостам.
+    """
+    merged: dict[str, dict] = {}
+    for stats in stats_items:
+        for host, values in stats.items():
+            target = merged.setdefault(host, {name: 0 for name in values})
+            for name, value in values.items():
+                target[name] = target.get(name, 0) + value
+    return merged
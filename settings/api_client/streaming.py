@@ -0,0 +1,196 @@
+"""Потоковое чтение тела ответа: чанки и элементы JSON-массива верхнего уровня."""
+import codecs
+import json
+import time
+from typing import Callable, Iterator
+
+import requests
+
+from settings.validation.response_validator import get_validator
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class StreamingResponse:
+    """
+    Ответ, тело которого не буферизуется целиком, а читается по мере обработки.
+
+    Тело можно прочитать один раз: чанками (`iter_chunks`) или элементами JSON-массива
+    верхнего уровня (`iter_items`). После чтения (или `close`) соединение возвращается в пул,
+    а замеры запроса (`timing`) дополняются временем и объёмом чтения тела.
+    """
+
+    def __init__(self, response: requests.Response, on_close: Callable[["StreamingResponse"], None] = None):
+        """
+        :param response: Ответ `requests`, полученный с `stream=True`.
+        :param on_close: Вызывается один раз после чтения тела или закрытия ответа.
+        """
+        self.response = response
+        self.started = time.perf_counter()
+        self.read_ms = 0.0
+        self.bytes_read = 0
+        self.timing = None
+        self._on_close = on_close
+        self._closed = False
+        self._consumed = False
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self):
+        return self.response.headers
+
+    @property
+    def url(self) -> str:
+        return self.response.url
+
+    @property
+    def request(self):
+        return self.response.request
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Возвращает тело ответа чанками (с распаковкой gzip/deflate).
+
+        :param chunk_size: Максимальный размер чанка, байт.
+        :raises RuntimeError: Если тело уже прочитано.
+        """
+        if self._consumed:
+            raise RuntimeError("Тело потокового ответа уже прочитано.")
+        self._consumed = True
+        try:
+            for chunk in self.response.iter_content(chunk_size=chunk_size):
+                self.bytes_read += len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def iter_items(self, schema=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+        """
+        Разбирает JSON-массив верхнего уровня по элементам, не загружая тело целиком.
+
+        :param schema: Схема элемента (pydantic-модель). Если передана - элементы проверяются
+            кэшированным валидатором и возвращаются экземплярами модели.
+        :param chunk_size: Размер читаемого чанка, байт.
+        :return: Итератор элементов массива.
+        :raises ValueError: Если тело не является JSON-массивом.
+        """
+        items = iter_json_array(self.iter_chunks(chunk_size), self.response.encoding or "utf-8")
+        if schema is None:
+            return items
+        validator = get_validator(schema)
+        return (validator.validate_python(item) for item in items)
+
+    def close(self):
+        """
+        Закрывает ответ, возвращает соединение в пул и фиксирует замеры.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.read_ms = (time.perf_counter() - self.started) * 1000
+        self.response.close()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        return self.iter_chunks()
+
+
+def iter_json_array(chunks: Iterator[bytes], encoding: str = "utf-8") -> Iterator:
+    """
+    Инкрементально разбирает JSON-массив верхнего уровня из потока байтов.
+
+    В памяти держится только необработанный хвост буфера (не больше одного элемента и чанка).
+    Тело читается до конца: после закрывающей скобки допустимы только пробельные символы.
+
+    :param chunks: Итератор чанков тела.
+    :param encoding: Кодировка тела.
+    :return: Итератор элементов массива.
+    :raises ValueError: Если данные не являются корректным JSON-массивом.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+    expect_item = True  # Ожидается элемент (после "[" или ","), а не разделитель
+    empty = True  # Элементов ещё не было: "]" допустима сразу после "["
+    finished = False  # Массив закрыт: до конца тела допустимы только пробельные символы
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        for chunk in chunks:
+            text = text_decoder.decode(chunk)
+            if text:
+                # Разобранное начало буфера отбрасывается, чтобы память не росла с размером ответа
+                buffer = buffer[position:] + text
+                position = 0
+                return True
+        buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        position = 0
+        eof = True
+        return False
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                if finished:
+                    return
+                raise ValueError("Некорректный JSON-массив: неожиданный конец тела ответа.")
+            read_more()
+            continue
+
+        char = buffer[position]
+        if finished:
+            raise ValueError(f"Некорректный JSON: лишние данные после массива: {char!r}.")
+        if not started:
+            if char != "[":
+                raise ValueError(f"Ожидался JSON-массив, получен символ {char!r}.")
+            started = True
+            position += 1
+            continue
+
+        if char == "]":
+            if expect_item and not empty:
+                raise ValueError("Некорректный JSON-массив: ожидался элемент после ','.")
+            finished = True
+            position += 1
+            continue
+        if not expect_item:
+            if char != ",":
+                raise ValueError(f"Некорректный JSON-массив: ожидалась ',' на позиции {position}, получено {char!r}.")
+            expect_item = True
+            position += 1
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Некорректный JSON-массив: не удалось разобрать элемент.") from None
+            read_more()
+            continue
+        # Число на границе чанка может быть оборвано ("-4" из "-4.5e3"): дочитываем до разделителя
+        if not eof and isinstance(item, (int, float)) and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+            read_more()
+            continue
+
+        position = end
+        expect_item = False
+        empty = False
+        yield item
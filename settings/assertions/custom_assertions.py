@@ -1,3 +1,6 @@
+from settings.metrics.latency import percentile
+
+
 def assert_equal(actual, expected, message=None):
     """
     Проверяет, что фактическое значение равно ожидаемому.
@@ -135,3 +138,86 @@ def assert_in(item, container, message=None):
     """
     if item not in container:
         raise AssertionError(message or f"{item} not found in {container}")
+
+
+def _request_timing(item):
+    """
+    Возвращает замеры запроса из ответа `ApiClient` (атрибут `timing`) или сами замеры.
+
+    :param item: Ответ `requests.Response` с атрибутом `timing` или объект `RequestTiming`.
+    :raises TypeError: Если у объекта нет замеров.
+    """
+    timing = getattr(item, "timing", item)
+    if not hasattr(timing, "total_ms"):
+        raise TypeError(f"Нет замеров времени запроса у объекта {type(item)}. Ответ должен быть получен через ApiClient.")
+    return timing
+
+
+def _format_slowest(timings: list, count: int) -> str:
+    """
+    Формирует список самых медленных запросов с разбивкой по фазам.
+
+    :param timings: Замеры запросов.
+    :param count: Количество запросов в списке.
+    """
+    slowest = sorted(timings, key=lambda timing: timing.total_ms, reverse=True)[:count]
+    return "\n".join(
+        f"  {timing.method} {timing.url} -> {timing.status}: {timing.phases()}"
+        for timing in slowest
+    )
+
+
+def assert_response_time(response, max_ms: float, message=None):
+    """
+    Проверяет, что запрос выполнен не дольше заданного времени.
+
+    :param response: Ответ `ApiClient` (с атрибутом `timing`) или объект `RequestTiming`.
+    :param max_ms: Допустимое время запроса в миллисекундах.
+    :param message: Необязательное пользовательское сообщение об ошибке.
+    :raises AssertionError: Если запрос выполнялся дольше `max_ms`.
+    """
+    timing = _request_timing(response)
+    if timing.total_ms > max_ms:
+        raise AssertionError(
+            message or
+            f"Время запроса {timing.total_ms:.1f} мс превышает допустимые {max_ms} мс.\n"
+            f"{_format_slowest([timing], 1)}"
+        )
+
+
+def assert_latency_percentiles(
+    responses: list,
+    p95_ms: float = None,
+    p99_ms: float = None,
+    slowest_count: int = 5,
+    message=None
+):
+    """
+    Проверяет, что перцентили времени пачки запросов укладываются в бюджеты.
+
+    :param responses: Ответы `ApiClient` (с атрибутом `timing`) или объекты `RequestTiming`.
+    :param p95_ms: Бюджет для 95-го перцентиля в миллисекундах (None - не проверять).
+    :param p99_ms: Бюджет для 99-го перцентиля в миллисекундах (None - не проверять).
+    :param slowest_count: Количество самых медленных запросов в сообщении об ошибке.
+    :param message: Необязательное пользовательское сообщение об ошибке.
+    :raises AssertionError: Если хотя бы один перцентиль превышает бюджет.
+    """
+    timings = [_request_timing(response) for response in responses]
+    if not timings:
+        raise AssertionError(message or "Нет запросов для проверки перцентилей времени ответа.")
+
+    durations = [timing.total_ms for timing in timings]
+    violations = []
+    for percent, budget in ((95, p95_ms), (99, p99_ms)):
+        if budget is None:
+            continue
+        actual = percentile(durations, percent)
+        if actual > budget:
+            violations.append(f"p{percent} = {actual:.1f} мс превышает бюджет {budget} мс")
+
+    if violations:
+        raise AssertionError(
+            message or
+            f"Нарушены бюджеты времени ответа ({len(timings)} запросов): {'; '.join(violations)}.\n"
+            f"Самые медленные запросы:\n{_format_slowest(timings, slowest_count)}"
+        )
@@ -0,0 +1,337 @@
+"""Структурное сравнение данных ответа с ожидаемыми (используется `verify_data`)."""
+import math
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from itertools import product
+from operator import itemgetter
+
+_MISSING = object()
+_TOLERANCE_CELL = object()
+# Больше чисел с допуском в элементе - соседних ячеек сетки (3 ** n) слишком много, элемент сравнивается перебором
+_MAX_TOLERANCE_DIMENSIONS = 5
+
+
+@dataclass
+class Difference:
+    """
+    Одно расхождение фактических данных с ожидаемыми. Текст сообщения строится только по запросу.
+    """
+    path: str
+    kind: str  # value, type, length, missing, unexpected
+    actual: object = None
+    expected: object = None
+
+    def message(self) -> str:
+        place = self.path or "<корень>"
+        if self.kind == "length":
+            return f"Несовпадение длины списка '{place}': фактическая = {self.actual}, ожидаемая = {self.expected}."
+        if self.kind == "missing":
+            return f"Не найден ожидаемый элемент '{place}': {self.expected!r}."
+        if self.kind == "unexpected":
+            return f"Лишний элемент '{place}': {self.actual!r}."
+        if self.kind == "type":
+            return (
+                f"Несовпадение типа в поле '{place}': фактический тип = {type(self.actual).__name__}, "
+                f"ожидаемый тип = {type(self.expected).__name__}."
+            )
+        return f"Несовпадение в поле '{place}': фактическое значение = {self.actual!r}, ожидаемое значение = {self.expected!r}."
+
+
+class DataDiff:
+    """
+    Сравнивает вложенные словари и списки за один проход и собирает все расхождения.
+
+    - словарь верхнего уровня сравнивается по ключам ожидаемых данных (лишние ключи ответа, например `id`,
+      не проверяются) с учётом `verified_fields`/`unverified_fields`; вложенные словари, в том числе
+      элементы списков, должны совпадать полностью, а с `expected_keys_only` - только по ключам ожидаемых данных;
+    - списки сравниваются по индексу, без учёта порядка (`unordered`, сопоставление по хэшу за O(n),
+      а числа с допуском - по ячейкам сетки с шагом допуска) или по ключу элемента (`match_key`, например `id`;
+      повторяющиеся ключи сопоставляются по порядку, лишние считаются расхождениями);
+    - числа сравниваются с допуском (`tolerance`: общий или по имени поля, например `{"lat": 1e-6}`).
+    """
+
+    def __init__(
+        self,
+        verified_fields: list | None = None,
+        unverified_fields: list | None = None,
+        unordered: bool = False,
+        match_key: str | None = None,
+        tolerance: float | dict[str, float] | None = None,
+        expected_keys_only: bool = False,
+    ):
+        """
+        :param verified_fields: Проверяемые поля словаря верхнего уровня.
+        :param unverified_fields: Поля словаря верхнего уровня, исключаемые из проверки.
+        :param unordered: Сравнивать списки без учёта порядка элементов.
+        :param match_key: Ключ, по которому сопоставляются элементы списков словарей.
+        :param tolerance: Допуск сравнения чисел: общий или по имени поля.
+        :param expected_keys_only: Сравнивать вложенные словари только по ключам ожидаемых данных.
+        """
+        self.verified_fields = set(verified_fields) if verified_fields is not None else None
+        self.unverified_fields = set(unverified_fields or ())
+        self.unordered = unordered
+        self.match_key = match_key
+        self.default_tolerance = tolerance if isinstance(tolerance, (int, float)) else 0.0
+        self.field_tolerance = tolerance if isinstance(tolerance, dict) else {}
+        self.expected_keys_only = expected_keys_only
+        self.differences: list[Difference] = []
+
+    def compare(self, actual, expected) -> list[Difference]:
+        """
+        :param actual: Фактические данные.
+        :param expected: Ожидаемые данные.
+        :return: Список расхождений (пустой, если данные совпадают).
+        """
+        self.differences = []
+        self._compare(actual, expected, "", None, top_level=True)
+        return self.differences
+
+    def _compared_keys(self, expected: dict, top_level: bool):
+        keys = expected.keys()
+        if top_level and self.verified_fields is not None:
+            keys = self.verified_fields
+        if top_level and self.unverified_fields:
+            keys = [key for key in keys if key not in self.unverified_fields]
+        return keys
+
+    def _compare(self, actual, expected, path: str, field: str | None, top_level: bool = False):
+        if isinstance(expected, dict):
+            if not isinstance(actual, dict):
+                self.differences.append(Difference(path, "type", actual, expected))
+                return
+            strict = not top_level and not self.expected_keys_only
+            for key in self._compared_keys(expected, top_level):
+                actual_value = actual.get(key, _MISSING)
+                expected_value = expected.get(key)
+                if actual_value is _MISSING:
+                    if strict:
+                        self.differences.append(Difference(self._key_path(path, key), "missing", None, expected_value))
+                        continue
+                    actual_value = None
+                # Быстрый путь: совпадающие скаляры не требуют ни рекурсии, ни форматирования пути
+                if actual_value == expected_value and not isinstance(expected_value, (dict, list)):
+                    continue
+                self._compare(actual_value, expected_value, self._key_path(path, key), key)
+            if strict:
+                for key, actual_value in actual.items():
+                    if key not in expected:
+                        self.differences.append(Difference(self._key_path(path, key), "unexpected", actual_value))
+            return
+
+        if isinstance(expected, list):
+            if not isinstance(actual, list):
+                self.differences.append(Difference(path, "type", actual, expected))
+                return
+            if self.match_key is not None and all(isinstance(item, dict) for item in expected):
+                self._compare_keyed(actual, expected, path)
+            elif self.unordered:
+                self._compare_unordered(actual, expected, path)
+            else:
+                self._compare_ordered(actual, expected, path)
+            return
+
+        if actual == expected:
+            return
+        if self._numbers_close(actual, expected, field):
+            return
+        self.differences.append(Difference(path, "value", actual, expected))
+
+    @staticmethod
+    def _key_path(path: str, key) -> str:
+        return f"{path}.{key}" if path else str(key)
+
+    def _numbers_close(self, actual, expected, field: str | None) -> bool:
+        tolerance = self.field_tolerance.get(field, self.default_tolerance)
+        if not tolerance:
+            return False
+        numbers = (int, float)
+        if not isinstance(actual, numbers) or not isinstance(expected, numbers):
+            return False
+        if isinstance(actual, bool) or isinstance(expected, bool):
+            return False
+        return abs(actual - expected) <= tolerance
+
+    def _compare_ordered(self, actual: list, expected: list, path: str):
+        if len(actual) != len(expected):
+            self.differences.append(Difference(path, "length", len(actual), len(expected)))
+        for index, (actual_item, expected_item) in enumerate(zip(actual, expected)):
+            if actual_item == expected_item and not isinstance(expected_item, (dict, list)):
+                continue
+            self._compare(actual_item, expected_item, f"{path}[{index}]", None)
+
+    def _compare_keyed(self, actual: list, expected: list, path: str):
+        # Элементы с одинаковым ключом сопоставляются по порядку: каждый фактический - не больше одного раза
+        key = self.match_key
+        actual_by_key = defaultdict(deque)
+        for index, item in enumerate(actual):
+            if isinstance(item, dict):
+                actual_by_key[item.get(key)].append(index)
+
+        matched = set()
+        for expected_item in expected:
+            item_key = expected_item.get(key)
+            item_path = f"{path}[{key}={item_key!r}]"
+            candidates = actual_by_key.get(item_key)
+            if not candidates:
+                self.differences.append(Difference(item_path, "missing", None, expected_item))
+                continue
+            actual_index = candidates.popleft()
+            matched.add(actual_index)
+            self._compare(actual[actual_index], expected_item, item_path, None)
+
+        for index, item in enumerate(actual):
+            if index not in matched:
+                item_key = item.get(key) if isinstance(item, dict) else None
+                self.differences.append(Difference(f"{path}[{key}={item_key!r}]", "unexpected", item, None))
+
+    def _freeze(self, value, keys=None):
+        """
+        Хэшируемое представление значения для сопоставления элементов без учёта порядка.
+        """
+        if isinstance(value, dict):
+            items = value.items() if keys is None else ((key, value.get(key)) for key in keys)
+            return ("dict", tuple(sorted(((key, self._freeze(item)) for key, item in items), key=itemgetter(0))))
+        if isinstance(value, list):
+            return ("list", tuple(self._freeze(item) for item in value))
+        return value
+
+    def _coarse(self, value, field: str | None, keys, cells: list):
+        """
+        Представление значения для сопоставления с допуском: числа, к которым применяется допуск,
+        заменяются меткой, а номера их ячеек сетки с шагом допуска добавляются в `cells`.
+        """
+        if isinstance(value, dict):
+            items = value.items() if keys is None else ((key, value.get(key)) for key in keys)
+            items = sorted(items, key=itemgetter(0))
+            return ("dict", tuple((key, self._coarse(item, key, None, cells)) for key, item in items))
+        if isinstance(value, list):
+            return ("list", tuple(self._coarse(item, None, None, cells) for item in value))
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            tolerance = self.field_tolerance.get(field, self.default_tolerance)
+            if tolerance and math.isfinite(value):
+                cells.append(math.floor(value / tolerance))
+                return _TOLERANCE_CELL
+        return value
+
+    def _match_within_tolerance(
+        self, actual: list, expected: list, leftover_actual: list[int], leftover_expected: list[int], keys
+    ) -> tuple[list[int], list[int]]:
+        """
+        Сопоставляет несовпавшие по хэшу элементы с допуском чисел: элементы группируются по структуре
+        и ячейкам сетки, и ожидаемый элемент сравнивается только с фактическими из своей и соседних ячеек.
+
+        :return: Индексы ожидаемых и фактических элементов, оставшихся без пары.
+        """
+        by_cells = defaultdict(list)
+        for index in leftover_actual:
+            cells = []
+            shape = self._coarse(actual[index], None, keys if isinstance(actual[index], dict) else None, cells)
+            by_cells[shape, tuple(cells)].append(index)
+
+        unmatched_expected = []
+        for index in leftover_expected:
+            cells = []
+            shape = self._coarse(expected[index], None, keys if isinstance(expected[index], dict) else None, cells)
+            if len(cells) > _MAX_TOLERANCE_DIMENSIONS or not self._take_close(
+                actual, expected[index], by_cells, shape, cells
+            ):
+                unmatched_expected.append(index)
+
+        unmatched_actual = sorted(index for indexes in by_cells.values() for index in indexes)
+        return unmatched_expected, unmatched_actual
+
+    def _take_close(self, actual: list, expected_item, by_cells: dict, shape, cells: list) -> bool:
+        for neighbour in product(*((cell - 1, cell, cell + 1) for cell in cells)):
+            candidates = by_cells.get((shape, neighbour))
+            for position, actual_index in enumerate(candidates or ()):
+                if not self._probe(actual[actual_index], expected_item):
+                    del candidates[position]
+                    return True
+        return False
+
+    def _compare_unordered(self, actual: list, expected: list, path: str):
+        # С `expected_keys_only` для словарей хэшируются только ключи ожидаемых элементов
+        keys = None
+        if self.expected_keys_only and expected and all(isinstance(item, dict) for item in expected):
+            keys = set()
+            for item in expected:
+                keys.update(item)
+            keys = sorted(keys, key=str)
+
+        unmatched_actual = defaultdict(list)
+        for index, item in enumerate(actual):
+            unmatched_actual[self._freeze(item, keys if isinstance(item, dict) else None)].append(index)
+
+        leftover_expected = []
+        for index, item in enumerate(expected):
+            frozen = self._freeze(item, keys if isinstance(item, dict) else None)
+            candidates = unmatched_actual.get(frozen)
+            if candidates:
+                candidates.pop()
+            else:
+                leftover_expected.append(index)
+
+        leftover_actual = sorted(index for indexes in unmatched_actual.values() for index in indexes)
+        if not leftover_expected and not leftover_actual:
+            return
+
+        if (self.default_tolerance or self.field_tolerance) and leftover_expected and leftover_actual:
+            leftover_expected, leftover_actual = self._match_within_tolerance(
+                actual, expected, leftover_actual, leftover_expected, keys
+            )
+
+        # Медленный путь только для элементов, не совпавших ни по хэшу, ни по ячейкам допуска
+        # (вложенные лишние ключи с `expected_keys_only`, больше `_MAX_TOLERANCE_DIMENSIONS` чисел с допуском)
+        for expected_index in leftover_expected:
+            expected_item = expected[expected_index]
+            for position, actual_index in enumerate(leftover_actual):
+                if not self._probe(actual[actual_index], expected_item):
+                    del leftover_actual[position]
+                    break
+            else:
+                self.differences.append(Difference(f"{path}[{expected_index}]", "missing", None, expected_item))
+
+        for actual_index in leftover_actual:
+            self.differences.append(Difference(f"{path}[{actual_index}]", "unexpected", actual[actual_index], None))
+
+    def _probe(self, actual, expected) -> list[Difference]:
+        """
+        Сравнивает пару элементов, не добавляя их расхождения в общий список.
+        """
+        collected = self.differences
+        self.differences = []
+        try:
+            self._compare(actual, expected, "", None)
+            return self.differences
+        finally:
+            self.differences = collected
+
+
+def diff_data(actual, expected, **options) -> list[Difference]:
+    """
+    Возвращает все расхождения фактических данных с ожидаемыми.
+
+    :param actual: Фактические данные.
+    :param expected: Ожидаемые данные.
+    :param options: Параметры `DataDiff` (verified_fields, unverified_fields, unordered, match_key, tolerance,
+        expected_keys_only).
+    :return: Список расхождений.
+    """
+    return DataDiff(**options).compare(actual, expected)
+
+
+def format_differences(differences: list[Difference], msg_option: str = "", limit: int = 50) -> str:
+    """
+    Формирует текст ошибки по расхождениям (не больше `limit` строк).
+
+    :param differences: Расхождения.
+    :param msg_option: Дополнительный контекст ошибки.
+    :param limit: Максимальное количество выводимых расхождений.
+    :return: Текст ошибки.
+    """
+    context = f" {msg_option}" if msg_option else ""
+    lines = [f"Ошибка! Найдено расхождений: {len(differences)}{context}."]
+    lines.extend(f"- {difference.message()}" for difference in differences[:limit])
+    if len(differences) > limit:
+        lines.append(f"... и ещё {len(differences) - limit}")
+    return "\n".join(lines)
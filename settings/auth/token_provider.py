@@ -0,0 +1,187 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from settings.concurrency.file_lock import FileLock, read_json, write_json_atomic
+
+# Минимальная пауза перед фоновым обновлением токена, с
+MIN_REFRESH_DELAY_SECONDS = 1.0
+
+
+class TokenProvider:
+    """
+    Поставщик сессионных токенов, общий для всех воркеров pytest-xdist одного прогона.
+
+    Токены хранятся в JSON-файле кэша прогона, доступ к которому защищён
+    межпроцессной блокировкой: первый обратившийся воркер получает токен,
+    остальные берут его из кэша. Срок действия отслеживается по cookie
+    (`expires`/`max-age`) или по `ttl_seconds`, а фоновый таймер обновляет
+    токен за `refresh_margin_seconds` до истечения. Для короткоживущих токенов
+    запас ограничивается половиной времени жизни, чтобы только что полученный
+    токен не считался истекающим и не запрашивался заново в цикле.
+    """
+
+    def __init__(
+        self,
+        mint_token: Callable[[], requests.Response],
+        cache_path: Path,
+        ttl_seconds: float = 3600,
+        refresh_margin_seconds: float = 60,
+        cookie_name: str = "token",
+    ):
+        """
+        :param mint_token: Функция получения нового токена (например, `AuthApi.post_auth_token`).
+        :param cache_path: Путь к файлу кэша токенов прогона.
+        :param ttl_seconds: Время жизни токена, если сервер не передал срок действия cookie.
+        :param refresh_margin_seconds: За сколько секунд до истечения токен обновляется.
+        :param cookie_name: Имя cookie с токеном.
+        """
+        self.mint_token = mint_token
+        self.cache_path = Path(cache_path)
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.cookie_name = cookie_name
+
+        self._file_lock = FileLock(self.cache_path.with_name(f"{self.cache_path.name}.lock"))
+        self._thread_lock = threading.Lock()
+        self._shared: dict | None = None
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+    def _refresh_margin(self, entry: dict) -> float:
+        minted_at = entry.get("minted_at")
+        if minted_at is None:
+            return self.refresh_margin_seconds
+        return min(self.refresh_margin_seconds, (entry["expires_at"] - minted_at) / 2)
+
+    def _is_fresh(self, entry: dict | None) -> bool:
+        return bool(entry) and time.time() < entry["expires_at"] - self._refresh_margin(entry)
+
+    def _mint(self) -> dict:
+        """
+        Получает новый токен и срок его действия.
+
+        :return: Запись кэша `{"token": ..., "expires_at": ..., "minted_at": ...}`.
+        :raises RuntimeError: Если сервер не вернул cookie с токеном.
+        """
+        response = self.mint_token()
+        minted_at = time.time()
+        for cookie in response.cookies:
+            if cookie.name == self.cookie_name and cookie.value:
+                expires_at = cookie.expires or minted_at + self.ttl_seconds
+                return {"token": cookie.value, "expires_at": float(expires_at), "minted_at": minted_at}
+
+        raise RuntimeError(
+            f"Не удалось получить сессионный токен: статус {response.status_code}, тело ответа: {response.text}"
+        )
+
+    def _refresh_shared(self) -> dict:
+        """
+        Берёт общий токен из кэша прогона или получает новый, если в кэше нет действующего.
+        """
+        with self._thread_lock, self._file_lock:
+            data = read_json(self.cache_path, default={})
+            entry = data.get("shared")
+            if not self._is_fresh(entry):
+                entry = self._mint()
+                data["shared"] = entry
+                write_json_atomic(self.cache_path, data)
+            self._shared = entry
+
+        self._schedule_refresh(entry)
+        return entry
+
+    def _schedule_refresh(self, entry: dict):
+        """
+        Планирует фоновое обновление общего токена до истечения срока действия.
+        """
+        if self._closed:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+
+        delay = max(entry["expires_at"] - self._refresh_margin(entry) - time.time(), MIN_REFRESH_DELAY_SECONDS)
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        try:
+            self._refresh_shared()
+        except Exception:
+            # Повторная попытка будет сделана синхронно при следующем get_token
+            self._shared = None
+
+    def get_token(self) -> str:
+        """
+        Возвращает действующий общий токен прогона.
+
+        :return: Сессионный токен.
+        """
+        entry = self._shared
+        if not self._is_fresh(entry):
+            entry = self._refresh_shared()
+        return entry["token"]
+
+    def get_tokens(self, count: int) -> list[str]:
+        """
+        Возвращает `count` различных действующих токенов из пула прогона (для изоляции пользователей).
+
+        Пул общий для всех воркеров: недостающие и истекающие токены получаются
+        один раз и сохраняются в кэш прогона.
+
+        :param count: Количество токенов.
+        :return: Список токенов.
+        """
+        with self._thread_lock, self._file_lock:
+            data = read_json(self.cache_path, default={})
+            pool = data.get("pool", [])
+
+            changed = False
+            for index in range(count):
+                if index >= len(pool):
+                    pool.append(self._mint())
+                    changed = True
+                elif not self._is_fresh(pool[index]):
+                    pool[index] = self._mint()
+                    changed = True
+
+            if changed:
+                data["pool"] = pool
+                write_json_atomic(self.cache_path, data)
+
+        return [entry["token"] for entry in pool[:count]]
+
+    def expired_tokens(self) -> set[str]:
+        """
+        Возвращает истёкшие токены из кэша прогона (например, чтобы не удалять сущности с ними после прогона:
+        сущность принадлежит токену, с которым она создана, и другим токеном не удаляется).
+
+        :return: Истёкшие токены, полученные поставщиком.
+        """
+        with self._thread_lock, self._file_lock:
+            data = read_json(self.cache_path, default={})
+        now = time.time()
+        entries = [data.get("shared"), *data.get("pool", [])]
+        return {entry["token"] for entry in entries if entry and now >= entry["expires_at"]}
+
+    def close(self):
+        """
+        Останавливает фоновое обновление токена.
+        """
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def clear(self):
+        """
+        Удаляет кэш токенов прогона.
+        """
+        self.close()
+        with self._file_lock:
+            self.cache_path.unlink(missing_ok=True)
+        self._file_lock.path.unlink(missing_ok=True)
@@ -0,0 +1,92 @@
+import json
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Межпроцессная блокировка на основе lock-файла (flock на POSIX, msvcrt на Windows).
+
+    Используется для синхронизации воркеров pytest-xdist через общие файлы
+    в `Paths.CACHE` без внешних сервисов.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        :param path: Путь к lock-файлу (создаётся при необходимости).
+        """
+        self.path = Path(path)
+        self._fd: int | None = None
+
+    def acquire(self):
+        """
+        Захватывает блокировку, ожидая её освобождения другими процессами.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self):
+        """
+        Освобождает блокировку.
+        """
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+def read_json(path: Path, default=None):
+    """
+    Читает JSON-файл общего состояния.
+
+    :param path: Путь к файлу.
+    :param default: Значение, если файла нет или он пуст.
+    :return: Данные файла или `default`.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return default
+    return json.loads(text) if text else default
+
+
+def write_json_atomic(path: Path, data):
+    """
+    Атомарно записывает JSON-файл общего состояния (через временный файл и os.replace).
+
+    :param path: Путь к файлу.
+    :param data: Сериализуемые в JSON данные.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
@@ -16,3 +16,117 @@ class ConfigModel(BaseModel):
         alias="token",
         description="Токен."
     )
+
+    http_pool_maxsize: int = Field(
+        default=10,
+        alias="http_pool_maxsize",
+        description="Максимальное количество keep-alive соединений в пуле для одного хоста."
+    )
+
+    sla_response_ms: float = Field(
+        default=2000,
+        alias="sla_response_ms",
+        description="Допустимое время одного запроса к API, мс."
+    )
+
+    sla_p95_ms: float = Field(
+        default=1000,
+        alias="sla_p95_ms",
+        description="Бюджет 95-го перцентиля времени ответа для пачки запросов, мс."
+    )
+
+    sla_p99_ms: float = Field(
+        default=2000,
+        alias="sla_p99_ms",
+        description="Бюджет 99-го перцентиля времени ответа для пачки запросов, мс."
+    )
+
+    token_ttl_seconds: float = Field(
+        default=3600,
+        alias="token_ttl_seconds",
+        description="Время жизни сессионного токена, если сервер не передал срок действия cookie, с."
+    )
+
+    token_refresh_margin_seconds: float = Field(
+        default=60,
+        alias="token_refresh_margin_seconds",
+        description="За сколько секунд до истечения сессионный токен обновляется в фоне."
+    )
+
+    request_timeout_seconds: float = Field(
+        default=20,
+        alias="request_timeout_seconds",
+        description="Таймаут чтения ответа на HTTP-запрос, с."
+    )
+
+    connect_timeout_seconds: float = Field(
+        default=3,
+        alias="connect_timeout_seconds",
+        description="Таймаут установки соединения, с (не больше таймаута чтения)."
+    )
+
+    request_deadline_seconds: float = Field(
+        default=30,
+        alias="request_deadline_seconds",
+        description="Общий срок запроса вместе с повторами, с: повтор не начинается, если срок истёк."
+    )
+
+    retry_max_attempts: int = Field(
+        default=3,
+        alias="retry_max_attempts",
+        description="Максимальное количество попыток запроса (1 - без повторов)."
+    )
+
+    retry_backoff_ms: float = Field(
+        default=100,
+        alias="retry_backoff_ms",
+        description="Базовая пауза перед повтором запроса (удваивается с каждым повтором, с джиттером), мс."
+    )
+
+    retry_backoff_max_ms: float = Field(
+        default=2000,
+        alias="retry_backoff_max_ms",
+        description="Максимальная пауза перед повтором запроса, мс."
+    )
+
+    retry_budget_ratio: float = Field(
+        default=0.1,
+        alias="retry_budget_ratio",
+        description="Бюджет повторов: доля от количества исходных запросов процесса."
+    )
+
+    hedge_get_requests: bool = Field(
+        default=False,
+        alias="hedge_get_requests",
+        description="Отправлять повторный (хеджирующий) GET-запрос, если ответ не получен за p95 эндпоинта."
+    )
+
+    hedge_delay_ms: float | None = Field(
+        default=None,
+        alias="hedge_delay_ms",
+        description="Фиксированная задержка хеджирующего запроса, мс (по умолчанию - p95 эндпоинта)."
+    )
+
+    rate_limit_rps: float = Field(
+        default=0,
+        alias="rate_limit_rps",
+        description="Общее ограничение запросов в секунду на хост для всех воркеров прогона (0 - без ограничения)."
+    )
+
+    rate_limit_burst: float | None = Field(
+        default=None,
+        alias="rate_limit_burst",
+        description="Допустимый всплеск запросов сверх частоты (по умолчанию - RATE_LIMIT_RPS)."
+    )
+
+    rate_limit_max_in_flight: int = Field(
+        default=0,
+        alias="rate_limit_max_in_flight",
+        description="Максимум одновременных запросов к хосту для всех воркеров прогона (0 - без ограничения)."
+    )
+
+    rate_limit_endpoints: dict[str, dict] = Field(
+        default_factory=dict,
+        alias="rate_limit_endpoints",
+        description='Ограничения отдельных эндпоинтов, например {"POST /v1/auth/tokens": {"rps": 2, "max_in_flight": 1}}.'
+    )
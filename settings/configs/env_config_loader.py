@@ -1,3 +1,5 @@
+import io
+import json
 import os
 from dotenv import dotenv_values
 
@@ -17,12 +19,71 @@ class EnvConfigLoader:
         :param env_path: Путь к .env-файлу с настройками.
         :return: Объект ConfigModel, содержащий параметры запуска автотестов.
         """
-        # Загрузка .env переменных
-        values = dotenv_values(env_path)
+        return self.load_values(self.read_values(env_path))
+
+    def read_values(self, env_path: str, password: str | None = None) -> dict:
+        """
+        Читает переменные из .env-файла или зашифрованного .aes-файла.
+
+        .aes-файл расшифровывается в память; открытый текст и расшифрованные
+        значения на диск не пишутся. В прогоне с xdist файл читает только контроллер,
+        воркеры получают значения через workerinput.
+
+        :param env_path: Путь к .env- или .aes-файлу.
+        :param password: Пароль для .aes-файла (по умолчанию - TEST_CONFIG_PASSWORD).
+        :return: Словарь переменных.
+        """
+        if not env_path.endswith(".aes"):
+            return dict(dotenv_values(env_path))
+
+        password = password or os.getenv("TEST_CONFIG_PASSWORD")
+        if not password:
+            raise EnvironmentError("Не задан TEST_CONFIG_PASSWORD для расшифровки .aes-файла")
+
+        from settings.encryption.encryption import decrypt_file_to_memory
+
+        try:
+            content = decrypt_file_to_memory(env_path, password)
+        except Exception as e:
+            raise RuntimeError(f"Ошибка при расшифровке файла {env_path}: {e}") from e
+
+        return dict(dotenv_values(stream=io.StringIO(content.decode("utf-8"))))
+
+    def load_values(self, values: dict) -> ConfigModel:
+        """
+        Формирует объект ConfigModel из уже прочитанных переменных.
+
+        :param values: Словарь переменных .env-файла.
+        :return: Объект ConfigModel, содержащий параметры запуска автотестов.
+        """
         for key, value in values.items():
             os.environ[key] = value  # Экспорт в переменные окружения
 
+        def get(key: str, default=None):
+            # Значение по умолчанию - только для отсутствующей или пустой переменной: явный 0 сохраняется
+            value = values.get(key)
+            return default if value is None or value == "" else value
+
         # Итоговый объект конфигурации
         return ConfigModel(
-            base_url=values.get("BASE_URL")
+            base_url=get("BASE_URL"),
+            http_pool_maxsize=get("HTTP_POOL_MAXSIZE", 10),
+            sla_response_ms=get("SLA_RESPONSE_MS", 2000),
+            sla_p95_ms=get("SLA_P95_MS", 1000),
+            sla_p99_ms=get("SLA_P99_MS", 2000),
+            token_ttl_seconds=get("TOKEN_TTL_SECONDS", 3600),
+            token_refresh_margin_seconds=get("TOKEN_REFRESH_MARGIN_SECONDS", 60),
+            request_timeout_seconds=get("REQUEST_TIMEOUT_SECONDS", 20),
+            connect_timeout_seconds=get("CONNECT_TIMEOUT_SECONDS", 3),
+            request_deadline_seconds=get("REQUEST_DEADLINE_SECONDS", 30),
+            retry_max_attempts=get("RETRY_MAX_ATTEMPTS", 3),
+            retry_backoff_ms=get("RETRY_BACKOFF_MS", 100),
+            retry_backoff_max_ms=get("RETRY_BACKOFF_MAX_MS", 2000),
+            retry_budget_ratio=get("RETRY_BUDGET_RATIO", 0.1),
+            hedge_get_requests=get("HEDGE_GET_REQUESTS", False),
+            hedge_delay_ms=get("HEDGE_DELAY_MS"),
+            rate_limit_rps=get("RATE_LIMIT_RPS", 0),
+            rate_limit_burst=get("RATE_LIMIT_BURST"),
+            rate_limit_max_in_flight=get("RATE_LIMIT_MAX_IN_FLIGHT", 0),
+            rate_limit_endpoints=json.loads(get("RATE_LIMIT_ENDPOINTS", "{}")),
         )
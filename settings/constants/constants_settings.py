@@ -9,8 +9,13 @@ class Paths:
 
     ROOT_DIR = Path(__file__).resolve().parent.parent.parent
     LOGS_ROOT = ROOT_DIR / "logs"
+    CACHE = LOGS_ROOT / ".cache"  # Общее состояние прогона для воркеров xdist (токены и т.п.)
     REPORTS = LOGS_ROOT / "reports"  # Папка для отчётов (общая)
     REPORTS_HTML = REPORTS / "html"  # Папка для pytest-html отчётов
+    REPORTS_LOAD = REPORTS / "load"  # Папка для отчётов нагрузочных прогонов
+    REQUEST_METRICS = REPORTS / "request_metrics.json"  # Сводка замеров HTTP-запросов (--requestMetrics)
+    DURATIONS = LOGS_ROOT / "durations.json"  # Длительности тестов для распределения по воркерам и шардам
+    RUN_LOG = LOGS_ROOT / "pytest.jsonl"  # Журнал прогона (JSON Lines, все воркеры)
 
     # Allure
     ALLURE_RESULTS = REPORTS / "allure-results"  # Сырые результаты allure (json/attachments)
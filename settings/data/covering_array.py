@@ -0,0 +1,170 @@
+"""Покрывающие наборы (pairwise и t-wise) для параметризации тестов по классам значений полей."""
+import math
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Iterator, Sequence
+
+
+@dataclass(frozen=True)
+class ValueClass:
+    """
+    Класс эквивалентности значения поля: название (попадает в id теста), представитель класса
+    и признак допустимости значения.
+    """
+    name: str
+    value: Any = None
+    valid: bool = True
+
+
+@dataclass(frozen=True)
+class CoveringCase:
+    """
+    Набор значений полей одного теста.
+    """
+    classes: tuple[tuple[str, ValueClass], ...]
+
+    @property
+    def id(self) -> str:
+        return "-".join(f"{field}={value_class.name}" for field, value_class in self.classes)
+
+    @property
+    def values(self) -> dict[str, Any]:
+        return {field: value_class.value for field, value_class in self.classes}
+
+    @property
+    def valid(self) -> bool:
+        return all(value_class.valid for _, value_class in self.classes)
+
+    @property
+    def invalid_fields(self) -> list[str]:
+        return [field for field, value_class in self.classes if not value_class.valid]
+
+
+@dataclass
+class CoverageReport:
+    """
+    Итоги построения покрывающего набора.
+    """
+    name: str
+    strength: int
+    cases: int
+    full_product: int
+
+    @property
+    def saved(self) -> int:
+        return self.full_product - self.cases
+
+    def format(self) -> str:
+        share = self.saved / self.full_product * 100 if self.full_product else 0.0
+        return (
+            f"{self.name}: {self.strength}-wise покрытие - {self.cases} из {self.full_product} комбинаций "
+            f"(сэкономлено {self.saved}, {share:.1f}%)"
+        )
+
+
+class CoveringArray:
+    """
+    Покрывающий набор силы `strength`: каждая комбинация классов любых `strength` полей
+    встречается хотя бы в одном наборе значений.
+
+    Наборы строятся жадно (по одному, по мере итерации): очередной набор начинается с первой
+    непокрытой комбинации, остальные поля получают класс, покрывающий больше всего ещё
+    не покрытых комбинаций с уже выбранными полями (при равенстве - первый по порядку).
+    Случайность не используется, поэтому результат одинаков во всех процессах и прогонах.
+
+    При `max_invalid` в набор попадает не больше указанного количества недопустимых классов:
+    сервис обычно сообщает только о первой ошибке, и остальные недопустимые значения набора
+    оставались бы непроверенными. Поле только с недопустимыми классами занимает место в каждом
+    наборе: комбинации, которые вместе с такими полями превышают `max_invalid`, не строятся.
+    """
+
+    def __init__(self, fields: dict[str, Sequence[ValueClass]], strength: int = 2, max_invalid: int | None = None):
+        """
+        :param fields: Классы значений по полям (порядок полей сохраняется в наборах и id).
+        :param strength: Сила покрытия (2 - pairwise); ограничивается количеством полей.
+        :param max_invalid: Максимальное количество недопустимых классов в наборе (None - без ограничения).
+        :raises ValueError: Если у поля нет классов, сила покрытия меньше 1 или полей только
+            с недопустимыми классами больше `max_invalid`.
+        """
+        if not fields or not all(fields.values()):
+            raise ValueError("Для каждого поля нужен хотя бы один класс значений.")
+        if strength < 1:
+            raise ValueError("Сила покрытия должна быть не меньше 1.")
+        self.names = list(fields)
+        self.classes = [list(classes) for classes in fields.values()]
+        self.strength = min(strength, len(self.names))
+        self.max_invalid = max_invalid
+        self.cases = 0
+        self._always_invalid = {
+            field for field, classes in enumerate(self.classes) if not any(value_class.valid for value_class in classes)
+        }
+        if max_invalid is not None and len(self._always_invalid) > max_invalid:
+            raise ValueError(
+                f"Полей только с недопустимыми классами ({len(self._always_invalid)}) больше max_invalid={max_invalid}."
+            )
+
+    @property
+    def full_product(self) -> int:
+        return math.prod(len(classes) for classes in self.classes)
+
+    def _invalid(self, assignment) -> int:
+        return sum(not self.classes[field][index].valid for field, index in assignment)
+
+    def _spare_invalid(self, assignment) -> int | None:
+        """
+        Сколько ещё недопустимых классов можно добавить к частичному набору с учётом полей,
+        у которых нет допустимых классов (None - без ограничения).
+        """
+        if self.max_invalid is None:
+            return None
+        fields = {field for field, _ in assignment}
+        return self.max_invalid - self._invalid(assignment) - len(self._always_invalid - fields)
+
+    def _required(self) -> set[tuple]:
+        required = set()
+        for fields in combinations(range(len(self.names)), self.strength):
+            combos = [()]
+            for field in fields:
+                combos = [combo + ((field, index),) for combo in combos for index in range(len(self.classes[field]))]
+            required.update(combo for combo in combos if self.max_invalid is None or self._spare_invalid(combo) >= 0)
+        return required
+
+    def _gain(self, uncovered: set[tuple], row: dict[int, int], field: int, index: int) -> int:
+        gain = 0
+        for others in combinations(sorted(row), self.strength - 1):
+            combo = tuple(sorted([(other, row[other]) for other in others] + [(field, index)]))
+            gain += combo in uncovered
+        return gain
+
+    def __iter__(self) -> Iterator[CoveringCase]:
+        uncovered = self._required()
+        self.cases = 0
+        while uncovered:
+            row = dict(min(uncovered))
+            spare = self._spare_invalid(row.items())
+            for field in range(len(self.names)):
+                if field in row:
+                    continue
+                # Место для полей только с недопустимыми классами уже учтено в `spare`
+                always_invalid = field in self._always_invalid
+                candidates = [
+                    index for index, value_class in enumerate(self.classes[field])
+                    if value_class.valid or always_invalid or spare is None or spare > 0
+                ]
+                row[field] = max(candidates, key=lambda index: (self._gain(uncovered, row, field, index), -index))
+                if spare is not None and not always_invalid and not self.classes[field][row[field]].valid:
+                    spare -= 1
+
+            assignment = sorted(row.items())
+            uncovered.difference_update(combinations(assignment, self.strength))
+            self.cases += 1
+            yield CoveringCase(
+                classes=tuple((self.names[field], self.classes[field][index]) for field, index in assignment)
+            )
+
+    def report(self, name: str) -> CoverageReport:
+        """
+        :param name: Название набора в отчёте (например, node id теста).
+        :return: Количество построенных наборов относительно полного перебора.
+        """
+        return CoverageReport(name=name, strength=self.strength, cases=self.cases, full_product=self.full_product)
@@ -1,3 +1,4 @@
+import io
 import os
 import pyAesCrypt
 
@@ -46,6 +47,23 @@ def decrypt_file(filepath: str, password: str):
         print(f"Зашифрованный файл удалён: {input_path}")
 
 
+def decrypt_file_to_memory(filepath: str, password: str) -> bytes:
+    """
+    Расшифровывает .aes-файл в память, не записывая открытый текст на диск.
+
+    :param filepath: Путь к .aes-файлу.
+    :param password: Пароль.
+    :return: Расшифрованное содержимое файла.
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"Файл для расшифровки не найден: {filepath}")
+
+    decrypted = io.BytesIO()
+    with open(filepath, "rb") as encrypted:
+        pyAesCrypt.decryptStream(encrypted, decrypted, password, BUFFER_SIZE)
+    return decrypted.getvalue()
+
+
 if __name__ == "__main__":
     target_path = os.path.join(CONFIG_DIR, FILENAME)
 
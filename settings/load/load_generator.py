@@ -0,0 +1,241 @@
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator
+
+import requests
+
+from settings.constants.constants_settings import Paths
+from settings.metrics.latency import LatencyHistogram
+
+PHASES = ("ramp_up", "steady", "ramp_down")
+
+
+@dataclass
+class LoadProfile:
+    """
+    Профиль нагрузки: линейный разгон до целевой интенсивности, плато и линейное снижение.
+    """
+    target_rps: float
+    ramp_up: float = 0.0
+    steady: float = 60.0
+    ramp_down: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.ramp_up + self.steady + self.ramp_down
+
+    @property
+    def expected_requests(self) -> int:
+        return int(self.target_rps * (self.ramp_up / 2 + self.steady + self.ramp_down / 2))
+
+    def schedule(self) -> Iterator[tuple[float, str]]:
+        """
+        Формирует плановое время отправки каждого запроса.
+
+        Время k-го запроса - момент, когда интеграл интенсивности достигает k,
+        поэтому расписание не зависит от времени ответа сервера (open-loop).
+
+        :return: Итератор пар (смещение от начала прогона в секундах, фаза).
+        """
+        rate = self.target_rps
+        if rate <= 0:
+            return
+
+        ramp_up_total = rate * self.ramp_up / 2
+        steady_total = rate * self.steady
+        ramp_down_total = rate * self.ramp_down / 2
+
+        index = 0
+        while index < ramp_up_total:
+            yield math.sqrt(2 * index * self.ramp_up / rate), "ramp_up"
+            index += 1
+
+        while index < ramp_up_total + steady_total:
+            yield self.ramp_up + (index - ramp_up_total) / rate, "steady"
+            index += 1
+
+        while index < ramp_up_total + steady_total + ramp_down_total:
+            done = index - ramp_up_total - steady_total
+            offset = self.ramp_down * (1 - math.sqrt(max(1 - 2 * done / (rate * self.ramp_down), 0.0)))
+            yield self.ramp_up + self.steady + offset, "ramp_down"
+            index += 1
+
+
+class LoadReport:
+    """
+    Итоги нагрузочного прогона: пропускная способность, ошибки по статус-кодам и перцентили задержек.
+    """
+
+    def __init__(self, profile: LoadProfile, virtual_users: int):
+        self.profile = profile
+        self.virtual_users = virtual_users
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.sent = 0
+        self.statuses: dict[str, int] = {}
+        self.histograms = {phase: LatencyHistogram() for phase in PHASES}
+        self.max_schedule_lag_ms = 0.0
+
+    def record(self, phase: str, status: str, latency_ms: float):
+        """
+        Учитывает завершённый запрос.
+
+        :param phase: Фаза профиля нагрузки.
+        :param status: HTTP статус-код или имя исключения.
+        :param latency_ms: Задержка от планового времени отправки до получения ответа.
+        """
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.histograms[phase].record(latency_ms)
+
+    @property
+    def completed(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def errors(self) -> dict[str, int]:
+        return {
+            status: count for status, count in self.statuses.items()
+            if not status.isdigit() or int(status) >= 400
+        }
+
+    def to_dict(self) -> dict:
+        elapsed = (self.finished_at or 0) - (self.started_at or 0)
+        total = LatencyHistogram()
+        for histogram in self.histograms.values():
+            total.merge(histogram)
+
+        completed = self.completed
+        error_count = sum(self.errors.values())
+        return {
+            "profile": {
+                "target_rps": self.profile.target_rps,
+                "ramp_up_s": self.profile.ramp_up,
+                "steady_s": self.profile.steady,
+                "ramp_down_s": self.profile.ramp_down,
+                "virtual_users": self.virtual_users,
+            },
+            "elapsed_s": round(elapsed, 3),
+            "sent": self.sent,
+            "completed": completed,
+            "throughput_rps": round(completed / elapsed, 2) if elapsed > 0 else None,
+            "error_rate": round(error_count / completed, 4) if completed else None,
+            "statuses": dict(sorted(self.statuses.items())),
+            "max_schedule_lag_ms": round(self.max_schedule_lag_ms, 3),
+            "latency_ms": total.summary(),
+            "latency_ms_by_phase": {
+                phase: histogram.summary() for phase, histogram in self.histograms.items() if histogram.total
+            },
+        }
+
+    def format(self) -> str:
+        """
+        Формирует текстовый отчёт для вывода в консоль.
+        """
+        data = self.to_dict()
+        latency = data["latency_ms"]
+        lines = [
+            f"Запросов отправлено: {data['sent']}, завершено: {data['completed']} за {data['elapsed_s']} с",
+            f"Пропускная способность: {data['throughput_rps']} rps (цель {self.profile.target_rps} rps)",
+            f"Доля ошибок: {data['error_rate']}",
+            "Статус-коды: " + ", ".join(f"{status}={count}" for status, count in data["statuses"].items()),
+            "Задержка, мс: " + ", ".join(
+                f"{name.removesuffix('_ms')}={value}" for name, value in latency.items()
+                if name.startswith("p")
+            ),
+            f"Максимальное отставание от расписания: {data['max_schedule_lag_ms']} мс",
+        ]
+        return "\n".join(lines)
+
+    def save(self, directory: Path = Paths.REPORTS_LOAD) -> Path:
+        """
+        Сохраняет отчёт в JSON.
+
+        :param directory: Папка для отчётов.
+        :return: Путь к файлу отчёта.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"load_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+class LoadGenerator:
+    """
+    Open-loop генератор нагрузки поверх async-методов API.
+
+    Запросы запускаются строго по расписанию `LoadProfile`, не дожидаясь ответов
+    на предыдущие, а задержка считается от планового времени отправки. Поэтому
+    ожидание в очереди клиента и замедление сервера попадают в перцентили
+    (нет coordinated omission). Запросы по кругу распределяются между
+    виртуальными пользователями, у каждого из которых свой токен.
+    """
+
+    def __init__(
+        self,
+        request_factory: Callable[[str], Awaitable[requests.Response]],
+        tokens: list[str],
+        profile: LoadProfile,
+    ):
+        """
+        :param request_factory: Функция, принимающая токен пользователя и возвращающая корутину запроса.
+        :param tokens: Токены виртуальных пользователей.
+        :param profile: Профиль нагрузки.
+        """
+        if not tokens:
+            raise ValueError("Нужен хотя бы один виртуальный пользователь.")
+
+        self.request_factory = request_factory
+        self.tokens = tokens
+        self.profile = profile
+        self.report = LoadReport(profile=profile, virtual_users=len(tokens))
+
+    async def _fire(self, intended: float, phase: str, token: str):
+        loop = asyncio.get_running_loop()
+        try:
+            response = await self.request_factory(token)
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        self.report.record(phase=phase, status=status, latency_ms=(loop.time() - intended) * 1000)
+
+    async def run_async(self) -> LoadReport:
+        """
+        Выполняет прогон на текущем event loop.
+
+        :return: Итоговый отчёт.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = set()
+
+        start = loop.time()
+        self.report.started_at = time.time()
+        for index, (offset, phase) in enumerate(self.profile.schedule()):
+            intended = start + offset
+            delay = intended - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.report.max_schedule_lag_ms = max(self.report.max_schedule_lag_ms, -delay * 1000)
+
+            task = asyncio.create_task(self._fire(intended, phase, self.tokens[index % len(self.tokens)]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            self.report.sent += 1
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        self.report.finished_at = time.time()
+        return self.report
+
+    def run(self) -> LoadReport:
+        """
+        Выполняет прогон в новом event loop.
+
+        :return: Итоговый отчёт.
+        """
+        return asyncio.run(self.run_async())
@@ -0,0 +1,119 @@
+"""Сводка производительности API по эндпоинтам для html-отчёта pytest и Allure."""
+import html
+from urllib.parse import quote
+
+from allure_commons import plugin_manager
+from allure_commons.model2 import ATTACHMENT_PATTERN, Attachment, Label, Status, TestResult
+from allure_commons.utils import md5, now, uuid4
+
+DASHBOARD_TITLE = "Производительность API"
+SLOWEST_LIMIT = 15
+
+_STYLE = """
+<style>
+.api-dashboard table { border-collapse: collapse; margin: 8px 0 16px; font-size: 13px; }
+.api-dashboard th, .api-dashboard td { border: 1px solid #ddd; padding: 3px 8px; text-align: right; }
+.api-dashboard th:first-child, .api-dashboard td:first-child { text-align: left; }
+.api-dashboard .errors { color: #c0392b; font-weight: bold; }
+.api-dashboard .histogram { display: flex; align-items: flex-end; gap: 1px; height: 28px; }
+.api-dashboard .histogram span { width: 7px; background: #4a90d9; }
+.api-dashboard .histogram span.empty { background: #eee; height: 1px; }
+</style>
+"""
+
+
+def _ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _histogram(buckets: list) -> str:
+    peak = max((count for _, count in buckets), default=0)
+    lower = 0
+    bars = []
+    for upper, count in buckets:
+        label = f"{lower}-{upper} мс" if upper is not None else f"> {lower} мс"
+        if count:
+            height = max(round(count / peak * 28), 2)
+            bars.append(f'<span style="height:{height}px" title="{label}: {count}"></span>')
+        else:
+            bars.append(f'<span class="empty" title="{label}: 0"></span>')
+        lower = upper
+    return f'<div class="histogram">{"".join(bars)}</div>'
+
+
+def _test_cell(item: dict, link_tests: bool) -> str:
+    test_id = item.get("test_id")
+    if not test_id:
+        return html.escape(item.get("test_name") or "-")
+    if link_tests:
+        # В html-отчёте pytest строка теста имеет id, равный node id
+        return f'<a href="#{html.escape(quote(test_id, safe=":/[]"))}">{html.escape(test_id)}</a>'
+    return html.escape(test_id)
+
+
+def render_dashboard(summary: dict, link_tests: bool = True) -> str:
+    """
+    Формирует HTML-фрагмент сводки: таблица эндпоинтов (вызовы, ошибки, пропускная способность,
+    перцентили времени ответа, гистограмма) и самые медленные вызовы со ссылками на тесты.
+
+    :param summary: Сводка `RequestMetricsCollector.summary`.
+    :param link_tests: Ссылаться на строки тестов html-отчёта pytest.
+    :return: HTML-фрагмент.
+    """
+    rows = []
+    slowest = []
+    for key, stats in summary["endpoints"].items():
+        total = stats["total_ms"]
+        error_rate = stats["error_rate"] or 0
+        rows.append(
+            f"<tr><td>{html.escape(key)}</td><td>{stats['count']}</td>"
+            f'<td class="{"errors" if error_rate else ""}">{error_rate * 100:.1f}</td>'
+            f"<td>{'-' if stats['throughput_rps'] is None else stats['throughput_rps']}</td>"
+            f"<td>{_ms(total['p50_ms'])}</td><td>{_ms(total['p90_ms'])}</td><td>{_ms(total['p99_ms'])}</td>"
+            f"<td>{_ms(total['max_ms'])}</td><td>{_histogram(stats['histogram_ms'])}</td></tr>"
+        )
+        slowest.extend((item, key) for item in stats["slowest"])
+
+    slowest.sort(key=lambda entry: entry[0]["total_ms"], reverse=True)
+    slow_rows = [
+        f"<tr><td>{html.escape(key)}</td><td>{item['status']}</td><td>{_ms(item['total_ms'])}</td>"
+        f"<td>{_ms(item.get('ttfb_ms'))}</td><td>{_test_cell(item, link_tests)}</td></tr>"
+        for item, key in slowest[:SLOWEST_LIMIT]
+    ]
+
+    return (
+        f'{_STYLE}<div class="api-dashboard"><h2>{DASHBOARD_TITLE}</h2>'
+        "<table><tr><th>Эндпоинт</th><th>Вызовов</th><th>Ошибок, %</th><th>Запросов/с</th>"
+        "<th>p50, мс</th><th>p90, мс</th><th>p99, мс</th><th>max, мс</th><th>Гистограмма</th></tr>"
+        f"{''.join(rows)}</table>"
+        "<h3>Самые медленные вызовы</h3>"
+        "<table><tr><th>Эндпоинт</th><th>Статус</th><th>total, мс</th><th>TTFB, мс</th><th>Тест</th></tr>"
+        f"{''.join(slow_rows)}</table></div>"
+    )
+
+
+def report_dashboard_to_allure(summary: dict):
+    """
+    Добавляет в результаты Allure отдельный результат «Производительность API» со сводкой во вложении.
+    Результат проходит через зарегистрированный логгер Allure (в том числе буферизованный).
+
+    :param summary: Сводка `RequestMetricsCollector.summary`.
+    """
+    page = f'<html><head><meta charset="utf-8"></head><body>{render_dashboard(summary, link_tests=False)}</body></html>'
+    attachment_uuid = uuid4()
+    file_name = ATTACHMENT_PATTERN.format(prefix=attachment_uuid, ext="html")
+    plugin_manager.hook.report_attached_data(body=page.encode("utf-8"), file_name=file_name)
+
+    timestamp = now()
+    result = TestResult(
+        uuid=uuid4(),
+        name=DASHBOARD_TITLE,
+        fullName="api_performance_dashboard",
+        historyId=md5("api_performance_dashboard"),
+        status=Status.PASSED,
+        start=timestamp,
+        stop=timestamp,
+        labels=[Label(name="suite", value="Отчёты"), Label(name="feature", value=DASHBOARD_TITLE)],
+        attachments=[Attachment(name=DASHBOARD_TITLE, source=file_name, type="text/html")],
+    )
+    plugin_manager.hook.report_result(result=result)
@@ -0,0 +1,170 @@
+import bisect
+import math
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """
+    Вычисляет перцентиль по методу nearest-rank.
+
+    :param values: Значения (порядок не важен).
+    :param percent: Перцентиль в диапазоне (0; 100].
+    :return: Значение перцентиля или None, если значений нет.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в стиле HDR Histogram.
+
+    Значения хранятся в микросекундах в лог-линейных корзинах: относительная
+    погрешность не превышает 1 / 2^(significant_bits - 1) (для 7 бит - менее 1.6%)
+    во всём диапазоне значений, а объём памяти не зависит от количества замеров.
+    Гистограммы можно объединять (например, данные разных воркеров xdist).
+    """
+
+    def __init__(self, significant_bits: int = 7):
+        """
+        :param significant_bits: Количество значащих бит мантиссы корзины.
+        """
+        self.significant_bits = significant_bits
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: int | None = None
+        self.max_us: int | None = None
+
+    def _bucket_key(self, value_us: int) -> int:
+        """
+        Возвращает ключ корзины; порядок ключей совпадает с порядком значений.
+        """
+        shift = max(value_us.bit_length() - self.significant_bits, 0)
+        return (shift << 32) | (value_us >> shift)
+
+    @staticmethod
+    def _bucket_upper_us(key: int) -> int:
+        """
+        Возвращает наибольшее значение (мкс), попадающее в корзину.
+        """
+        shift = key >> 32
+        mantissa = key & 0xFFFFFFFF
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1):
+        """
+        Добавляет замер в гистограмму.
+
+        :param value_ms: Задержка в миллисекундах.
+        :param count: Количество одинаковых замеров.
+        """
+        value_us = max(int(value_ms * 1000), 0)
+        key = self._bucket_key(value_us)
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.total += count
+        self.sum_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = value_us if self.max_us is None else max(self.max_us, value_us)
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Возвращает перцентиль задержки в миллисекундах (верхняя граница корзины).
+
+        :param percent: Перцентиль в диапазоне (0; 100].
+        :return: Значение в мс или None, если замеров нет.
+        """
+        if not self.total:
+            return None
+
+        rank = max(math.ceil(percent / 100 * self.total), 1)
+        accumulated = 0
+        for key in sorted(self.counts):
+            accumulated += self.counts[key]
+            if accumulated >= rank:
+                return min(self._bucket_upper_us(key), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Добавляет в гистограмму замеры другой гистограммы с тем же `significant_bits`.
+
+        :param other: Объединяемая гистограмма.
+        """
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("Нельзя объединить гистограммы с разной точностью.")
+
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        for value in (other.min_us, other.max_us):
+            if value is None:
+                continue
+            self.min_us = value if self.min_us is None else min(self.min_us, value)
+            self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """
+        Возвращает непустые корзины в порядке возрастания.
+
+        :return: Список пар (верхняя граница корзины в мс, количество замеров).
+        """
+        return [(self._bucket_upper_us(key) / 1000, self.counts[key]) for key in sorted(self.counts)]
+
+    def coarse_buckets(self, bounds_ms: tuple) -> list[tuple[float | None, int]]:
+        """
+        Группирует замеры по укрупнённым интервалам (например, для отображения гистограммы в отчёте).
+
+        :param bounds_ms: Верхние границы интервалов в мс по возрастанию.
+        :return: Список пар (верхняя граница интервала в мс или None для последнего, количество замеров).
+        """
+        counts = [0] * (len(bounds_ms) + 1)
+        for upper_ms, count in self.buckets():
+            counts[bisect.bisect_left(bounds_ms, upper_ms)] += count
+        return list(zip((*bounds_ms, None), counts))
+
+    def summary(self, percents: tuple = (50, 90, 99, 99.9)) -> dict:
+        """
+        Формирует сводку по гистограмме.
+
+        :param percents: Перцентили, попадающие в сводку.
+        :return: Словарь с количеством, min/mean/max и перцентилями в мс.
+        """
+        result = {
+            "count": self.total,
+            "min_ms": self.min_us / 1000 if self.min_us is not None else None,
+            "mean_ms": round(self.sum_us / self.total / 1000, 3) if self.total else None,
+            "max_ms": self.max_us / 1000 if self.max_us is not None else None,
+        }
+        for percent in percents:
+            result[f"p{percent:g}_ms"] = self.percentile(percent)
+        return result
+
+    def to_state(self) -> dict:
+        """
+        Сериализует гистограмму в словарь (например, для передачи между процессами).
+        """
+        return {
+            "significant_bits": self.significant_bits,
+            "counts": {str(key): count for key, count in self.counts.items()},
+            "total": self.total,
+            "sum_us": self.sum_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "LatencyHistogram":
+        """
+        Восстанавливает гистограмму из словаря `to_state`.
+        """
+        histogram = cls(significant_bits=state["significant_bits"])
+        histogram.counts = {int(key): count for key, count in state["counts"].items()}
+        histogram.total = state["total"]
+        histogram.sum_us = state["sum_us"]
+        histogram.min_us = state["min_us"]
+        histogram.max_us = state["max_us"]
+        return histogram
@@ -0,0 +1,300 @@
+import heapq
+import itertools
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from settings.metrics.latency import LatencyHistogram
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Границы интервалов гистограммы времени ответа в сводке, мс
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """
+    Ключ эндпоинта для агрегации: метод и путь с заменой числовых идентификаторов на {id}.
+    """
+    return f"{method} {_ID_SEGMENT.sub('/{id}', endpoint)}"
+
+
+@dataclass
+class RequestTiming:
+    """
+    Замеры одного HTTP-запроса.
+    """
+    method: str
+    endpoint: str
+    url: str
+    status: int | None
+    total_ms: float
+    ttfb_ms: float | None = None
+    connect_ms: float | None = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    test_name: str | None = None
+    test_id: str | None = None
+    started_at: float = 0.0
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def new_connection(self) -> bool:
+        return self.connect_ms is not None
+
+    @property
+    def endpoint_key(self) -> str:
+        """
+        Ключ эндпоинта для агрегации: метод и путь с заменой числовых идентификаторов на {id}.
+        """
+        return endpoint_key(self.method, self.endpoint)
+
+    def phases(self) -> str:
+        """
+        Возвращает разбивку по фазам запроса для сообщений об ошибках.
+        """
+        connect = f"{self.connect_ms:.1f} ms" if self.connect_ms is not None else "reused"
+        ttfb = f"{self.ttfb_ms:.1f} ms" if self.ttfb_ms is not None else "-"
+        return f"connect={connect}, ttfb={ttfb}, total={self.total_ms:.1f} ms"
+
+    def to_dict(self) -> dict:
+        # Без глубокого копирования `asdict`: словарь пишется в журнал и отчёты, а не изменяется
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data["extra"] = dict(self.extra)
+        data["new_connection"] = self.new_connection
+        return data
+
+
+class EndpointStats:
+    """
+    Агрегированные замеры одного эндпоинта.
+    """
+
+    slowest_limit = 10
+    _sequence = itertools.count()
+
+    def __init__(self):
+        self.count = 0
+        self.statuses: dict[str, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.rate_limit_waits = 0
+        self.rate_limit_wait_ms = 0.0
+        self.first_started_at: float | None = None
+        self.last_finished_at: float | None = None
+        self.total = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.connect = LatencyHistogram()
+        self.slowest: list[tuple[float, int, dict]] = []
+
+    def record(self, timing: RequestTiming):
+        self.count += 1
+        status = str(timing.status)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.request_bytes += timing.request_bytes
+        self.response_bytes += timing.response_bytes
+        if timing.extra:
+            self.retries += len(timing.extra.get("retries", ()))
+            self.hedged += bool(timing.extra.get("hedged"))
+            self.hedge_wins += bool(timing.extra.get("hedge_won"))
+            if "rate_limit_wait_ms" in timing.extra:
+                self.rate_limit_waits += 1
+                self.rate_limit_wait_ms += timing.extra["rate_limit_wait_ms"]
+
+        finished_at = timing.started_at + timing.total_ms / 1000
+        if self.first_started_at is None or timing.started_at < self.first_started_at:
+            self.first_started_at = timing.started_at
+        if self.last_finished_at is None or finished_at > self.last_finished_at:
+            self.last_finished_at = finished_at
+
+        self.total.record(timing.total_ms)
+        if timing.ttfb_ms is not None:
+            self.ttfb.record(timing.ttfb_ms)
+        if timing.connect_ms is not None:
+            self.connect.record(timing.connect_ms)
+
+        self._push_slowest(timing.to_dict())
+
+    def _push_slowest(self, item: dict):
+        """
+        Сохраняет вызов, если он входит в число самых медленных.
+        """
+        entry = (item["total_ms"], next(self._sequence), item)
+        if len(self.slowest) < self.slowest_limit:
+            heapq.heappush(self.slowest, entry)
+        elif entry[0] > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items() if not status.isdigit() or int(status) >= 400)
+
+    def merge_state(self, state: dict):
+        """
+        Добавляет агрегаты, полученные из `to_state` другого процесса.
+        """
+        self.count += state["count"]
+        for status, count in state["statuses"].items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.request_bytes += state["request_bytes"]
+        self.response_bytes += state["response_bytes"]
+        self.retries += state.get("retries", 0)
+        self.hedged += state.get("hedged", 0)
+        self.hedge_wins += state.get("hedge_wins", 0)
+        self.rate_limit_waits += state.get("rate_limit_waits", 0)
+        self.rate_limit_wait_ms += state.get("rate_limit_wait_ms", 0.0)
+
+        for name in ("first_started_at", "last_finished_at"):
+            value = state[name]
+            current = getattr(self, name)
+            if value is None:
+                continue
+            if current is None:
+                setattr(self, name, value)
+            else:
+                setattr(self, name, min(current, value) if name == "first_started_at" else max(current, value))
+
+        self.total.merge(LatencyHistogram.from_state(state["total"]))
+        self.ttfb.merge(LatencyHistogram.from_state(state["ttfb"]))
+        self.connect.merge(LatencyHistogram.from_state(state["connect"]))
+
+        for item in state["slowest"]:
+            self._push_slowest(item)
+
+    def to_state(self) -> dict:
+        return {
+            "count": self.count,
+            "statuses": dict(self.statuses),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "rate_limit_waits": self.rate_limit_waits,
+            "rate_limit_wait_ms": self.rate_limit_wait_ms,
+            "first_started_at": self.first_started_at,
+            "last_finished_at": self.last_finished_at,
+            "total": self.total.to_state(),
+            "ttfb": self.ttfb.to_state(),
+            "connect": self.connect.to_state(),
+            "slowest": [item for _, _, item in self.slowest],
+        }
+
+    @property
+    def throughput_rps(self) -> float | None:
+        """
+        Запросов в секунду за время от начала первого до окончания последнего запроса эндпоинта.
+        """
+        if self.first_started_at is None or self.last_finished_at is None:
+            return None
+        elapsed = self.last_finished_at - self.first_started_at
+        return round(self.count / elapsed, 2) if elapsed > 0 else None
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 4) if self.count else None,
+            "throughput_rps": self.throughput_rps,
+            "statuses": dict(sorted(self.statuses.items())),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+            "hedged_requests": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "rate_limit_waits": self.rate_limit_waits,
+            "rate_limit_wait_ms": round(self.rate_limit_wait_ms, 1),
+            "new_connections": self.connect.total,
+            "total_ms": self.total.summary(),
+            "ttfb_ms": self.ttfb.summary(),
+            "connect_ms": self.connect.summary(),
+            "histogram_ms": self.total.coarse_buckets(HISTOGRAM_BOUNDS_MS),
+            "slowest": [item for _, _, item in sorted(self.slowest, reverse=True)],
+        }
+
+
+class RequestMetricsCollector:
+    """
+    Сборщик замеров HTTP-запросов процесса.
+
+    Хранит только агрегаты по эндпоинтам (гистограммы и самые медленные вызовы),
+    поэтому объём памяти не растёт с количеством запросов. Пока сборщик выключен,
+    `record` не вызывается и накладные расходы сводятся к одной проверке флага.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def record(self, timing: RequestTiming):
+        """
+        Учитывает замеры запроса.
+
+        :param timing: Замеры запроса.
+        """
+        key = timing.endpoint_key
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.record(timing)
+
+    def to_state(self) -> dict:
+        """
+        Сериализует агрегаты (например, для передачи от воркера xdist контроллеру).
+        """
+        with self._lock:
+            return {key: stats.to_state() for key, stats in self.endpoints.items()}
+
+    def merge_state(self, state: dict):
+        """
+        Добавляет агрегаты другого процесса.
+
+        :param state: Результат `to_state`.
+        """
+        with self._lock:
+            for key, endpoint_state in state.items():
+                stats = self.endpoints.get(key)
+                if stats is None:
+                    stats = self.endpoints[key] = EndpointStats()
+                stats.merge_state(endpoint_state)
+
+    def summary(self) -> dict:
+        """
+        Формирует итоговую сводку по всем эндпоинтам.
+        """
+        with self._lock:
+            return {
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+                "endpoints": {key: stats.summary() for key, stats in sorted(self.endpoints.items())},
+            }
+
+    def save_summary(self, path: Path, summary: dict = None) -> Path:
+        """
+        Сохраняет сводку в JSON-файл.
+
+        :param path: Путь к файлу.
+        :param summary: Готовая сводка (`summary`), если она уже сформирована.
+        :return: Путь к файлу.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        summary = self.summary() if summary is None else summary
+        path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+_collector = RequestMetricsCollector()
+
+
+def get_request_metrics() -> RequestMetricsCollector:
+    """
+    Возвращает сборщик замеров HTTP-запросов текущего процесса.
+    """
+    return _collector
@@ -0,0 +1,109 @@
+"""Профиль запуска процесса pytest: время до конфигурации, импорт и сборка тестовых модулей."""
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+import pytest
+
+# Сколько самых долгих тестовых модулей выводится для каждого процесса
+TOP_MODULES = 10
+
+
+@dataclass
+class ModuleProfile:
+    """
+    Замеры одного тестового модуля: импорт (вместе с впервые загруженными зависимостями)
+    и сборка тестов (параметризация, фикстуры, маркеры).
+    """
+    nodeid: str
+    import_ms: float = 0.0
+    collect_ms: float = 0.0
+    new_modules: int = 0
+
+
+@dataclass
+class StartupReport:
+    """
+    Профиль запуска процесса (контроллера или воркера xdist).
+    """
+    worker: str
+    configure_cpu_ms: float
+    startup_cpu_ms: float | None = None
+    collection_ms: float | None = None
+    modules: list[ModuleProfile] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StartupReport":
+        return cls(**{**data, "modules": [ModuleProfile(**module) for module in data["modules"]]})
+
+    def format(self, budget_ms: float | None = None) -> list[str]:
+        startup = "-" if self.startup_cpu_ms is None else f"{self.startup_cpu_ms:.0f} мс"
+        collection = "-" if self.collection_ms is None else f"{self.collection_ms:.1f} мс"
+        line = (
+            f"Запуск {self.worker}: CPU процесса к pytest_configure {self.configure_cpu_ms:.0f} мс, "
+            f"к концу сборки {startup}, сборка {collection}"
+        )
+        if budget_ms is not None and (self.startup_cpu_ms or self.configure_cpu_ms) > budget_ms:
+            line += f" - превышен бюджет {budget_ms:.0f} мс"
+        lines = [line]
+        slowest = sorted(self.modules, key=lambda module: module.import_ms + module.collect_ms, reverse=True)
+        for module in slowest[:TOP_MODULES]:
+            lines.append(
+                f"  {module.nodeid}: импорт {module.import_ms:.1f} мс (новых модулей {module.new_modules}), "
+                f"сборка {module.collect_ms:.1f} мс"
+            )
+        return lines
+
+
+class StartupProfiler:
+    """
+    Плагин pytest: замеряет время запуска процесса.
+
+    Время до `pytest_configure` (интерпретатор, pytest, плагины, conftest) и до конца сборки
+    считается по CPU-времени процесса, поэтому не зависит от того, сколько воркеров делят ядра.
+    Для каждого тестового модуля импорт замеряется отдельно от сборки тестов; количество
+    впервые загруженных модулей показывает, какие зависимости тянет за собой тестовый модуль.
+    """
+
+    def __init__(self, worker: str):
+        """
+        :param worker: Идентификатор процесса (gw0, gw1, ... или main).
+        """
+        self.report = StartupReport(worker=worker, configure_cpu_ms=time.process_time() * 1000)
+        self._collection_started: float | None = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection(self, session):
+        self._collection_started = time.perf_counter()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        if not isinstance(collector, pytest.Module):
+            yield
+            return
+
+        modules_before = len(sys.modules)
+        started = time.perf_counter()
+        try:
+            collector.obj  # Импорт модуля отдельно от сборки его тестов
+        except Exception:
+            pass  # Ошибка импорта повторится при сборке и попадёт в её отчёт
+        imported = time.perf_counter()
+        new_modules = len(sys.modules) - modules_before
+        yield
+        self.report.modules.append(
+            ModuleProfile(
+                nodeid=collector.nodeid,
+                import_ms=(imported - started) * 1000,
+                collect_ms=(time.perf_counter() - imported) * 1000,
+                new_modules=new_modules,
+            )
+        )
+
+    def pytest_collection_finish(self, session):
+        self.report.startup_cpu_ms = time.process_time() * 1000
+        if self._collection_started is not None:
+            self.report.collection_ms = (time.perf_counter() - self._collection_started) * 1000
+
+    def to_dict(self) -> dict:
+        return asdict(self.report)
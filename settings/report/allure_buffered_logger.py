@@ -0,0 +1,182 @@
+"""Буферизованная запись результатов Allure в фоновом потоке."""
+import json
+import os
+import queue
+import threading
+import uuid
+from pathlib import Path
+
+import allure_commons
+from allure_commons import hookimpl
+from allure_commons.logger import AllureFileLogger
+from attr import asdict
+
+_FAILED_STATUSES = ("failed", "broken")
+_STOP = "stop"
+
+
+class BufferedAllureFileLogger:
+    """
+    Замена `AllureFileLogger`: результаты, контейнеры и вложения ставятся в очередь,
+    а сериализуются и пишутся в allure-results фоновым потоком пакетами.
+
+    Вложения удерживаются в памяти до получения результата теста, поэтому в режиме
+    `steps_only_on_failure` шаги успешных тестов и вложения этих шагов не пишутся на диск.
+    """
+
+    def __init__(self, report_dir: Path | str, steps_only_on_failure: bool = False, batch_size: int = 256):
+        """
+        :param report_dir: Директория allure-results.
+        :param steps_only_on_failure: Сохранять шаги (и их вложения) только для упавших тестов.
+        :param batch_size: Максимальное количество элементов очереди, обрабатываемых за один проход.
+        """
+        self.report_dir = Path(report_dir).absolute()
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.steps_only_on_failure = steps_only_on_failure
+        self.batch_size = batch_size
+        self.indent = 4 if os.environ.get("ALLURE_INDENT_OUTPUT") else None
+
+        self.stats = {"files": 0, "discarded_steps": 0, "discarded_attachments": 0}
+        self._queue = queue.SimpleQueue()
+        self._pending_attachments: dict[str, bytes] = {}  # используется только фоновым потоком
+        self._thread = threading.Thread(target=self._run, name="allure-writer", daemon=True)
+        self._thread.start()
+
+    @hookimpl
+    def report_result(self, result):
+        self._submit(("result", result))
+
+    @hookimpl
+    def report_container(self, container):
+        self._submit(("container", container))
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        # Исходный файл читается сразу: к моменту записи он может быть удалён
+        with open(source, "rb") as attached_file:
+            self._submit(("attachment", attached_file.read(), file_name))
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        self._submit(("attachment", body.encode("utf-8") if isinstance(body, str) else body, file_name))
+
+    def close(self):
+        """
+        Дописывает всё, что осталось в очереди, и останавливает фоновый поток.
+        Элементы, полученные после закрытия, записываются синхронно.
+        """
+        if self._thread.is_alive():
+            self._queue.put((_STOP,))
+            self._thread.join()
+
+    def _submit(self, item: tuple):
+        if self._thread.is_alive():
+            self._queue.put(item)
+        else:
+            self._handle(item)
+            self._write_attachments(list(self._pending_attachments))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item[0] == _STOP:
+                    self._write_attachments(list(self._pending_attachments))
+                    return
+                self._handle(item)
+
+    def _handle(self, item: tuple):
+        kind, *payload = item
+        try:
+            if kind == "attachment":
+                body, file_name = payload
+                self._pending_attachments[file_name] = body
+            elif kind == "result":
+                self._write_result(payload[0])
+            else:
+                self._write_container(payload[0])
+        except Exception as e:
+            print(f"Не удалось записать результат Allure ({kind}): {e}")
+
+    @classmethod
+    def _step_attachments(cls, steps) -> list[str]:
+        names = []
+        for step in steps:
+            names.extend(attachment.source for attachment in step.attachments)
+            names.extend(cls._step_attachments(step.steps))
+        return names
+
+    def _write_result(self, result):
+        step_attachments = self._step_attachments(result.steps)
+        if self.steps_only_on_failure and result.status not in _FAILED_STATUSES and result.steps:
+            for file_name in step_attachments:
+                if self._pending_attachments.pop(file_name, None) is not None:
+                    self.stats["discarded_attachments"] += 1
+            self.stats["discarded_steps"] += len(result.steps)
+            result.steps = []
+            step_attachments = []
+
+        self._write_attachments([attachment.source for attachment in result.attachments] + step_attachments)
+        self._write_item(result)
+
+    def _write_container(self, container):
+        file_names = []
+        for fixture in [*container.befores, *container.afters]:
+            file_names.extend(attachment.source for attachment in fixture.attachments)
+            file_names.extend(self._step_attachments(fixture.steps))
+        self._write_attachments(file_names)
+        self._write_item(container)
+
+    def _write_attachments(self, file_names: list[str]):
+        for file_name in file_names:
+            body = self._pending_attachments.pop(file_name, None)
+            if body is None:
+                continue
+            with open(self.report_dir / file_name, "wb") as attached_file:
+                attached_file.write(body)
+            self.stats["files"] += 1
+
+    def _write_item(self, item):
+        data = asdict(item, filter=lambda _, value: value or value is False)
+        file_name = item.file_pattern.format(prefix=uuid.uuid4())
+        with open(self.report_dir / file_name, "w", encoding="utf-8") as json_file:
+            json.dump(data, json_file, indent=self.indent, ensure_ascii=False)
+        self.stats["files"] += 1
+
+
+def install_buffered_logger(config, steps_only_on_failure: bool = False) -> BufferedAllureFileLogger | None:
+    """
+    Заменяет `AllureFileLogger`, зарегистрированный allure-pytest, на `BufferedAllureFileLogger`.
+
+    Вызывается после `pytest_configure` всех плагинов. При завершении pytest буфер дописывается,
+    а исходный логгер возвращается на место, чтобы allure-pytest снял его в своей очистке.
+
+    :param config: Конфигурация pytest.
+    :param steps_only_on_failure: Сохранять шаги только для упавших тестов.
+    :return: Установленный логгер или None, если запись результатов Allure не включена.
+    """
+    plugin_manager = allure_commons.plugin_manager
+    file_logger = next(
+        (plugin for plugin in plugin_manager.get_plugins() if isinstance(plugin, AllureFileLogger)), None
+    )
+    if file_logger is None:
+        return None
+
+    name = plugin_manager.get_name(file_logger)
+    buffered_logger = BufferedAllureFileLogger(file_logger._report_dir, steps_only_on_failure=steps_only_on_failure)
+    plugin_manager.unregister(file_logger)
+    plugin_manager.register(buffered_logger)
+
+    def restore():
+        buffered_logger.close()
+        plugin_manager.unregister(buffered_logger)
+        plugin_manager.register(file_logger, name=name)
+
+    config.add_cleanup(restore)
+    return buffered_logger
@@ -1,8 +1,51 @@
-"""Методы для формирования отчёта при выполнении автотестов."""
+"""
+Методы для формирования отчёта при выполнении автотестов.
+
+Пока отчёт Allure не включён (`use_allure`), методы ничего не делают, а `allure` не импортируется:
+декораторы возвращают функцию теста без изменений, шаги - пустой контекст.
+"""
+import json
 import os
 from typing import Callable
 
-import allure
+_allure_enabled = False
+
+
+class _NoopStep:
+    """
+    Шаг без отчёта: контекстный менеджер и декоратор, не меняющий функцию.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        return func
+
+
+_NOOP_STEP = _NoopStep()
+
+
+def _keep(func: Callable) -> Callable:
+    return func
+
+
+def _allure():
+    import allure  # Импорт откладывается до первого обращения при включённом отчёте
+    return allure
+
+
+def use_allure(enabled: bool = True):
+    """
+    Включает или выключает запись в отчёт Allure.
+
+    :param enabled: True - методы пишут в Allure, False - ничего не делают.
+    """
+    global _allure_enabled
+    _allure_enabled = enabled
 
 
 def attach_file(path: str):
@@ -11,9 +54,28 @@ def attach_file(path: str):
 
     :param path: Путь к файлу.
     """
+    if not _allure_enabled:
+        return
     file_path, file_extension = os.path.splitext(path)
     file_name = os.path.basename(file_path)
-    allure.attach.file(source=path, name=file_name, extension=file_extension)
+    _allure().attach.file(source=path, name=file_name, extension=file_extension)
+
+
+def attach_json(name: str, data: dict | list):
+    """
+    Прикрепляет JSON-данные к текущему шагу (или к тесту, если шаг не открыт).
+
+    :param name: Название вложения.
+    :param data: Сериализуемые в JSON данные.
+    """
+    if not _allure_enabled:
+        return
+    allure = _allure()
+    allure.attach(
+        json.dumps(data, ensure_ascii=False, indent=2, default=str),
+        name=name,
+        attachment_type=allure.attachment_type.JSON
+    )
 
 
 def name(name: str) -> Callable:
@@ -22,7 +84,9 @@ def name(name: str) -> Callable:
 
     :param name: Название теста.
     """
-    return allure.title(name)
+    if not _allure_enabled:
+        return _keep
+    return _allure().title(name)
 
 
 def step(step_name: str):
@@ -31,7 +95,9 @@ def step(step_name: str):
 
     :param step_name: наименование шага автотеста.
     """
-    return allure.step(step_name)
+    if not _allure_enabled:
+        return _NOOP_STEP
+    return _allure().step(step_name)
 
 
 def add_link(url: str, title: str = None) -> Callable:
@@ -42,7 +108,9 @@ def add_link(url: str, title: str = None) -> Callable:
     :param type_: Тип ссылки.
     :param title: Название ссылки.
     """
-    return allure.link(url=url, name=title, link_type="link")
+    if not _allure_enabled:
+        return _keep
+    return _allure().link(url=url, name=title, link_type="link")
 
 
 def external_id(id_: str) -> Callable:
@@ -51,7 +119,9 @@ def external_id(id_: str) -> Callable:
 
     :param id_: GUID теста.
     """
-    return allure.label("Autotest id", id_)
+    if not _allure_enabled:
+        return _keep
+    return _allure().label("Autotest id", id_)
 
 
 def num(*test_work_items_id: int or str) -> Callable:
@@ -60,7 +130,9 @@ def num(*test_work_items_id: int or str) -> Callable:
 
     :param test_work_items_id: список идентификаторов тест-кейсов.
     """
-    return allure.label("Test cases", *test_work_items_id)
+    if not _allure_enabled:
+        return _keep
+    return _allure().label("Test cases", *test_work_items_id)
 
 
 def description(text: str):
@@ -69,5 +141,18 @@ def description(text: str):
 
     :param text: Описание.
     """
-    allure.description(text)
+    if _allure_enabled:
+        _allure().description(text)
     return
+
+
+def parameter(name: str, value, excluded: bool = False):
+    """
+    Добавляет параметр к результату текущего теста.
+
+    :param name: Название параметра.
+    :param value: Значение параметра.
+    :param excluded: Не учитывать параметр при сопоставлении истории запусков теста.
+    """
+    if _allure_enabled:
+        _allure().dynamic.parameter(name, value, excluded=excluded)
@@ -0,0 +1,190 @@
+"""Журнал прогона в формате JSON Lines: запись через очередь, отдельный файл на процесс, слияние в конце прогона."""
+import heapq
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+# Стандартные атрибуты LogRecord; остальные (переданные через `extra`) попадают в запись журнала
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "test_id", "worker"}
+
+FILE_BUFFER_SIZE = 1024 * 1024
+
+
+class TestContextFilter(logging.Filter):
+    """
+    Добавляет к записи идентификатор воркера и node id текущего теста.
+    Выполняется в потоке, создавшем запись, до постановки в очередь.
+    """
+
+    def __init__(self, worker: str):
+        super().__init__()
+        self.worker = worker
+        self.test_id: str | None = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.worker = self.worker
+        record.test_id = self.test_id
+        return True
+
+
+def _to_json(value):
+    # Объекты с `to_dict` (например, `RequestTiming`) сериализуются в фоновом потоке, а не при записи в журнал
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else str(value)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Форматирует запись в одну строку JSON: время, уровень, логгер, воркер, тест, сообщение и поля `extra`.
+    Значения `extra` с методом `to_dict` сериализуются через него.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": getattr(record, "worker", None),
+            "test_id": getattr(record, "test_id", None),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        return json.dumps(data, ensure_ascii=False, default=_to_json)
+
+
+class RecordQueueHandler(QueueHandler):
+    """
+    Обработчик очереди, который ставит в очередь саму запись: сообщение форматируется
+    фоновым потоком, а не потоком теста (стандартный `QueueHandler` форматирует и копирует запись).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    Файловый обработчик без сброса буфера после каждой записи: данные пишутся на диск
+    блоками по `FILE_BUFFER_SIZE` и при закрытии.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=FILE_BUFFER_SIZE, encoding=self.encoding)
+
+    def flush(self):
+        pass
+
+
+class StructuredLog:
+    """
+    Журнал процесса (контроллера или воркера xdist).
+
+    Записи ставятся в очередь `QueueHandler` без блокировки вызывающего потока, фоновый
+    `QueueListener` форматирует их в JSON Lines и пишет в буферизованный файл процесса.
+    Плагин pytest: отслеживает текущий тест, чтобы каждая запись содержала его node id.
+    """
+
+    def __init__(self, path: Path, worker: str, level: int = logging.INFO):
+        """
+        :param path: Путь к файлу журнала процесса.
+        :param worker: Идентификатор процесса (gw0, gw1, ... или main).
+        :param level: Минимальный уровень записей.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.context = TestContextFilter(worker)
+        self.queue_handler = RecordQueueHandler(queue.SimpleQueue())
+        self.queue_handler.setLevel(level)
+        self.queue_handler.addFilter(self.context)
+
+        self.file_handler = BufferedFileHandler(self.path, mode="w", encoding="utf-8")
+        self.file_handler.setFormatter(JsonLinesFormatter())
+        self.listener = QueueListener(self.queue_handler.queue, self.file_handler)
+
+        self._root_level = None
+
+    def start(self):
+        """
+        Подключает обработчик очереди к корневому логгеру и запускает фоновую запись.
+        """
+        root = logging.getLogger()
+        self._root_level = root.level
+        if root.getEffectiveLevel() > self.queue_handler.level:
+            root.setLevel(self.queue_handler.level)
+        root.addHandler(self.queue_handler)
+        self.listener.start()
+
+    def stop(self):
+        """
+        Отключает обработчик, дописывает очередь и закрывает файл.
+        """
+        root = logging.getLogger()
+        if self.queue_handler not in root.handlers:
+            return
+        root.removeHandler(self.queue_handler)
+        if self._root_level is not None:
+            root.setLevel(self._root_level)
+        self.listener.stop()
+        self.file_handler.close()
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.context.test_id = nodeid
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.context.test_id = None
+
+
+# Насколько запись может опередить в файле процесса более раннюю (по `created`) запись другого потока, с
+REORDER_WINDOW_SECONDS = 5.0
+
+
+def _record_time(line: str) -> float:
+    # Время - первое поле записи (`JsonLinesFormatter`): строка не разбирается целиком
+    return float(line[len('{"ts": '):line.index(",")])
+
+
+def _reordered(lines, window: float):
+    """
+    Упорядочивает записи журнала процесса по (время, порядковый номер) в скользящем окне.
+
+    Потоки процесса ставят записи в очередь не строго в порядке `created`, поэтому файл процесса
+    упорядочен по времени только приблизительно. Запись выдаётся, когда в файле встретилась
+    запись новее неё больше чем на `window`; в памяти держатся только записи окна.
+    """
+    pending = []
+    for seq, line in enumerate(lines):
+        ts = _record_time(line)
+        heapq.heappush(pending, (ts, seq, line))
+        while pending[0][0] < ts - window:
+            yield heapq.heappop(pending)
+    while pending:
+        yield heapq.heappop(pending)
+
+
+def merge_logs(parts: list[Path], path: Path, window: float = REORDER_WINDOW_SECONDS) -> int:
+    """
+    Объединяет журналы процессов в один, упорядочивая записи по времени.
+    Журнал процесса упорядочивается в скользящем окне `window` (`_reordered`), после чего журналы
+    сливаются потоково по (время, порядковый номер), без загрузки журналов в память.
+
+    :param parts: Журналы процессов.
+    :param path: Путь к итоговому журналу.
+    :param window: Окно упорядочивания записей внутри журнала процесса, с.
+    :return: Количество записей.
+    """
+    files = [open(part, encoding="utf-8") for part in parts]
+    records = 0
+    try:
+        streams = [_reordered((line for line in part_file if line.strip()), window) for part_file in files]
+        with open(path, "w", encoding="utf-8", buffering=FILE_BUFFER_SIZE) as merged:
+            for _, _, line in heapq.merge(*streams):
+                merged.write(line)
+                records += 1
+    finally:
+        for part_file in files:
+            part_file.close()
+    return records
@@ -0,0 +1,143 @@
+"""Хранилище длительностей тестов и разбиение тестов на группы с равным ожидаемым временем."""
+import hashlib
+import heapq
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Hashable, Iterable
+
+# Длительность теста, если замеров ещё нет ни для одного теста, с
+DEFAULT_DURATION = 1.0
+
+
+class DurationsStore:
+    """
+    Длительности тестов по node id (setup + call + teardown), сглаженные по прогонам.
+
+    Новый замер учитывается с весом `smoothing`, поэтому случайный медленный прогон
+    не перекраивает распределение целиком.
+    """
+
+    def __init__(self, path: Path, smoothing: float = 0.5):
+        """
+        :param path: Путь к JSON-файлу хранилища.
+        :param smoothing: Вес нового замера (1 - хранить только последний).
+        """
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.durations: dict[str, float] = self.load()
+        self._default = statistics.median(self.durations.values()) if self.durations else DEFAULT_DURATION
+
+    def load(self) -> dict[str, float]:
+        """
+        :return: Длительности из файла (пустой словарь, если файла нет или он повреждён).
+        """
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def estimate(self, nodeid: str) -> float:
+        """
+        :return: Ожидаемая длительность теста, с. Для новых тестов - медиана известных.
+        """
+        return self.durations.get(nodeid, self._default)
+
+    def update(self, measured: dict[str, float]):
+        """
+        Учитывает длительности прогона.
+
+        :param measured: Длительности тестов прогона по node id, с.
+        """
+        for nodeid, duration in measured.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = (
+                duration if previous is None else previous + (duration - previous) * self.smoothing
+            )
+
+    def save(self):
+        """
+        Сохраняет хранилище (атомарно: запись во временный файл и замена).
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        temp_path.write_text(
+            json.dumps({nodeid: round(value, 4) for nodeid, value in sorted(self.durations.items())}, indent=1),
+            encoding="utf-8",
+        )
+        os.replace(temp_path, self.path)
+
+
+class DurationsRecorder:
+    """
+    Плагин pytest: накапливает длительности тестов прогона (setup + call + teardown).
+    """
+
+    def __init__(self, store: DurationsStore):
+        """
+        :param store: Хранилище, в которое сохраняются длительности.
+        """
+        self.store = store
+        self.measured: dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.measured[report.nodeid] = self.measured.get(report.nodeid, 0.0) + report.duration
+
+    def save(self):
+        """
+        Учитывает длительности прогона в хранилище и сохраняет его.
+        """
+        self.store.update(self.measured)
+        self.store.save()
+
+
+def lpt_partition(keys: Iterable[Hashable], estimates: dict, bins: int) -> list[list]:
+    """
+    Разбивает элементы на `bins` групп жадным алгоритмом LPT (longest processing time first):
+    элементы по убыванию длительности добавляются в группу с наименьшей суммарной длительностью.
+    Результат детерминирован: при равных длительностях порядок определяется ключом.
+
+    :param keys: Элементы (например, node id тестов).
+    :param estimates: Ожидаемые длительности элементов.
+    :param bins: Количество групп.
+    :return: Группы элементов; внутри группы - по убыванию длительности.
+    """
+    groups = [[] for _ in range(bins)]
+    heap = [(0.0, index) for index in range(bins)]
+    for key in sorted(keys, key=lambda key: (-estimates[key], str(key))):
+        load, index = heapq.heappop(heap)
+        groups[index].append(key)
+        heapq.heappush(heap, (load + estimates[key], index))
+    return groups
+
+
+def hash_partition(keys: Iterable[str], bins: int) -> list[list]:
+    """
+    Разбивает элементы на `bins` групп по хэшу ключа. Группа элемента зависит только от его ключа,
+    поэтому разбиение одинаково на всех машинах и не меняется при добавлении других элементов.
+
+    :param keys: Ключи элементов (например, node id тестов).
+    :param bins: Количество групп.
+    :return: Группы элементов в исходном порядке.
+    """
+    groups = [[] for _ in range(bins)]
+    for key in keys:
+        digest = hashlib.sha256(str(key).encode("utf-8")).digest()
+        groups[int.from_bytes(digest[:8], "big") % bins].append(key)
+    return groups
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    Разбирает значение `--shard` вида `i/N` (шард i из N, нумерация с 1).
+
+    :raises ValueError: Если значение некорректно.
+    """
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Некорректное значение --shard={value!r}: ожидается i/N, например 1/4") from None
+    if not 1 <= index <= total:
+        raise ValueError(f"Некорректное значение --shard={value!r}: номер шарда должен быть от 1 до {total}")
+    return index, total
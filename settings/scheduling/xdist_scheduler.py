@@ -0,0 +1,74 @@
+"""Планировщик pytest-xdist, распределяющий тесты по воркерам с учётом их длительности."""
+from collections import deque
+
+from xdist.scheduler import LoadScheduling
+
+from settings.scheduling.durations import DurationsStore, lpt_partition
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    Распределение `--dist load` с учётом длительностей прошлых прогонов.
+
+    Перед стартом тесты раскладываются по очередям воркеров алгоритмом LPT, чтобы
+    ожидаемое время воркеров было равным; самые долгие тесты запускаются первыми.
+    Воркеру отправляются тесты из его очереди небольшими порциями, как в `LoadScheduling`.
+    Когда очередь воркера пуста, он забирает самые короткие тесты из очереди с наибольшим
+    оставшимся временем - так компенсируется неточность оценок. Тесты упавшего воркера
+    отправляются другим воркерам в первую очередь.
+    """
+
+    def __init__(self, config, log=None, store: DurationsStore = None):
+        """
+        :param config: Конфигурация pytest.
+        :param log: Логгер xdist.
+        :param store: Хранилище длительностей тестов.
+        """
+        super().__init__(config, log)
+        self.store = store
+        self.queues: dict = {}
+        self.remaining: dict = {}
+        self.requeued: deque[int] = deque()
+        self.estimates: dict[int, float] = {}
+
+    def _build_queues(self):
+        self.estimates = {index: self.store.estimate(self.collection[index]) for index in self.pending}
+        for node, group in zip(self.nodes, lpt_partition(self.pending, self.estimates, len(self.nodes))):
+            self.queues[node] = deque(group)
+            self.remaining[node] = sum(self.estimates[index] for index in group)
+        self.log("duration schedule:", {node.gateway.id: round(load, 2) for node, load in self.remaining.items()})
+
+    def _next_index(self, node) -> int:
+        if self.requeued:
+            return self.requeued.popleft()
+
+        queue = self.queues.get(node)
+        if queue:
+            index = queue.popleft()
+        else:
+            # Своя очередь пуста: забираем самый короткий тест у самой загруженной очереди
+            node = max((donor for donor in self.queues if self.queues[donor]), key=self.remaining.__getitem__)
+            index = self.queues[node].pop()
+        self.remaining[node] -= self.estimates[index]
+        return index
+
+    def _send_tests(self, node, num: int):
+        if not self.queues:
+            self._build_queues()
+
+        indices = [self._next_index(node) for _ in range(min(num, len(self.pending)))]
+        if indices:
+            sent = set(indices)
+            self.pending[:] = [index for index in self.pending if index not in sent]
+            self.node2pending[node].extend(indices)
+            node.send_runtest_some(indices)
+
+    def mark_test_pending(self, item: str):
+        self.requeued.appendleft(self.collection.index(item))
+        super().mark_test_pending(item)
+
+    def remove_node(self, node):
+        pending = self.node2pending.get(node, [])
+        # Первый тест воркера считается упавшим вместе с ним, остальные отправляются заново
+        self.requeued.extend(pending[1:])
+        return super().remove_node(node)
@@ -0,0 +1,617 @@
+"""
+Локальный стенд-заглушка сервиса Regions: POST /v1/auth/tokens, POST /v1/favorites, DELETE /v1/favorites/{id}.
+
+Сервер реализует выдачу токена в cookie и правила валидации избранного места,
+которые ожидают автотесты, а также настраиваемые задержки, ошибки и ограничение
+конкурентности по каждому эндпоинту (`StubProfile`).
+
+Пример запуска:
+    python -m settings.stub_server.stub_server --port=8765 --profile=stub_profile.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import unquote_plus
+
+ENDPOINT_TOKENS = "POST /v1/auth/tokens"
+ENDPOINT_CREATE_FAVORITE = "POST /v1/favorites"
+ENDPOINT_DELETE_FAVORITE = "DELETE /v1/favorites/{id}"
+ENDPOINTS = (ENDPOINT_TOKENS, ENDPOINT_CREATE_FAVORITE, ENDPOINT_DELETE_FAVORITE)
+
+ALLOWED_COLORS = ("BLUE", "GREEN", "RED", "YELLOW")
+TITLE_MAX_LENGTH = 999
+
+_MAX_HEAD_BYTES = 64 * 1024
+_REASONS = {status.value: status.phrase for status in HTTPStatus}
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _parse_form(body: bytes) -> dict:
+    """
+    Разбирает тело application/x-www-form-urlencoded (быстрее `parse_qsl` на коротких телах).
+    """
+    values = {}
+    for pair in body.decode("utf-8").split("&"):
+        if not pair:
+            continue
+        name, _, value = pair.partition("=")
+        if "%" in value or "+" in value:
+            value = unquote_plus(value)
+        values[unquote_plus(name) if "%" in name or "+" in name else name] = value
+    return values
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Распределение задержки ответа эндпоинта.
+
+    kind: fixed (`ms`), uniform (`min_ms`..`max_ms`), normal (`mean_ms`, `stddev_ms`),
+    lognormal (`median_ms`, `sigma`), exponential (`mean_ms`).
+    """
+    kind: str = "fixed"
+    ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    median_ms: float = 0.0
+    sigma: float = 0.0
+
+    def __post_init__(self):
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Неизвестное распределение задержки: {self.kind}")
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        :param rng: Генератор случайных чисел сервера.
+        :return: Задержка в секундах (не меньше 0).
+        """
+        if self.kind == "fixed":
+            delay_ms = self.ms
+        elif self.kind == "uniform":
+            delay_ms = rng.uniform(self.min_ms, self.max_ms)
+        elif self.kind == "normal":
+            delay_ms = rng.gauss(self.mean_ms, self.stddev_ms)
+        elif self.kind == "lognormal":
+            delay_ms = rng.lognormvariate(math.log(self.median_ms), self.sigma) if self.median_ms > 0 else 0.0
+        else:
+            delay_ms = rng.expovariate(1 / self.mean_ms) if self.mean_ms > 0 else 0.0
+        return max(delay_ms, 0.0) / 1000
+
+
+@dataclass
+class EndpointBehavior:
+    """
+    Поведение эндпоинта заглушки: задержка, внедрение ошибок и ограничение конкурентности.
+    """
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0  # Доля ответов со статусом error_status
+    error_status: int = 500
+    reset_rate: float = 0.0  # Доля запросов, на которые соединение обрывается без ответа
+    max_concurrency: int | None = None  # Максимум одновременно обрабатываемых запросов
+    overflow: str = "queue"  # queue - ждать освобождения, reject - сразу отвечать overflow_status
+    overflow_status: int = 503
+
+    def __post_init__(self):
+        if isinstance(self.latency, dict):
+            self.latency = LatencyDistribution(**self.latency)
+        if self.overflow not in ("queue", "reject"):
+            raise ValueError(f"Неизвестный режим переполнения: {self.overflow}")
+
+
+@dataclass
+class StubProfile:
+    """
+    Профиль заглушки: поведение эндпоинтов (`ENDPOINTS`), срок жизни токена и зерно случайностей.
+
+    Пример JSON-файла профиля:
+        {
+            "seed": 1,
+            "token_ttl_seconds": 3600,
+            "endpoints": {
+                "POST /v1/favorites": {
+                    "latency": {"kind": "lognormal", "median_ms": 20, "sigma": 0.5},
+                    "error_rate": 0.01,
+                    "max_concurrency": 64
+                }
+            }
+        }
+    """
+    endpoints: dict[str, EndpointBehavior] = field(default_factory=dict)
+    token_ttl_seconds: int | None = None  # None - cookie без срока действия
+    seed: int | None = None
+
+    def __post_init__(self):
+        for endpoint, behavior in list(self.endpoints.items()):
+            if endpoint not in ENDPOINTS:
+                raise ValueError(f"Неизвестный эндпоинт заглушки: {endpoint}. Доступные: {', '.join(ENDPOINTS)}")
+            if isinstance(behavior, dict):
+                self.endpoints[endpoint] = EndpointBehavior(**behavior)
+
+    def behavior(self, endpoint: str) -> EndpointBehavior:
+        return self.endpoints.get(endpoint) or _DEFAULT_BEHAVIOR
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StubProfile":
+        known = {item.name for item in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Неизвестные поля профиля заглушки: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "StubProfile":
+        """
+        Загружает профиль из JSON-файла.
+
+        :param path: Путь к файлу профиля.
+        :return: Профиль заглушки.
+        """
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+_DEFAULT_BEHAVIOR = EndpointBehavior()
+
+
+@dataclass(slots=True)
+class _Request:
+    method: str
+    path: str
+    headers: dict
+    body: bytes
+    keep_alive: bool
+
+
+class _ConcurrencyGate:
+    """
+    Ограничивает число одновременно обрабатываемых запросов эндпоинта (очередь FIFO).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.waiting = deque()
+
+    def try_acquire(self) -> bool:
+        if self.active < self.limit:
+            self.active += 1
+            return True
+        return False
+
+    def release(self, loop: asyncio.AbstractEventLoop):
+        if self.waiting:
+            # Слот сразу передаётся следующему запросу из очереди
+            loop.call_soon(self.waiting.popleft())
+        else:
+            self.active -= 1
+
+
+class RegionsStubApp:
+    """
+    Состояние и обработчики заглушки. Все методы вызываются в потоке event loop сервера.
+    """
+
+    def __init__(self, profile: StubProfile):
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.tokens: dict[str, float | None] = {}  # токен -> время истечения
+        self.favorites: dict[int, str] = {}  # id места -> токен владельца
+        self.statuses: dict[str, dict[int, int]] = {endpoint: {} for endpoint in ENDPOINTS}
+        self.gates = self._build_gates()
+        self._ids = itertools.count(1)
+        self._created_at = (0, "")
+
+    def _build_gates(self) -> dict[str, _ConcurrencyGate]:
+        return {
+            endpoint: _ConcurrencyGate(behavior.max_concurrency)
+            for endpoint, behavior in self.profile.endpoints.items()
+            if behavior.max_concurrency
+        }
+
+    def set_profile(self, profile: StubProfile):
+        """
+        Заменяет профиль (запросы, уже стоящие в очереди, дообрабатываются по старым ограничениям).
+        """
+        self.profile = profile
+        self.gates = self._build_gates()
+
+    @staticmethod
+    def route(method: str, path: str) -> tuple[str | None, str | None]:
+        """
+        :return: Пара (эндпоинт, идентификатор из пути) или (None, None), если маршрут не найден.
+        """
+        path = path.split("?", 1)[0]
+        if path == "/v1/auth/tokens" and method == "POST":
+            return ENDPOINT_TOKENS, None
+        if path == "/v1/favorites" and method == "POST":
+            return ENDPOINT_CREATE_FAVORITE, None
+        if path.startswith("/v1/favorites/") and method == "DELETE":
+            return ENDPOINT_DELETE_FAVORITE, path[len("/v1/favorites/"):]
+        return None, None
+
+    def _now_iso(self) -> str:
+        now = int(time.time())
+        if self._created_at[0] != now:
+            self._created_at = (now, datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        return self._created_at[1]
+
+    @staticmethod
+    def error(status: int, message: str) -> tuple[int, list, bytes]:
+        body = _encode_json({"error": {"id": secrets.token_hex(16), "message": message}})
+        return status, [], body.encode()
+
+    def _token_owner(self, request: _Request) -> str | None:
+        cookie_header = request.headers.get("cookie")
+        if not cookie_header:
+            return None
+        for cookie in cookie_header.split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == "token" and value:
+                if value not in self.tokens:
+                    return None
+                expires_at = self.tokens[value]
+                return value if expires_at is None or time.time() < expires_at else None
+        return None
+
+    def handle(self, endpoint: str, path_id: str | None, request: _Request) -> tuple[int, list, bytes]:
+        if endpoint == ENDPOINT_TOKENS:
+            return self.issue_token()
+        if endpoint == ENDPOINT_CREATE_FAVORITE:
+            return self.create_favorite(request)
+        return self.delete_favorite(request, path_id)
+
+    def issue_token(self) -> tuple[int, list, bytes]:
+        token = secrets.token_hex(16)
+        ttl = self.profile.token_ttl_seconds
+        self.tokens[token] = time.time() + ttl if ttl else None
+        cookie = f"token={token}; Path=/" + (f"; Max-Age={ttl}" if ttl else "")
+        return 200, [("Set-Cookie", cookie)], b""
+
+    @staticmethod
+    def _parse_coordinate(values: dict, name: str, limit: int) -> tuple[float | None, str | None]:
+        raw = values.get(name)
+        if raw is None or raw == "":
+            return None, f"Параметр '{name}' является обязательным"
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            return None, f"Параметр '{name}' должен быть числом"
+        if not math.isfinite(value) or not -limit <= value <= limit:
+            return None, f"Параметр '{name}' должен быть не менее -{limit} и не более {limit}"
+        return value, None
+
+    def create_favorite(self, request: _Request) -> tuple[int, list, bytes]:
+        token = self._token_owner(request)
+        if token is None:
+            return self.error(401, "Передан несуществующий или \"протухший\" 'token'")
+
+        try:
+            if request.headers.get("content-type", "").startswith("application/json"):
+                values = json.loads(request.body or b"{}")
+                if not isinstance(values, dict):
+                    raise ValueError
+            else:
+                values = _parse_form(request.body)
+        except (UnicodeDecodeError, ValueError):
+            return self.error(400, "Некорректное тело запроса")
+
+        title = values.get("title")
+        if not title:
+            return self.error(400, "Параметр 'title' является обязательным")
+        if not isinstance(title, str) or len(title) > TITLE_MAX_LENGTH:
+            return self.error(400, f"Параметр 'title' должен содержать не более {TITLE_MAX_LENGTH} символов")
+
+        lat, message = self._parse_coordinate(values, "lat", 90)
+        if message:
+            return self.error(400, message)
+        lon, message = self._parse_coordinate(values, "lon", 180)
+        if message:
+            return self.error(400, message)
+
+        color = values.get("color") or None
+        if color is not None and color not in ALLOWED_COLORS:
+            return self.error(
+                400, f"Параметр 'color' может быть одним из следующих значений: {', '.join(ALLOWED_COLORS)}"
+            )
+
+        favorite_id = next(self._ids)
+        self.favorites[favorite_id] = token
+        body = _encode_json({
+            "id": favorite_id,
+            "title": title,
+            "lat": lat,
+            "lon": lon,
+            "color": color,
+            "created_at": self._now_iso(),
+        })
+        return 200, [], body.encode()
+
+    def delete_favorite(self, request: _Request, path_id: str) -> tuple[int, list, bytes]:
+        token = self._token_owner(request)
+        if token is None:
+            return self.error(401, "Передан несуществующий или \"протухший\" 'token'")
+        if not path_id.isdigit() or self.favorites.get(int(path_id)) != token:
+            return self.error(404, "Избранное место не найдено")
+        del self.favorites[int(path_id)]
+        return 204, [], b""
+
+    def count(self, endpoint: str, status: int):
+        statuses = self.statuses[endpoint]
+        statuses[status] = statuses.get(status, 0) + 1
+
+
+class _HttpProtocol(asyncio.Protocol):
+    """
+    Минимальный HTTP/1.1 сервер с keep-alive: запросы одного соединения обрабатываются по порядку.
+    """
+
+    def __init__(self, app: RegionsStubApp):
+        self.app = app
+        self.loop = asyncio.get_running_loop()
+        self.transport: asyncio.Transport | None = None
+        self.buffer = bytearray()
+        self.busy = False
+        self.closed = False
+        self._processing = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.closed = True
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        if not self.busy:
+            self._process()
+
+    def _parse(self) -> _Request | None:
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self.buffer) > _MAX_HEAD_BYTES:
+                raise ValueError("Слишком большой заголовок запроса")
+            return None
+
+        lines = self.buffer[:end].decode("latin-1").split("\r\n")
+        method, path, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise ValueError("Transfer-Encoding не поддерживается")
+
+        total = end + 4 + int(headers.get("content-length") or 0)
+        if len(self.buffer) < total:
+            return None
+        body = bytes(self.buffer[end + 4:total])
+        del self.buffer[:total]
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return _Request(method, path, headers, body, keep_alive)
+
+    def _process(self):
+        self._processing = True
+        try:
+            while not self.busy and not self.closed:
+                try:
+                    request = self._parse()
+                except ValueError:
+                    self.busy = True
+                    self.respond(400, [], b"", keep_alive=False)
+                    return
+                if request is None:
+                    return
+                self.busy = True
+                self._dispatch(request)
+        finally:
+            self._processing = False
+
+    def _dispatch(self, request: _Request):
+        app = self.app
+        endpoint, path_id = app.route(request.method, request.path)
+        if endpoint is None:
+            self.respond(*app.error(404, "Маршрут не найден"), keep_alive=request.keep_alive)
+            return
+
+        behavior = app.profile.behavior(endpoint)
+        gate = app.gates.get(endpoint)
+
+        def start():
+            delay = behavior.latency.sample(app.rng)
+            if delay > 0:
+                self.loop.call_later(delay, finish)
+            else:
+                finish()
+
+        def finish():
+            if gate is not None:
+                gate.release(self.loop)
+            if self.closed:
+                return
+            if behavior.reset_rate and app.rng.random() < behavior.reset_rate:
+                app.count(endpoint, 0)
+                self.transport.abort()
+                self.closed = True
+                return
+            if behavior.error_rate and app.rng.random() < behavior.error_rate:
+                status, headers, body = app.error(behavior.error_status, "Внедрённая ошибка заглушки")
+            else:
+                status, headers, body = app.handle(endpoint, path_id, request)
+            app.count(endpoint, status)
+            self.respond(status, headers, body, keep_alive=request.keep_alive)
+
+        if gate is None or gate.try_acquire():
+            start()
+        elif behavior.overflow == "reject":
+            app.count(endpoint, behavior.overflow_status)
+            self.respond(
+                *app.error(behavior.overflow_status, "Превышен лимит одновременных запросов"),
+                keep_alive=request.keep_alive,
+            )
+        else:
+            gate.waiting.append(start)
+
+    def respond(self, status: int, headers: list, body: bytes, keep_alive: bool):
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        if status != 204:
+            head.append("Content-Type: application/json")
+            head.append(f"Content-Length: {len(body)}")
+        for name, value in headers:
+            head.append(f"{name}: {value}")
+        if not keep_alive:
+            head.append("Connection: close")
+        self.transport.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+        self.busy = False
+        if not keep_alive:
+            self.transport.close()
+            self.closed = True
+        elif self.buffer and not self._processing:
+            self._process()
+
+
+class StubServer:
+    """
+    Запускает заглушку в фоновом потоке со своим event loop (`start`/`stop`, контекстный менеджер)
+    или в текущем потоке (`serve_forever`).
+    """
+
+    def __init__(self, profile: StubProfile | None = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param profile: Профиль заглушки (по умолчанию - без задержек и ошибок).
+        :param host: Адрес для прослушивания.
+        :param port: Порт (0 - выбрать свободный).
+        """
+        self.app = RegionsStubApp(profile or StubProfile())
+        self.host = host
+        self.port = port
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _listen(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await self._loop.create_server(
+            lambda: _HttpProtocol(self.app), self.host, self.port, backlog=1024
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def start(self) -> "StubServer":
+        """
+        Запускает сервер в фоновом потоке и ждёт готовности к приёму соединений.
+
+        :return: Сам сервер (для цепочки `StubServer().start()`).
+        """
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self._listen())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                self._server.close()
+                loop.run_until_complete(self._server.wait_closed())
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="regions-stub-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise RuntimeError(f"Не удалось запустить заглушку на {self.host}:{self.port}: {errors[0]}")
+        return self
+
+    def stop(self):
+        """
+        Останавливает сервер, запущенный `start`.
+        """
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def serve_forever(self):
+        """
+        Запускает сервер в текущем потоке до прерывания (Ctrl+C).
+        """
+        async def serve():
+            await self._listen()
+            print(f"Заглушка Regions слушает {self.base_url}")
+            async with self._server:
+                await self._server.serve_forever()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+    def _call_in_loop(self, func):
+        if self._thread is None:
+            return func()
+        return asyncio.run_coroutine_threadsafe(self._as_coroutine(func), self._loop).result()
+
+    @staticmethod
+    async def _as_coroutine(func):
+        return func()
+
+    def set_profile(self, profile: StubProfile):
+        """
+        Заменяет профиль работающего сервера (например, чтобы включить внедрение ошибок в тесте).
+        """
+        self._call_in_loop(lambda: self.app.set_profile(profile))
+
+    def stats(self) -> dict:
+        """
+        :return: Количество ответов по эндпоинтам и статус-кодам (0 - оборванные соединения).
+        """
+        return self._call_in_loop(lambda: {
+            endpoint: dict(statuses) for endpoint, statuses in self.app.statuses.items()
+        })
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальная заглушка сервиса Regions")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для прослушивания.")
+    parser.add_argument("--port", type=int, default=8765, help="Порт.")
+    parser.add_argument("--profile", help="Путь к JSON-файлу профиля (задержки, ошибки, конкурентность).")
+    args = parser.parse_args()
+
+    profile = StubProfile.load(args.profile) if args.profile else None
+    StubServer(profile=profile, host=args.host, port=args.port).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
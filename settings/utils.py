@@ -1,21 +1,29 @@
+import hashlib
 import os
+from contextvars import ContextVar, Token
 from datetime import datetime, timedelta
 from urllib.parse import urljoin
 import random
 import string
 import uuid
-import requests
+from typing import TYPE_CHECKING
 
 from settings.assertions.custom_assertions import assert_equal
+from settings.assertions.data_diff import diff_data, format_differences
 
+if TYPE_CHECKING:
+    # requests импортируется клиентом API; автофикстурам conftest (`Randomizer`) он не нужен
+    import requests
 
-def check_response_status(response: requests.Response, expected_status: int):
+
+def check_response_status(response: "requests.Response", expected_status: int):
     """
     Проверяет, что статус-код HTTP-ответа соответствует ожидаемому, и в случае ошибки выводит подробную информацию.
+    Если метод API проверил тело ответа по схеме (`@response_schema`), проверяется и результат этой проверки.
 
     :param response: Объект HTTP-ответа.
     :param expected_status: Ожидаемый HTTP статус-код.
-    :raises AssertionError: Если фактический статус не совпадает с ожидаемым.
+    :raises AssertionError: Если фактический статус не совпадает с ожидаемым или тело не соответствует схеме.
     """
     actual_status = response.status_code
     request_url = response.request.url if response.request else "unknown"
@@ -29,6 +37,10 @@ def check_response_status(response: requests.Response, expected_status: int):
 
     assert_equal(actual_status, expected_status, error_message)
 
+    schema_error = getattr(response, "schema_error", None)  # См. settings.validation.response_validator
+    if schema_error:
+        raise AssertionError(schema_error)
+
 
 def get_controller_url(config, name: str) -> str:
     """
@@ -49,58 +61,54 @@ def verify_data(
     expected_data,
     verified_fields: list = None,
     unverified_fields: list = None,
-    msg_option: str = ""
+    msg_option: str = "",
+    unordered: bool = False,
+    match_key: str = None,
+    tolerance: float | dict = None,
+    expected_keys_only: bool = False
 ):
     """
-    Проверяет, что фактические данные соответствуют ожидаемым. Поддерживаются словари и списки.
+    Проверяет, что фактические данные соответствуют ожидаемым. Поддерживаются словари и списки, в том числе вложенные.
+
+    Все расхождения собираются за один проход (`settings.assertions.data_diff`), текст ошибки
+    формируется только если расхождения есть.
 
     :param actual_data: Фактические данные (dict или list).
     :param expected_data: Ожидаемые данные (dict или list).
-    :param verified_fields: Список ключей, которые необходимо проверить в словаре (по умолчанию None).
-    :param unverified_fields: Список ключей, которые нужно исключить из проверки в словаре (по умолчанию None).
+    :param verified_fields: Список ключей, которые необходимо проверить в словаре верхнего уровня (по умолчанию None).
+    :param unverified_fields: Список ключей, которые нужно исключить из проверки в словаре верхнего уровня
+        (по умолчанию None).
     :param msg_option: Дополнительное сообщение для контекста ошибки (по умолчанию пустая строка).
+    :param unordered: Сравнивать списки без учёта порядка элементов (по умолчанию False).
+    :param match_key: Ключ для сопоставления элементов списков словарей, например "id" (по умолчанию None).
+    :param tolerance: Допуск сравнения чисел: общий или по полям, например {"lat": 1e-6, "lon": 1e-6}.
+    :param expected_keys_only: Сравнивать вложенные словари (в том числе элементы списков) только по ключам
+        ожидаемых данных, например без `id` записей ответа (по умолчанию False - полное совпадение).
     :raises AssertionError: Если данные не совпадают.
     :raises TypeError: Если типы данных не поддерживаются или не совпадают.
     """
-    if isinstance(expected_data, dict) and isinstance(actual_data, dict):
-        verified_keys = expected_data.keys()
-        if verified_fields is not None:
-            verified_keys = verified_fields
-        elif unverified_fields is not None:
-            verified_keys = set(expected_data.keys()) - set(unverified_fields)
-
-        for key in verified_keys:
-            actual_value = actual_data.get(key)
-            expected_value = expected_data.get(key)
-            assert_equal(
-                actual_value,
-                expected_value,
-                f"Ошибка! Несовпадение в поле '{key}' {msg_option}.\n"
-                f"Фактическое значение = '{actual_value}', Ожидаемое значение = '{expected_value}'."
-            )
-
-    elif isinstance(expected_data, list) and isinstance(actual_data, list):
-        assert_equal(
-            len(actual_data),
-            len(expected_data),
-            f"Ошибка! Несовпадение длины списка {msg_option}.\n"
-            f"Фактическая длина = {len(actual_data)}, Ожидаемая длина = {len(expected_data)}."
-        )
-
-        for index, (actual_item, expected_item) in enumerate(zip(actual_data, expected_data)):
-            assert_equal(
-                actual_item,
-                expected_item,
-                f"Ошибка! Несовпадение элемента списка по индексу {index} {msg_option}.\n"
-                f"Фактический элемент = {actual_item}, Ожидаемый элемент = {expected_item}."
-            )
-
-    else:
+    if not (
+        isinstance(expected_data, dict) and isinstance(actual_data, dict)
+        or isinstance(expected_data, list) and isinstance(actual_data, list)
+    ):
         raise TypeError(
             f"Неподдерживаемые типы данных для проверки {msg_option}.\n"
             f"Фактический тип = {type(actual_data)}, Ожидаемый тип = {type(expected_data)}."
         )
 
+    differences = diff_data(
+        actual_data,
+        expected_data,
+        verified_fields=verified_fields,
+        unverified_fields=unverified_fields,
+        unordered=unordered,
+        match_key=match_key,
+        tolerance=tolerance,
+        expected_keys_only=expected_keys_only,
+    )
+    if differences:
+        raise AssertionError(format_differences(differences, msg_option))
+
 
 def get_current_test_name() -> str | None:
     """
@@ -113,6 +121,18 @@ def get_current_test_name() -> str | None:
     return None
 
 
+def get_current_test_id() -> str | None:
+    """
+    Получает node id текущего выполняемого теста (если тест уже запущен).
+
+    :return: Node id теста (путь::класс::тест[параметры]) или None, если тест ещё не запущен.
+    """
+    current_test = os.environ.get('PYTEST_CURRENT_TEST')
+    if current_test is not None:
+        return current_test.rsplit(' (', 1)[0]
+    return None
+
+
 def str2bool(val: str | None) -> bool:
     """
     Преобразует строку в булево значение. Поддерживаются 'true', '1', 'yes' (без учёта регистра).
@@ -125,11 +145,60 @@ def str2bool(val: str | None) -> bool:
     return str(val).strip().lower() in ("true", "1", "yes", "y", "on")
 
 
+_default_rng = random.Random()
+_current_rng: ContextVar[random.Random | None] = ContextVar("randomizer_rng", default=None)
+
+
 class Randomizer:
     """
     Утилитный класс для генерации случайных чисел, строк и UUID.
+
+    Значения генерируются из генератора текущего теста (см. `use_seed`): во время
+    теста он инициализирован зерном, производным от зерна прогона и node id теста,
+    поэтому данные воспроизводятся при повторном запуске с тем же `--randomSeed`
+    независимо от порядка тестов и воркера xdist. Вне теста используется общий генератор процесса.
     """
 
+    @staticmethod
+    def rng() -> random.Random:
+        """
+        Возвращает генератор случайных чисел текущего теста.
+
+        :return: Экземпляр `random.Random`.
+        """
+        return _current_rng.get() or _default_rng
+
+    @staticmethod
+    def derive_seed(run_seed: int, node_id: str) -> int:
+        """
+        Вычисляет зерно теста из зерна прогона и node id теста.
+
+        :param run_seed: Зерно прогона.
+        :param node_id: Идентификатор теста pytest (nodeid).
+        :return: 64-битное зерно теста.
+        """
+        digest = hashlib.sha256(f"{run_seed}:{node_id}".encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    @staticmethod
+    def use_seed(seed: int) -> Token:
+        """
+        Устанавливает отдельный генератор с заданным зерном для текущего контекста (теста).
+
+        :param seed: Зерно генератора.
+        :return: Токен для восстановления предыдущего генератора через `reset`.
+        """
+        return _current_rng.set(random.Random(seed))
+
+    @staticmethod
+    def reset(token: Token):
+        """
+        Восстанавливает генератор, действовавший до `use_seed`.
+
+        :param token: Токен, полученный из `use_seed`.
+        """
+        _current_rng.reset(token)
+
     @staticmethod
     def int_between(low: int = 0, high: int = 1_000_000) -> int:
         """
@@ -139,7 +208,7 @@ class Randomizer:
         :param high: Максимальное возможное значение (включительно).
         :return: Случайное целое число.
         """
-        return random.randint(low, high)
+        return Randomizer.rng().randint(low, high)
 
     @staticmethod
     def float_between(
@@ -155,7 +224,7 @@ class Randomizer:
         :param precision: Количество знаков после запятой (если требуется округление).
         :return: Случайное число float.
         """
-        result = random.uniform(low, high)
+        result = Randomizer.rng().uniform(low, high)
         return round(result, precision) if precision is not None else result
 
     @staticmethod
@@ -168,7 +237,7 @@ class Randomizer:
         """
         if not one_of:
             raise ValueError("Последовательность пуста - нечего выбирать.")
-        return random.choice(one_of)
+        return Randomizer.rng().choice(one_of)
 
     @staticmethod
     def random_string(size: int) -> str:
@@ -179,7 +248,7 @@ class Randomizer:
         :return: Случайная строка.
         """
         alphabet = string.ascii_letters + string.digits
-        return ''.join(Randomizer.pick_random(alphabet) for _ in range(size))
+        return ''.join(Randomizer.rng().choices(alphabet, k=size))
 
     @staticmethod
     def uuid() -> str:
@@ -188,7 +257,7 @@ class Randomizer:
 
         :return: Строка с UUID.
         """
-        return str(uuid.uuid4())
+        return str(uuid.UUID(int=Randomizer.rng().getrandbits(128), version=4))
 
     @staticmethod
     def random_birthday(start_year: int = 1990, end_year: int = 2005) -> str:
@@ -207,7 +276,7 @@ class Randomizer:
         delta_days = (end_date - start_date).days
 
         # Случайная дата
-        random_days = random.randint(0, delta_days)
+        random_days = Randomizer.rng().randint(0, delta_days)
         random_date = start_date + timedelta(days=random_days)
 
         # Возвращаем дату в формате с ведущими нулями
@@ -0,0 +1,127 @@
+"""Проверка тела ответа по схеме (pydantic-модели) с кэшем скомпилированных валидаторов."""
+import functools
+import inspect
+from typing import Any
+
+import requests
+from pydantic import TypeAdapter, ValidationError
+
+# Сколько ошибок валидации выводится в сообщении
+_ERRORS_LIMIT = 20
+
+
+@functools.cache
+def get_validator(schema) -> TypeAdapter:
+    """
+    Возвращает валидатор схемы. Валидатор компилируется один раз на схему и кэшируется.
+
+    :param schema: Pydantic-модель или тип (например, `list[FavoriteRegionModel]`).
+    :return: `TypeAdapter` схемы.
+    """
+    return TypeAdapter(schema)
+
+
+def _format_errors(error: ValidationError, schema, context: str) -> str:
+    lines = [f"Ошибка! Тело ответа {context}не соответствует схеме {getattr(schema, '__name__', schema)}:"]
+    for item in error.errors(include_url=False)[:_ERRORS_LIMIT]:
+        location = ".".join(str(part) for part in item["loc"]) or "<корень>"
+        lines.append(f"- {location}: {item['msg']} (значение = {item.get('input')!r})")
+    if error.error_count() > _ERRORS_LIMIT:
+        lines.append(f"... и ещё {error.error_count() - _ERRORS_LIMIT}")
+    return "\n".join(lines)
+
+
+def validate_json(content: bytes | str, schema) -> Any:
+    """
+    Проверяет JSON по схеме. Байты разбираются валидатором напрямую, без промежуточного словаря.
+
+    :param content: Тело ответа.
+    :param schema: Pydantic-модель или тип.
+    :return: Экземпляр модели.
+    :raises AssertionError: Если тело не соответствует схеме.
+    """
+    try:
+        return get_validator(schema).validate_json(content)
+    except ValidationError as e:
+        raise AssertionError(_format_errors(e, schema, "")) from None
+
+
+def attach_validation(response: requests.Response, schema) -> Any:
+    """
+    Проверяет тело ответа по схеме, не прерывая вызывающий код: результат сохраняется в атрибуты
+    ответа `model` (экземпляр модели) и `schema_error` (текст ошибки или None).
+
+    :param response: Ответ сервера.
+    :param schema: Pydantic-модель или тип. None - тело не проверяется.
+    :return: Экземпляр модели (или None).
+    """
+    response.model = None
+    response.schema_error = None
+    if schema is None:
+        return None
+    try:
+        response.model = get_validator(schema).validate_json(response.content)
+    except ValidationError as e:
+        request = response.request
+        context = f"{request.method} {request.path_url} -> {response.status_code} " if request else ""
+        response.schema_error = _format_errors(e, schema, context)
+    return response.model
+
+
+def assert_response_schema(response: requests.Response):
+    """
+    Проверяет результат `attach_validation`.
+
+    :param response: Ответ сервера.
+    :raises AssertionError: Если тело не соответствует схеме.
+    """
+    schema_error = getattr(response, "schema_error", None)
+    if schema_error:
+        raise AssertionError(schema_error)
+
+
+def validate_response(response: requests.Response, schema) -> Any:
+    """
+    Проверяет тело ответа по схеме и сохраняет результат в атрибут ответа `model`.
+
+    :param response: Ответ сервера.
+    :param schema: Pydantic-модель или тип. None - тело не проверяется.
+    :return: Экземпляр модели (или None).
+    :raises AssertionError: Если тело не соответствует схеме.
+    """
+    attach_validation(response, schema)
+    assert_response_schema(response)
+    return response.model
+
+
+def response_schema(schemas: dict[int, Any]):
+    """
+    Декоратор метода API: объявляет схемы ответа по статус-кодам и проверяет по ним тело ответа.
+
+    Метод не прерывается ошибкой схемы (`attach_validation`): вызывающий код получает ответ
+    и успевает, например, зарегистрировать созданную сущность для удаления. Ошибка схемы
+    проверяется вместе со статусом (`check_response_status`) или `assert_response_schema`.
+    Ответы со статусом, которого нет в `schemas`, не проверяются. Поддерживаются
+    синхронные и асинхронные методы.
+
+    :param schemas: Схемы по статус-кодам, например `{200: FavoriteRegionModel, 400: ErrorResponseModel}`.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                response = await func(*args, **kwargs)
+                attach_validation(response, schemas.get(response.status_code))
+                return response
+            async_wrapper.response_schemas = schemas
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            response = func(*args, **kwargs)
+            attach_validation(response, schemas.get(response.status_code))
+            return response
+        wrapper.response_schemas = schemas
+        return wrapper
+
+    return decorator